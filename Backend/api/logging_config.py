@@ -0,0 +1,188 @@
+"""
+API Layer - Configuración de logging no bloqueante
+Los hilos de las peticiones solo encolan los registros; un hilo de fondo
+(QueueListener) los formatea y escribe en los handlers reales.
+
+- La cola es acotada: si la salida (disco, stdout, colector) se atasca y la
+  cola se llena, los registros nuevos se descartan en lugar de bloquear la
+  petición. Los descartes se cuentan y se informan con un WARNING en cuanto
+  vuelve a haber sitio.
+- En el hilo de la petición solo se resuelve el mensaje (msg % args) y la
+  traza de la excepción; el formato completo (fecha, nivel...) se hace en
+  el hilo de fondo.
+
+Variables de entorno:
+    VM_API_LOG_QUEUE_SIZE: capacidad de la cola (por defecto 10000)
+    VM_API_LOG_SYNC=1: escritura síncrona, sin cola (depuración)
+"""
+import atexit
+import copy
+import logging
+import os
+import queue
+import threading
+import weakref
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+DEFAULT_QUEUE_SIZE = 10000
+
+_exception_formatter = logging.Formatter()
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler sobre una cola acotada que nunca bloquea: si está llena el
+    registro se descarta y se cuenta
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self._drop_lock = threading.Lock()
+        self.dropped = 0
+        self._unreported = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Resuelve mensaje y excepción sin aplicar el formato (se hace en el listener)"""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += 1
+                self._unreported += 1
+            return
+        if self._unreported:
+            self._report_drops()
+
+    def _report_drops(self) -> None:
+        with self._drop_lock:
+            count, self._unreported = self._unreported, 0
+        if not count:
+            return
+        notice = logging.LogRecord(__name__, logging.WARNING, __file__, 0,
+                                   f"Logging: {count} registros descartados por cola llena", None, None)
+        # El aviso no pasa por los filtros del handler: valores de TraceContextFilter
+        # fuera de una traza, para que TRACE_LOG_FORMAT pueda formatearlo
+        notice.trace_id = notice.span_id = '-'
+        try:
+            self.queue.put_nowait(notice)
+        except queue.Full:
+            with self._drop_lock:
+                self._unreported += count
+
+
+class _DrainingListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Espera a que haya sitio: la cola puede estar llena al detenerse
+        self.queue.put(self._sentinel)
+
+
+# Pipelines vivos: el hilo del listener no sobrevive al fork (servidores
+# pre-fork). Un único hook los reinicia todos (os.register_at_fork no permite
+# retirar hooks, así que uno por instancia los mantendría vivos)
+_pipelines: 'weakref.WeakSet[AsyncLogging]' = weakref.WeakSet()
+
+
+def _restart_pipelines_after_fork() -> None:
+    for pipeline in list(_pipelines):
+        pipeline._after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_pipelines_after_fork)
+
+
+class AsyncLogging:
+    """
+    Pipeline de logging en segundo plano
+
+    Uso:
+        pipeline = AsyncLogging([logging.StreamHandler()])
+        pipeline.install()        # sustituye los handlers del logger raíz
+        ...
+        pipeline.stop()           # vacía la cola y detiene el hilo
+    """
+
+    def __init__(self, handlers: List[logging.Handler], queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.handlers = handlers
+        self.queue_size = queue_size
+        self.handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        self.listener = _DrainingListener(self.handler.queue, *handlers, respect_handler_level=True)
+        self._started = False
+        _pipelines.add(self)
+
+    @property
+    def dropped(self) -> int:
+        return self.handler.dropped
+
+    def install(self, logger: Optional[logging.Logger] = None) -> None:
+        logger = logger or logging.getLogger()
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        logger.addHandler(self.handler)
+        self.start()
+
+    def start(self) -> None:
+        if not self._started:
+            self.listener.start()
+            self._started = True
+
+    def stop(self) -> None:
+        """Escribe los registros pendientes y detiene el hilo de fondo"""
+        if self._started:
+            self.listener.stop()
+            self._started = False
+
+    def _after_fork(self) -> None:
+        # El hijo crea una cola nueva (la anterior podría tener su lock tomado)
+        # y arranca su propio listener
+        self.handler._drop_lock = threading.Lock()
+        self.handler.queue = queue.Queue(maxsize=self.queue_size)
+        self.listener.queue = self.handler.queue
+        self.listener._thread = None
+        if self._started:
+            self.listener.start()
+
+
+def configure_logging(level: int = logging.INFO, fmt: str = DEFAULT_FORMAT,
+                      filters: Optional[List[logging.Filter]] = None) -> Optional[AsyncLogging]:
+    """
+    Configura el logger raíz como logging.basicConfig, pero con escritura en
+    segundo plano. Como basicConfig, no hace nada si el logger raíz ya tiene
+    handlers (p.ej. los configura el servidor o los tests).
+
+    Los `filters` se instalan en el handler que recibe los registros en el
+    hilo que los emite (el QueueHandler), antes de pasar al hilo de fondo.
+
+    Returns:
+        El pipeline instalado, o None si no se instaló
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return None
+    if os.environ.get('VM_API_LOG_SYNC', '').lower() in ('1', 'true', 'yes'):
+        logging.basicConfig(level=level, format=fmt)
+        for log_filter in filters or []:
+            root.handlers[0].addFilter(log_filter)
+        return None
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(fmt))
+    pipeline = AsyncLogging([stream_handler],
+                            queue_size=int(os.environ.get('VM_API_LOG_QUEUE_SIZE', DEFAULT_QUEUE_SIZE)))
+    for log_filter in filters or []:
+        pipeline.handler.addFilter(log_filter)
+    root.setLevel(level)
+    pipeline.install(root)
+    atexit.register(pipeline.stop)
+    return pipeline
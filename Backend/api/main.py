@@ -1,7 +1,7 @@
 """
 API Layer - REST API Implementation
 Implementación de la API REST usando Flask
-Aplicando RNF4 (Stateless), RNF5 (JSON), RF1-RF5
+Aplicando RNF4 (Stateless), RNF5 (JSON, opcionalmente MessagePack), RF1-RF5
 """
 import sys
 import os
@@ -9,27 +9,243 @@ import os
 # Agregar el directorio raíz al path para importaciones
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from flask import Flask, request, jsonify
+# El perfilado de arranque debe instalarse antes del resto de imports
+from api.startup_profiler import startup_profiler, profiling_requested
+
+if profiling_requested():
+    startup_profiler.install()
+
+import atexit
+import json
+import time
+from flask import Flask, Response, g, request
 from flask_cors import CORS
 import logging
 from typing import Dict, Any
 
 from application.factory import VMProvisioningService, VMBuildingService
-
-# Configuración de logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from application.catalog import InstanceCatalog
+from application.inventory import VMInventory
+from application.capacity import CapacityAggregator
+from application.lifecycle import VMLifecycleService
+from application.expiry import ExpiryReaper, ExpiryTracker, parse_ttl
+from application.events import EventFeed, format_sse
+from application.search import NameIndex
+from application.labels import LabelIndex, parse_labels
+from application.pagination import parse_page_size
+from domain.entities import VMStatus
+from domain.lifecycle import parse_action
+from api.serialization import respond, respond_stream, has_payload, get_payload
+from api.logging_config import DEFAULT_FORMAT, configure_logging
+from application import request_summary
+from domain.tracing import parse_traceparent, tracer
+
+# Trazas opcionales (spans por petición, servicio, proveedor y builder):
+# - VM_API_TRACE_FILE: archivo JSON Lines donde se añaden los spans
+# - VM_API_TRACE_ENDPOINT: URL de un colector que recibe POST {"spans": [...]}
+# Con trazas activas los logs incluyen el ID de traza de la petición.
+log_filters = []
+log_format = DEFAULT_FORMAT
+if os.environ.get('VM_API_TRACE_FILE') or os.environ.get('VM_API_TRACE_ENDPOINT'):
+    with startup_profiler.stage('service: tracing'):
+        from infrastructure.tracing import (HTTPCollectorExporter, JsonlFileExporter, TRACE_LOG_FORMAT,
+                                            TraceContextFilter)
+
+        if os.environ.get('VM_API_TRACE_FILE'):
+            tracer.add_exporter(JsonlFileExporter(os.environ['VM_API_TRACE_FILE']))
+        if os.environ.get('VM_API_TRACE_ENDPOINT'):
+            tracer.add_exporter(HTTPCollectorExporter(os.environ['VM_API_TRACE_ENDPOINT']))
+        for span_exporter in tracer.exporters:
+            atexit.register(span_exporter.shutdown)
+        log_filters.append(TraceContextFilter())
+        log_format = TRACE_LOG_FORMAT
+
+# Configuración de logging: los handlers escriben desde un hilo de fondo
+log_pipeline = configure_logging(logging.INFO, log_format, log_filters)
 logger = logging.getLogger(__name__)
+# Un registro por petición (proveedor, preset, tiempos por etapa y resultado)
+request_logger = logging.getLogger('api.requests')
 
 # Crear aplicación Flask
-app = Flask(__name__)
-CORS(app)  # Habilitar CORS
+with startup_profiler.stage('app: Flask + CORS'):
+    app = Flask(__name__)
+    CORS(app)  # Habilitar CORS
+
+
+@app.before_request
+def _begin_request_summary():
+    # Span raíz de la petición (continúa la traza del cliente si envía traceparent)
+    g.trace_span, g.trace_token = tracer.start_span(
+        f"{request.method} {request.path}", parse_traceparent(request.headers.get('traceparent')),
+        method=request.method, path=request.path)
+    g.request_summary_token = request_summary.begin(request.method, request.path)
+    if g.trace_span is not None:
+        request_summary.annotate(trace_id=g.trace_span.trace_id)
+
+
+@app.after_request
+def _log_request_summary(response):
+    summary = request_summary.current()
+    if summary is not None:
+        data = summary.finish(response.status_code)
+        if request_logger.isEnabledFor(logging.INFO):
+            request_logger.info("%s", summary, extra={'request_summary': data})
+        # Desglose por etapa visible en las devtools del navegador y en los clientes
+        response.headers['Server-Timing'] = summary.server_timing()
+        response.headers['Timing-Allow-Origin'] = '*'
+    trace_span = g.get('trace_span')
+    if trace_span is not None:
+        trace_span.set_attribute('status', response.status_code)
+        response.headers['X-Trace-Id'] = trace_span.trace_id
+    return response
+
+
+@app.teardown_request
+def _end_request_summary(error=None):
+    token = g.pop('request_summary_token', None)
+    if token is not None:
+        request_summary.end(token)
+    tracer.end_span(g.pop('trace_span', None), g.pop('trace_token', None), error)
+
+# Inventario compartido por los servicios: registra cada VM creada
+with startup_profiler.stage('service: VMInventory'):
+    vm_inventory = VMInventory()
+
+# Feed de cambios del inventario para GET /api/events (SSE)
+with startup_profiler.stage('service: EventFeed'):
+    event_feed = EventFeed(capacity=int(os.environ.get('VM_API_EVENT_BUFFER', '1000')))
+    event_feed.attach(vm_inventory)
+
+# Índice de nombres para GET /api/vms/search
+with startup_profiler.stage('service: NameIndex'):
+    name_index = NameIndex()
+    name_index.attach(vm_inventory)
+
+# Índice de bitmaps de etiquetas para GET /api/vms/query
+with startup_profiler.stage('service: LabelIndex'):
+    label_index = LabelIndex()
+    label_index.attach(vm_inventory)
+
+# Totales de capacidad mantenidos con los eventos del inventario
+with startup_profiler.stage('service: CapacityAggregator'):
+    capacity = CapacityAggregator()
+    capacity.attach(vm_inventory)
+
+# Persistencia opcional del inventario:
+# - VM_API_SHARED_INVENTORY: base SQLite (WAL) compartida por todos los workers
+#   de un servidor pre-fork; cada petición ve lo aceptado por cualquier worker
+# - VM_API_INVENTORY_JOURNAL: directorio del journal append-only con snapshots
+# - VM_API_INVENTORY_DB: base SQLite (WAL) con escrituras en lote
+# Al arrancar se recupera del journal si está configurado (snapshot + cola
+# corta de eventos) y si no de la base SQLite.
+inventory_store = None
+inventory_journal = None
+shared_inventory = None
+if os.environ.get('VM_API_SHARED_INVENTORY'):
+    with startup_profiler.stage('service: shared inventory'):
+        from infrastructure.persistence import SharedSQLiteInventory
+
+        shared_inventory = SharedSQLiteInventory(os.environ['VM_API_SHARED_INVENTORY'])
+        shared_inventory.attach(vm_inventory)
+        atexit.register(shared_inventory.close)
+
+    @app.before_request
+    def _sync_shared_inventory():
+        shared_inventory.sync()
+elif os.environ.get('VM_API_INVENTORY_JOURNAL') or os.environ.get('VM_API_INVENTORY_DB'):
+    with startup_profiler.stage('service: inventory persistence'):
+        from infrastructure.persistence import InventoryJournal, SQLiteInventoryStore
+
+        if os.environ.get('VM_API_INVENTORY_DB'):
+            inventory_store = SQLiteInventoryStore(os.environ['VM_API_INVENTORY_DB'])
+        if os.environ.get('VM_API_INVENTORY_JOURNAL'):
+            inventory_journal = InventoryJournal(os.environ['VM_API_INVENTORY_JOURNAL'])
+
+        recovered = inventory_journal.recover() if inventory_journal else inventory_store.load_all()
+        for recovered_vm in recovered:
+            vm_inventory.add(recovered_vm)
+
+        for backend in (inventory_store, inventory_journal):
+            if backend is not None:
+                backend.attach(vm_inventory)
+                atexit.register(backend.close)
+        logger.info(f"Inventario persistente: {len(vm_inventory)} VMs recuperadas")
 
 # Services (DIP: Inyección de dependencia)
-provisioning_service = VMProvisioningService()
-building_service = VMBuildingService()
+with startup_profiler.stage('service: VMProvisioningService'):
+    provisioning_service = VMProvisioningService(inventory=vm_inventory)
+with startup_profiler.stage('service: VMBuildingService'):
+    building_service = VMBuildingService(inventory=vm_inventory)
+
+with startup_profiler.stage('service: VMLifecycleService'):
+    lifecycle_service = VMLifecycleService(vm_inventory)
+    atexit.register(lifecycle_service.shutdown)
+
+# VMs efímeras: el reaper termina las VMs cuyo TTL venció.
+# VM_API_REAPER_INTERVAL: segundos entre pasadas (0 desactiva el reaper)
+# Con el inventario compartido solo hace pasadas el worker titular del lease
+# 'expiry-reaper', tras sincronizarse para ver las VMs de los demás.
+def _reaper_leader() -> bool:
+    if not shared_inventory.acquire_lease('expiry-reaper', ttl=expiry_reaper.interval * 3):
+        return False
+    shared_inventory.sync()
+    return True
+
+
+with startup_profiler.stage('service: ExpiryReaper'):
+    expiry_tracker = ExpiryTracker()
+    expiry_tracker.attach(vm_inventory)
+    expiry_reaper = ExpiryReaper(expiry_tracker, lifecycle_service,
+                                 interval=float(os.environ.get('VM_API_REAPER_INTERVAL', '30')),
+                                 leader=_reaper_leader if shared_inventory is not None else None)
+    if expiry_reaper.interval > 0:
+        expiry_reaper.start()
+        atexit.register(expiry_reaper.stop)
+
+# Catálogo de tipos de instancia (índices construidos una sola vez)
+with startup_profiler.stage('service: InstanceCatalog'):
+    instance_catalog = InstanceCatalog.from_instance_types()
+
+# Fin de los imports de arranque: el hook de importación no es seguro entre
+# hilos, así que se retira antes de atender peticiones (las etapas siguen activas)
+startup_profiler.uninstall()
+
+if startup_profiler.enabled:
+    _first_request_pending = True
+
+    @app.before_request
+    def _profile_first_request_start():
+        request.environ['startup_profiler.start'] = time.perf_counter()
+
+    @app.after_request
+    def _profile_first_request_end(response):
+        global _first_request_pending
+        start = request.environ.get('startup_profiler.start')
+        if _first_request_pending and start is not None:
+            _first_request_pending = False
+            startup_profiler.record(f"first-request: {request.method} {request.path}",
+                                    time.perf_counter() - start)
+            logger.info("Perfil de arranque:\n%s", startup_profiler.report())
+        return response
+
+
+# Server-Sent Events: reintento sugerido al cliente, keepalive y duración
+# máxima de cada conexión (el cliente reconecta con Last-Event-ID)
+SSE_RETRY_MS = 3000
+SSE_KEEPALIVE_SECONDS = 15
+SSE_MAX_SECONDS = 300
+SSE_SHARED_POLL_SECONDS = 1
+
+
+def _optional_int_arg(name: str):
+    """Lee un parámetro entero opcional del query string"""
+    value = request.args.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Parámetro '{name}' debe ser un entero")
 
 
 @app.route('/health', methods=['GET'])
@@ -37,11 +253,14 @@ def health_check():
     """
     Endpoint de health check
     """
-    return jsonify({
+    status = {
         'status': 'healthy',
         'service': 'VM Provisioning API',
         'version': '2.0.0'
-    }), 200
+    }
+    if log_pipeline is not None:
+        status['logging'] = {'dropped': log_pipeline.dropped}
+    return respond(status), 200
 
 
 @app.route('/api/providers', methods=['GET'])
@@ -55,7 +274,7 @@ def get_providers():
     try:
         providers = provisioning_service.get_supported_providers()
         
-        return jsonify({
+        return respond({
             'success': True,
             'providers': providers,
             'count': len(providers)
@@ -63,7 +282,7 @@ def get_providers():
         
     except Exception as e:
         logger.error(f"Error obteniendo proveedores: {str(e)}")
-        return jsonify({
+        return respond({
             'success': False,
             'error': 'Error interno del servidor'
         }), 500
@@ -120,7 +339,7 @@ def get_vm_types():
             }
         }
 
-        return jsonify({
+        return respond({
             'success': True,
             'vm_types': vm_types,
             'count': len(vm_types)
@@ -128,12 +347,350 @@ def get_vm_types():
 
     except Exception as e:
         logger.error(f"Error obteniendo tipos de VM: {str(e)}")
-        return jsonify({
+        return respond({
+            'success': False,
+            'error': 'Error interno del servidor'
+        }), 500
+
+
+@app.route('/api/catalog', methods=['GET'])
+def get_catalog():
+    """
+    Endpoint para consultar el catálogo de tipos de instancia con filtros y paginación
+
+    Query params (todos opcionales):
+        provider, family, min_vcpus, max_vcpus, min_memory, max_memory,
+        cursor (devuelto como next_cursor), limit (máx. 200)
+
+    Returns:
+        JSON con la página de tipos de instancia y el cursor siguiente
+    """
+    try:
+        page = instance_catalog.query(
+            provider=request.args.get('provider'),
+            family=request.args.get('family'),
+            min_vcpus=_optional_int_arg('min_vcpus'),
+            max_vcpus=_optional_int_arg('max_vcpus'),
+            min_memory=_optional_int_arg('min_memory'),
+            max_memory=_optional_int_arg('max_memory'),
+            cursor=request.args.get('cursor'),
+            limit=parse_page_size(request.args.get('limit'))
+        )
+
+        return respond({
+            'success': True,
+            **page.to_dict()
+        }), 200
+
+    except ValueError as ve:
+        return respond({
+            'success': False,
+            'error': str(ve)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error consultando catálogo: {str(e)}")
+        return respond({
+            'success': False,
+            'error': 'Error interno del servidor'
+        }), 500
+
+
+@app.route('/api/vms', methods=['GET'])
+def list_vms():
+    """
+    Endpoint para consultar el inventario de VMs creadas, paginado por cursor
+
+    Query params (todos opcionales):
+        provider, region, status, instance_type,
+        vm_type (standard, memory-optimized, disk-optimized),
+        cursor (devuelto como next_cursor), limit (máx. 200)
+
+    Returns:
+        JSON con la página de VMs en orden estable (createdAt, vmId) y el cursor siguiente.
+        La lista se serializa en streaming.
+    """
+    try:
+        page = vm_inventory.page(
+            provider=request.args.get('provider'),
+            region=request.args.get('region'),
+            status=request.args.get('status'),
+            instance_type=request.args.get('instance_type'),
+            vm_type=request.args.get('vm_type'),
+            cursor=request.args.get('cursor'),
+            limit=parse_page_size(request.args.get('limit'))
+        )
+
+        envelope = {
+            'success': True,
+            'count': len(page.items),
+            'next_cursor': page.next_cursor,
+            'limit': page.limit
+        }
+        return respond_stream(envelope, 'vms', (vm.to_dict() for vm in page.items)), 200
+
+    except ValueError as ve:
+        return respond({
+            'success': False,
+            'error': str(ve)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error consultando inventario: {str(e)}")
+        return respond({
+            'success': False,
+            'error': 'Error interno del servidor'
+        }), 500
+
+
+@app.route('/api/vms/search', methods=['GET'])
+def search_vms():
+    """
+    Endpoint para buscar VMs por nombre (prefijo o subcadena, sin distinguir mayúsculas)
+
+    Query params:
+        q (requerido), limit (opcional, máx. 200)
+
+    Returns:
+        JSON con las VMs encontradas: primero las que empiezan por `q`
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return respond({
+            'success': False,
+            'error': 'Parámetro "q" es requerido'
+        }), 400
+
+    try:
+        limit = parse_page_size(request.args.get('limit'))
+    except ValueError as ve:
+        return respond({
+            'success': False,
+            'error': str(ve)
+        }), 400
+
+    vms = [vm for vm in (vm_inventory.get(vm_id) for vm_id in name_index.search(query, limit)) if vm]
+    return respond({
+        'success': True,
+        'query': query,
+        'count': len(vms),
+        'vms': [vm.to_dict() for vm in vms]
+    }), 200
+
+
+@app.route('/api/vms/query', methods=['GET'])
+def query_vms():
+    """
+    Endpoint para consultar VMs por etiquetas con expresiones booleanas
+
+    Query params:
+        q (requerido): p.ej. "env=prod AND team=payments AND NOT provider=azure"
+           Operadores: AND, OR, NOT, paréntesis, clave=valor, clave!=valor y
+           clave (la etiqueta existe). provider, region y status también se
+           pueden consultar.
+        limit (opcional, máx. 200)
+
+    Returns:
+        JSON con el total de VMs que cumplen la consulta y las primeras `limit`
+    """
+    try:
+        query = request.args.get('q', '')
+        limit = parse_page_size(request.args.get('limit'))
+        total, vm_ids = label_index.query(query, limit)
+    except ValueError as ve:
+        return respond({
+            'success': False,
+            'error': str(ve)
+        }), 400
+
+    vms = [vm for vm in (vm_inventory.get(vm_id) for vm_id in vm_ids) if vm]
+    return respond({
+        'success': True,
+        'query': query,
+        'total': total,
+        'count': len(vms),
+        'vms': [vm.to_dict() for vm in vms]
+    }), 200
+
+
+@app.route('/api/vms/<vm_id>', methods=['GET'])
+def get_vm(vm_id: str):
+    """
+    Endpoint para obtener una VM del inventario por su ID
+
+    Returns:
+        JSON con los detalles de la VM o 404 si no existe
+    """
+    vm = vm_inventory.get(vm_id)
+    if vm is None:
+        return respond({
+            'success': False,
+            'error': f"VM '{vm_id}' no encontrada"
+        }), 404
+
+    return respond({
+        'success': True,
+        'vm': vm.to_dict()
+    }), 200
+
+
+@app.route('/api/vms/actions', methods=['POST'])
+def vm_actions():
+    """
+    Endpoint para aplicar una acción de ciclo de vida a muchas VMs
+
+    Request Body (JSON):
+    {
+        "action": "stop|start|terminate",
+        "vm_ids": ["aws-01j...", ...]                 // o bien:
+        "selector": {"provider": "aws", "region": "us-east-1", "status": "running"}
+    }
+
+    Returns:
+        JSON con el resultado de cada VM (las transiciones no permitidas
+        se informan por VM sin afectar al resto)
+    """
+    try:
+        if not has_payload():
+            return respond({
+                'success': False,
+                'error': 'Content-Type debe ser application/json o application/msgpack'
+            }), 400
+
+        data: Dict[str, Any] = get_payload() or {}
+        action = parse_action(data.get('action', ''))
+
+        vm_ids, selector = data.get('vm_ids'), data.get('selector')
+        if (vm_ids is None) == (selector is None):
+            return respond({
+                'success': False,
+                'error': 'Se requiere "vm_ids" o "selector" (solo uno de los dos)'
+            }), 400
+        if vm_ids is not None:
+            if not isinstance(vm_ids, list) or not all(isinstance(vm_id, str) for vm_id in vm_ids):
+                return respond({
+                    'success': False,
+                    'error': '"vm_ids" debe ser una lista de IDs'
+                }), 400
+        else:
+            if not isinstance(selector, dict) or not selector:
+                return respond({
+                    'success': False,
+                    'error': '"selector" debe ser un objeto con al menos un filtro'
+                }), 400
+            vm_ids = lifecycle_service.select(selector)
+
+        results = lifecycle_service.apply(action, vm_ids)
+        succeeded = sum(1 for result in results if result.success)
+
+        return respond({
+            'success': succeeded == len(results),
+            'action': action.value,
+            'requested': len(results),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded,
+            'results': [result.to_dict() for result in results]
+        }), 200
+
+    except ValueError as ve:
+        return respond({
+            'success': False,
+            'error': str(ve)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error en acción masiva: {str(e)}")
+        return respond({
             'success': False,
             'error': 'Error interno del servidor'
         }), 500
 
 
+@app.route('/api/events', methods=['GET'])
+def event_stream():
+    """
+    Endpoint Server-Sent Events con los cambios del inventario
+
+    Eventos: vm.created, vm.status_changed, vm.deleted. Cada uno lleva un ID
+    `<época>-<n>` creciente dentro del worker que lo emite; al reconectar, el
+    cliente envía la cabecera Last-Event-ID (o el parámetro last_event_id) y
+    recibe los eventos que se perdió. Si ya no están en el buffer, o el ID es
+    de otro worker, se envía un evento `reset` y conviene recargar GET /api/vms.
+
+    Query params (opcionales):
+        last_event_id, vm_id (solo los eventos de esa VM)
+    """
+    raw_last_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_id = event_feed.parse_id(raw_last_id)
+    except ValueError:
+        return respond({
+            'success': False,
+            'error': 'Last-Event-ID debe tener el formato <época>-<n>'
+        }), 400
+    vm_filter = request.args.get('vm_id')
+
+    def generate():
+        cursor = event_feed.last_id if last_id is None else last_id
+        client_id = raw_last_id
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        deadline = time.monotonic() + SSE_MAX_SECONDS
+        # Con inventario compartido se consultan periódicamente los cambios de otros workers
+        poll = SSE_SHARED_POLL_SECONDS if shared_inventory is not None else SSE_KEEPALIVE_SECONDS
+        idle = 0.0
+        while time.monotonic() < deadline:
+            if shared_inventory is not None:
+                shared_inventory.sync()
+            events, complete = event_feed.wait(cursor, timeout=poll)
+            if not complete:
+                yield f"event: reset\ndata: {json.dumps({'last_event_id': client_id})}\n\n"
+                cursor = events[-1].id if events else 0
+            if not events:
+                idle += poll
+                if idle >= SSE_KEEPALIVE_SECONDS:
+                    idle = 0.0
+                    yield ": keepalive\n\n"
+                continue
+            idle = 0.0
+            for event in events:
+                cursor, client_id = event.id, event.event_id
+                if vm_filter and event.data.get('vmId') != vm_filter:
+                    continue
+                yield format_sse(event, json.dumps(event.data))
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@app.route('/api/capacity', methods=['GET'])
+def get_capacity():
+    """
+    Endpoint con la capacidad agregada del inventario
+
+    Query params (todos opcionales):
+        provider, region, status
+
+    Returns:
+        JSON con los totales (vms, vcpus, memoryGB, diskGB) y el desglose
+        por proveedor, región y estado
+    """
+    status = request.args.get('status')
+    if status and status not in {s.value for s in VMStatus}:
+        return respond({
+            'success': False,
+            'error': f"Estado '{status}' no válido. Estados: {', '.join(s.value for s in VMStatus)}"
+        }), 400
+
+    summary = capacity.summary(
+        provider=request.args.get('provider'),
+        region=request.args.get('region'),
+        status=status
+    )
+    return respond({
+        'success': True,
+        **summary
+    }), 200
+
+
 @app.route('/api/vm/provision', methods=['POST'])
 def provision_vm():
     """
@@ -157,18 +714,18 @@ def provision_vm():
     """
     try:
         # RNF5: Validar que el request es JSON
-        if not request.is_json:
-            return jsonify({
+        if not has_payload():
+            return respond({
                 'success': False,
-                'error': 'Content-Type debe ser application/json'
+                'error': 'Content-Type debe ser application/json o application/msgpack'
             }), 400
         
         # Obtener datos del request
-        data: Dict[str, Any] = request.get_json()
+        data: Dict[str, Any] = get_payload()
         
         # Validar parámetros requeridos
         if 'provider' not in data:
-            return jsonify({
+            return respond({
                 'success': False,
                 'error': 'Parámetro "provider" es requerido',
                 'example': {
@@ -182,12 +739,14 @@ def provision_vm():
         
         provider = str(data.get('provider', ''))
         config = data.get('config', {})
+        ttl_seconds = parse_ttl(data.get('ttl_seconds'))
+        labels = parse_labels(data.get('labels'))
         
         # RNF3: Log sin información sensible
-        logger.info(f"Solicitud de aprovisionamiento - Proveedor: {provider}")
+        logger.debug("Solicitud de aprovisionamiento - Proveedor: %s", provider)
         
         # Llamar al servicio de aprovisionamiento
-        result = provisioning_service.provision_vm(provider, config)
+        result = provisioning_service.provision_vm(provider, config, ttl_seconds, labels)
         
         # RF3: Preparar respuesta con estado
         response = result.to_dict()
@@ -195,11 +754,16 @@ def provision_vm():
         # Determinar código de estado HTTP
         status_code = 200 if result.success else 400
         
-        return jsonify(response), status_code
+        return respond(response), status_code
         
+    except ValueError as ve:
+        return respond({
+            'success': False,
+            'error': str(ve)
+        }), 400
     except Exception as e:
         logger.error(f"Error en endpoint de aprovisionamiento: {str(e)}", exc_info=True)
-        return jsonify({
+        return respond({
             'success': False,
             'error': 'Error interno del servidor',
             'detail': str(e)
@@ -222,26 +786,33 @@ def provision_vm_by_provider(provider: str):
     }
     """
     try:
-        if not request.is_json:
-            return jsonify({
+        if not has_payload():
+            return respond({
                 'success': False,
-                'error': 'Content-Type debe ser application/json'
+                'error': 'Content-Type debe ser application/json o application/msgpack'
             }), 400
         
-        data: Dict[str, Any] = request.get_json()
+        data: Dict[str, Any] = get_payload()
         config = data.get('config', {})
+        ttl_seconds = parse_ttl(data.get('ttl_seconds'))
+        labels = parse_labels(data.get('labels'))
         
-        logger.info(f"Solicitud de aprovisionamiento - Proveedor: {provider}")
+        logger.debug("Solicitud de aprovisionamiento - Proveedor: %s", provider)
         
-        result = provisioning_service.provision_vm(provider, config)
+        result = provisioning_service.provision_vm(provider, config, ttl_seconds, labels)
         response = result.to_dict()
         status_code = 200 if result.success else 400
         
-        return jsonify(response), status_code
+        return respond(response), status_code
         
+    except ValueError as ve:
+        return respond({
+            'success': False,
+            'error': str(ve)
+        }), 400
     except Exception as e:
         logger.error(f"Error en aprovisionamiento: {str(e)}", exc_info=True)
-        return jsonify({
+        return respond({
             'success': False,
             'error': 'Error interno del servidor'
         }), 500
@@ -276,17 +847,17 @@ def build_vm():
         JSON con resultado de la construcción
     """
     try:
-        if not request.is_json:
-            return jsonify({
+        if not has_payload():
+            return respond({
                 'success': False,
-                'error': 'Content-Type debe ser application/json'
+                'error': 'Content-Type debe ser application/json o application/msgpack'
             }), 400
 
-        data: Dict[str, Any] = request.get_json()
+        data: Dict[str, Any] = get_payload()
 
         # Validar parámetros requeridos
         if 'provider' not in data:
-            return jsonify({
+            return respond({
                 'success': False,
                 'error': 'Parámetro "provider" es requerido',
                 'example': {
@@ -303,27 +874,38 @@ def build_vm():
             }), 400
 
         if 'build_config' not in data:
-            return jsonify({
+            return respond({
                 'success': False,
                 'error': 'Parámetro "build_config" es requerido'
             }), 400
 
         provider = str(data.get('provider', ''))
-        build_config = data.get('build_config', {})
+        build_config = data['build_config']
+        if not isinstance(build_config, dict):
+            return respond({
+                'success': False,
+                'error': 'Parámetro "build_config" debe ser un objeto'
+            }), 400
+        ttl_seconds = parse_ttl(build_config.get('ttl_seconds'))
 
-        logger.info(f"Solicitud de construcción (Builder) - Proveedor: {provider}")
+        logger.debug("Solicitud de construcción (Builder) - Proveedor: %s", provider)
 
         # Llamar al servicio de construcción
-        result = building_service.build_vm_with_config(provider, build_config)
+        result = building_service.build_vm_with_config(provider, build_config, ttl_seconds)
 
         response = result.to_dict()
         status_code = 200 if result.success else 400
 
-        return jsonify(response), status_code
+        return respond(response), status_code
 
+    except ValueError as ve:
+        return respond({
+            'success': False,
+            'error': str(ve)
+        }), 400
     except Exception as e:
         logger.error(f"Error en endpoint de construcción: {str(e)}", exc_info=True)
-        return jsonify({
+        return respond({
             'success': False,
             'error': 'Error interno del servidor',
             'detail': str(e)
@@ -340,26 +922,28 @@ def build_vm_preset():
         "provider": "aws|azure|google|onpremise",
         "preset": "minimal|standard|high-performance",
         "name": "my-vm",
-        "location": "us-east-1"
+        "location": "us-east-1",
+        "ttl_seconds": 3600  (opcional; 'minimal' expira en 24 h por defecto, 0 = no expira)
+        "labels": {"env": "dev"}  (opcional)
     }
 
     Returns:
         JSON con resultado de la construcción
     """
     try:
-        if not request.is_json:
-            return jsonify({
+        if not has_payload():
+            return respond({
                 'success': False,
-                'error': 'Content-Type debe ser application/json'
+                'error': 'Content-Type debe ser application/json o application/msgpack'
             }), 400
 
-        data: Dict[str, Any] = request.get_json()
+        data: Dict[str, Any] = get_payload()
 
         # Validar parámetros requeridos
         required_params = ['provider', 'preset', 'name']
         for param in required_params:
             if param not in data:
-                return jsonify({
+                return respond({
                     'success': False,
                     'error': f'Parámetro "{param}" es requerido',
                     'example': {
@@ -374,20 +958,27 @@ def build_vm_preset():
         preset = str(data.get('preset', ''))
         name = str(data.get('name', ''))
         location = str(data.get('location', 'us-east-1'))
+        ttl_seconds = parse_ttl(data.get('ttl_seconds'))
+        labels = parse_labels(data.get('labels'))
 
-        logger.info(f"Solicitud de construcción predefinida - Proveedor: {provider}, Preset: {preset}")
+        logger.debug("Solicitud de construcción predefinida - Proveedor: %s, Preset: %s", provider, preset)
 
         # Llamar al servicio de construcción predefinida
-        result = building_service.build_predefined_vm(provider, preset, name, location)
+        result = building_service.build_predefined_vm(provider, preset, name, location, ttl_seconds, labels)
 
         response = result.to_dict()
         status_code = 200 if result.success else 400
 
-        return jsonify(response), status_code
+        return respond(response), status_code
 
+    except ValueError as ve:
+        return respond({
+            'success': False,
+            'error': str(ve)
+        }), 400
     except Exception as e:
         logger.error(f"Error en endpoint de preset: {str(e)}", exc_info=True)
-        return jsonify({
+        return respond({
             'success': False,
             'error': 'Error interno del servidor',
             'detail': str(e)
@@ -405,22 +996,24 @@ def build_standard_vm():
         "name": "my-standard-vm",
         "location": "us-east-1",
         "size": "small|medium|large"  (opcional, default: medium)
+        "ttl_seconds": 3600  (opcional, la VM se termina al expirar)
+        "labels": {"env": "prod", "team": "payments"}  (opcional)
     }
     """
     try:
-        if not request.is_json:
-            return jsonify({
+        if not has_payload():
+            return respond({
                 'success': False,
-                'error': 'Content-Type debe ser application/json'
+                'error': 'Content-Type debe ser application/json o application/msgpack'
             }), 400
 
-        data: Dict[str, Any] = request.get_json()
+        data: Dict[str, Any] = get_payload()
 
         # Validar parámetros requeridos
         required_params = ['provider', 'name', 'location']
         for param in required_params:
             if param not in data:
-                return jsonify({
+                return respond({
                     'success': False,
                     'error': f'Parámetro "{param}" es requerido',
                     'example': {
@@ -435,20 +1028,27 @@ def build_standard_vm():
         name = str(data.get('name', ''))
         location = str(data.get('location', ''))
         size = str(data.get('size', 'medium'))
+        ttl_seconds = parse_ttl(data.get('ttl_seconds'))
+        labels = parse_labels(data.get('labels'))
 
-        logger.info(f"Solicitud Standard VM - Proveedor: {provider}, Nombre: {name}")
+        logger.debug("Solicitud Standard VM - Proveedor: %s, Nombre: %s", provider, name)
 
         # Construir Standard VM usando Director
-        result = building_service.build_vm_type(provider, 'standard', name, location, size)
+        result = building_service.build_vm_type(provider, 'standard', name, location, size, ttl_seconds, labels)
 
         response = result.to_dict()
         status_code = 200 if result.success else 400
 
-        return jsonify(response), status_code
+        return respond(response), status_code
 
+    except ValueError as ve:
+        return respond({
+            'success': False,
+            'error': str(ve)
+        }), 400
     except Exception as e:
         logger.error(f"Error en endpoint Standard VM: {str(e)}", exc_info=True)
-        return jsonify({
+        return respond({
             'success': False,
             'error': 'Error interno del servidor',
             'detail': str(e)
@@ -466,21 +1066,23 @@ def build_memory_optimized_vm():
         "name": "database-server",
         "location": "us-east-1",
         "size": "small|medium|large"  (opcional, default: medium)
+        "ttl_seconds": 3600  (opcional, la VM se termina al expirar)
+        "labels": {"env": "prod", "team": "payments"}  (opcional)
     }
     """
     try:
-        if not request.is_json:
-            return jsonify({
+        if not has_payload():
+            return respond({
                 'success': False,
-                'error': 'Content-Type debe ser application/json'
+                'error': 'Content-Type debe ser application/json o application/msgpack'
             }), 400
 
-        data: Dict[str, Any] = request.get_json()
+        data: Dict[str, Any] = get_payload()
 
         required_params = ['provider', 'name', 'location']
         for param in required_params:
             if param not in data:
-                return jsonify({
+                return respond({
                     'success': False,
                     'error': f'Parámetro "{param}" es requerido'
                 }), 400
@@ -489,19 +1091,26 @@ def build_memory_optimized_vm():
         name = str(data.get('name', ''))
         location = str(data.get('location', ''))
         size = str(data.get('size', 'medium'))
+        ttl_seconds = parse_ttl(data.get('ttl_seconds'))
+        labels = parse_labels(data.get('labels'))
 
-        logger.info(f"Solicitud Memory-Optimized VM - Proveedor: {provider}")
+        logger.debug("Solicitud Memory-Optimized VM - Proveedor: %s", provider)
 
-        result = building_service.build_vm_type(provider, 'memory-optimized', name, location, size)
+        result = building_service.build_vm_type(provider, 'memory-optimized', name, location, size, ttl_seconds, labels)
 
         response = result.to_dict()
         status_code = 200 if result.success else 400
 
-        return jsonify(response), status_code
+        return respond(response), status_code
 
+    except ValueError as ve:
+        return respond({
+            'success': False,
+            'error': str(ve)
+        }), 400
     except Exception as e:
         logger.error(f"Error en endpoint Memory-Optimized VM: {str(e)}", exc_info=True)
-        return jsonify({
+        return respond({
             'success': False,
             'error': 'Error interno del servidor',
             'detail': str(e)
@@ -519,21 +1128,23 @@ def build_disk_optimized_vm():
         "name": "compute-server",
         "location": "us-east-1",
         "size": "small|medium|large"  (opcional, default: medium)
+        "ttl_seconds": 3600  (opcional, la VM se termina al expirar)
+        "labels": {"env": "prod", "team": "payments"}  (opcional)
     }
     """
     try:
-        if not request.is_json:
-            return jsonify({
+        if not has_payload():
+            return respond({
                 'success': False,
-                'error': 'Content-Type debe ser application/json'
+                'error': 'Content-Type debe ser application/json o application/msgpack'
             }), 400
 
-        data: Dict[str, Any] = request.get_json()
+        data: Dict[str, Any] = get_payload()
 
         required_params = ['provider', 'name', 'location']
         for param in required_params:
             if param not in data:
-                return jsonify({
+                return respond({
                     'success': False,
                     'error': f'Parámetro "{param}" es requerido'
                 }), 400
@@ -542,19 +1153,26 @@ def build_disk_optimized_vm():
         name = str(data.get('name', ''))
         location = str(data.get('location', ''))
         size = str(data.get('size', 'medium'))
+        ttl_seconds = parse_ttl(data.get('ttl_seconds'))
+        labels = parse_labels(data.get('labels'))
 
-        logger.info(f"Solicitud Disk-Optimized VM - Proveedor: {provider}")
+        logger.debug("Solicitud Disk-Optimized VM - Proveedor: %s", provider)
 
-        result = building_service.build_vm_type(provider, 'disk-optimized', name, location, size)
+        result = building_service.build_vm_type(provider, 'disk-optimized', name, location, size, ttl_seconds, labels)
 
         response = result.to_dict()
         status_code = 200 if result.success else 400
 
-        return jsonify(response), status_code
+        return respond(response), status_code
 
+    except ValueError as ve:
+        return respond({
+            'success': False,
+            'error': str(ve)
+        }), 400
     except Exception as e:
         logger.error(f"Error en endpoint Disk-Optimized VM: {str(e)}", exc_info=True)
-        return jsonify({
+        return respond({
             'success': False,
             'error': 'Error interno del servidor',
             'detail': str(e)
@@ -564,13 +1182,21 @@ def build_disk_optimized_vm():
 @app.errorhandler(404)
 def not_found(error):
     """Manejador de rutas no encontradas"""
-    return jsonify({
+    return respond({
         'success': False,
         'error': 'Endpoint no encontrado',
         'available_endpoints': [
             'GET /health',
             'GET /api/providers',
             'GET /api/vm/types',
+            'GET /api/catalog',
+            'GET /api/vms',
+            'GET /api/vms/search',
+            'GET /api/vms/query',
+            'GET /api/vms/<vm_id>',
+            'POST /api/vms/actions',
+            'GET /api/capacity',
+            'GET /api/events',
             'POST /api/vm/provision',
             'POST /api/vm/provision/<provider>',
             'POST /api/vm/build',
@@ -586,13 +1212,58 @@ def not_found(error):
 def internal_error(error):
     """Manejador de errores internos"""
     logger.error(f"Error 500: {str(error)}")
-    return jsonify({
+    return respond({
         'success': False,
         'error': 'Error interno del servidor'
     }), 500
 
 
+def _run_startup_profile(output_path=None) -> None:
+    """
+    Ejecuta peticiones de calentamiento con el cliente de pruebas,
+    imprime el reporte de arranque y opcionalmente lo guarda en JSON
+
+    Las VMs del calentamiento se registran en un inventario temporal, sin
+    listeners: no llegan al inventario real, a la persistencia ni al feed.
+    """
+    global provisioning_service, building_service
+    live_services = provisioning_service, building_service
+    scratch_inventory = VMInventory()
+    provisioning_service = VMProvisioningService(inventory=scratch_inventory)
+    building_service = VMBuildingService(inventory=scratch_inventory)
+
+    client = app.test_client()
+    warm_up = [
+        ('GET', '/api/providers', None),
+        ('POST', '/api/vm/provision', {'provider': 'aws', 'config': {'type': 't2.micro'}}),
+        ('POST', '/api/vm/build/standard', {'provider': 'aws', 'name': 'warm-up', 'location': 'us-east-1'})
+    ]
+    try:
+        for method, path, payload in warm_up:
+            with startup_profiler.stage(f"warm-up: {method} {path}"):
+                client.open(path, method=method, json=payload)
+    finally:
+        provisioning_service, building_service = live_services
+
+    print(startup_profiler.report())
+    if output_path:
+        startup_profiler.write_json(output_path)
+
+
 if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='VM Provisioning API')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Mide el arranque, ejecuta peticiones de calentamiento e imprime el reporte')
+    parser.add_argument('--profile-output', default=None,
+                        help='Ruta donde guardar el reporte de arranque en JSON')
+    args, _ = parser.parse_known_args()
+
+    if args.profile_startup:
+        _run_startup_profile(args.profile_output)
+        sys.exit(0)
+
     # RNF4: API Stateless para escalabilidad
     logger.info("Iniciando VM Provisioning API...")
     logger.info(f"Proveedores disponibles: {provisioning_service.get_supported_providers()}")
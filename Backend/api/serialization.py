@@ -0,0 +1,146 @@
+"""
+API Layer - Serialización de respuestas
+Negociación de contenido entre JSON y MessagePack
+
+Los clientes que envían `Accept: application/msgpack` reciben el mismo payload
+codificado en MessagePack, con las fechas como enteros epoch (segundos) en
+lugar de cadenas ISO. Los cuerpos de las peticiones también pueden enviarse en
+MessagePack (`Content-Type: application/msgpack`).
+
+msgpack es una dependencia opcional: si no está instalado se responde JSON.
+"""
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from flask import Response, jsonify, request
+
+from application.request_summary import stage
+from domain.tracing import span
+
+try:
+    import msgpack
+except ImportError:  # msgpack es opcional
+    msgpack = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+MSGPACK_MIMETYPES = (MSGPACK_MIMETYPE, 'application/x-msgpack')
+
+# Elementos por fragmento en las respuestas en streaming
+STREAM_CHUNK_ITEMS = 50
+
+# Campos que to_dict() serializa como fechas ISO
+DATETIME_FIELDS = frozenset({'createdAt', 'expiresAt'})
+
+
+def msgpack_available() -> bool:
+    return msgpack is not None
+
+
+def wants_msgpack() -> bool:
+    """Indica si el cliente prefiere MessagePack según la cabecera Accept"""
+    if msgpack is None:
+        return False
+    best = request.accept_mimetypes.best_match((JSON_MIMETYPE,) + MSGPACK_MIMETYPES)
+    return best in MSGPACK_MIMETYPES
+
+
+def _epoch(text: str) -> Any:
+    try:
+        return int(datetime.fromisoformat(text).timestamp())
+    except ValueError:
+        return text
+
+
+def _to_wire(value: Any) -> Any:
+    """Copia del payload con las fechas ISO de DATETIME_FIELDS como epoch en segundos"""
+    if isinstance(value, dict):
+        return {key: _epoch(item) if key in DATETIME_FIELDS and isinstance(item, str) else _to_wire(item)
+                for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_wire(item) for item in value]
+    return value
+
+
+def _default(value: Any) -> Any:
+    """Tipos que msgpack no conoce: los datetime pasan a epoch en segundos y los Enum a su valor"""
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def pack(payload: Any) -> bytes:
+    """Codifica un payload en MessagePack (las fechas de las entidades como epoch)"""
+    return msgpack.packb(_to_wire(payload), default=_default, use_bin_type=True)
+
+
+def unpack(data: bytes) -> Any:
+    """Decodifica un cuerpo MessagePack"""
+    return msgpack.unpackb(data, raw=False)
+
+
+def respond(payload: Dict[str, Any]) -> Response:
+    """
+    Construye la respuesta en el formato negociado con el cliente.
+    Se usa igual que jsonify: `return respond({...}), 200`
+    """
+    with stage('serialize'):
+        if wants_msgpack():
+            response = Response(pack(payload), mimetype=MSGPACK_MIMETYPE)
+        else:
+            response = jsonify(payload)
+    response.vary.add('Accept')
+    return response
+
+
+def respond_stream(envelope: Dict[str, Any], key: str, items: Iterable[Dict[str, Any]]) -> Response:
+    """
+    Respuesta JSON con una lista grande: el sobre se envía primero y cada
+    elemento se codifica a medida que se transmite, sin construir el documento
+    completo en memoria. En MessagePack se responde con respond().
+    """
+    if wants_msgpack():
+        return respond({**envelope, key: list(items)})
+
+    def generate() -> Iterator[str]:
+        head = json.dumps(envelope)
+        yield head[:-1] + (', ' if envelope else '') + json.dumps(key) + ': ['
+        chunk = []
+        for position, item in enumerate(items):
+            chunk.append((', ' if position else '') + json.dumps(item))
+            if len(chunk) == STREAM_CHUNK_ITEMS:
+                yield ''.join(chunk)
+                chunk = []
+        chunk.append(']}')
+        yield ''.join(chunk)
+
+    response = Response(generate(), mimetype=JSON_MIMETYPE)
+    response.vary.add('Accept')
+    return response
+
+
+def has_payload() -> bool:
+    """Indica si el cuerpo de la petición es JSON o MessagePack"""
+    if request.is_json:
+        return True
+    return msgpack is not None and request.mimetype in MSGPACK_MIMETYPES
+
+
+def get_payload() -> Optional[Any]:
+    """
+    Cuerpo de la petición decodificado (JSON o MessagePack)
+
+    Raises:
+        ValueError: Si el cuerpo MessagePack no es válido
+    """
+    with span('parse_request'):
+        if request.mimetype in MSGPACK_MIMETYPES and msgpack is not None:
+            try:
+                return unpack(request.get_data())
+            except Exception as e:
+                raise ValueError(f"Cuerpo MessagePack inválido: {e}")
+        return request.get_json()
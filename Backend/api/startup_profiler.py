@@ -0,0 +1,145 @@
+"""
+API Layer - Perfilado de arranque
+Mide el tiempo de importación de cada módulo, la construcción de los servicios
+y el calentamiento de la primera petición, y genera un reporte ordenado.
+
+Se activa con la variable de entorno VM_API_PROFILE_STARTUP=1 o con la opción
+--profile-startup de api/main.py. Desactivado, stage() no mide nada.
+"""
+import builtins
+import importlib.util
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+ENV_FLAG = 'VM_API_PROFILE_STARTUP'
+CLI_FLAG = '--profile-startup'
+
+
+def profiling_requested(argv: Optional[List[str]] = None) -> bool:
+    """Indica si el perfilado se pidió por entorno o por línea de comandos"""
+    argv = sys.argv if argv is None else argv
+    return os.environ.get(ENV_FLAG, '').lower() in ('1', 'true', 'yes') or CLI_FLAG in argv
+
+
+class StartupProfiler:
+    """
+    Registra tiempos de arranque:
+    - imports: tiempo acumulado (incluye submódulos) y propio de cada módulo
+    - stages: etapas nombradas (construcción de servicios, primera petición, ...)
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._original_import = None
+        self._imports: Dict[str, Tuple[float, float]] = {}
+        self._stack: List[float] = []
+        self._stages: List[Tuple[str, float]] = []
+        self._started_at = time.perf_counter()
+
+    # ===== Imports =====
+    def install(self) -> None:
+        """Activa el perfilado e instala el hook de importación"""
+        if self._original_import is not None:
+            return
+        self.enabled = True
+        self._started_at = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self) -> None:
+        """Restaura el mecanismo de importación original"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        if level:
+            package = (globals or {}).get('__package__') or ''
+            try:
+                module_name = importlib.util.resolve_name('.' * level + name, package)
+            except (ImportError, ValueError):
+                module_name = name
+        else:
+            module_name = name
+
+        # Ruta rápida: el módulo ya estaba cargado
+        if module_name in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            if module_name not in self._imports:
+                self._imports[module_name] = (elapsed, elapsed - children)
+
+    # ===== Etapas =====
+    @contextmanager
+    def stage(self, name: str):
+        """Mide una etapa nombrada del arranque (no hace nada si está desactivado)"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stages.append((name, time.perf_counter() - start))
+
+    def record(self, name: str, seconds: float) -> None:
+        """Registra una etapa medida externamente"""
+        if self.enabled:
+            self._stages.append((name, seconds))
+
+    # ===== Reporte =====
+    def to_dict(self, top: Optional[int] = None) -> Dict[str, Any]:
+        imports = sorted(self._imports.items(), key=lambda item: item[1][1], reverse=True)
+        if top is not None:
+            imports = imports[:top]
+        return {
+            'total_ms': round((time.perf_counter() - self._started_at) * 1000, 3),
+            'stages': [
+                {'name': name, 'ms': round(seconds * 1000, 3)}
+                for name, seconds in sorted(self._stages, key=lambda item: item[1], reverse=True)
+            ],
+            'imports': [
+                {'module': module, 'cumulative_ms': round(cumulative * 1000, 3), 'self_ms': round(own * 1000, 3)}
+                for module, (cumulative, own) in imports
+            ]
+        }
+
+    def report(self, top: int = 25) -> str:
+        """Reporte de texto ordenado de mayor a menor tiempo"""
+        data = self.to_dict(top)
+        lines = [
+            "=" * 70,
+            f"PERFIL DE ARRANQUE (total: {data['total_ms']:.1f} ms)",
+            "=" * 70,
+            "Etapas:"
+        ]
+        for stage in data['stages']:
+            lines.append(f"  {stage['ms']:10.2f} ms  {stage['name']}")
+        lines.append(f"Imports (top {top} por tiempo propio):")
+        lines.append(f"  {'acumulado':>10}    {'propio':>10}    módulo")
+        for entry in data['imports']:
+            lines.append(f"  {entry['cumulative_ms']:10.2f} ms {entry['self_ms']:10.2f} ms  {entry['module']}")
+        lines.append("=" * 70)
+        return "\n".join(lines)
+
+    def write_json(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(self.to_dict(), fh, indent=2)
+
+
+# Instancia única usada por api/main.py
+startup_profiler = StartupProfiler()
@@ -0,0 +1,134 @@
+"""
+Application Layer - Capacidad agregada
+Totales de vCPUs, memoria, disco y número de VMs por proveedor, región y
+estado, mantenidos de forma incremental con los eventos del inventario
+"""
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from domain.entities import MachineVirtual, VMStatus
+from domain.registry import ProviderRegistry, provider_registry
+
+# (proveedor canónico, región, estado)
+CapacityKey = Tuple[str, Optional[str], str]
+
+
+@dataclass
+class CapacityTotals:
+    """Totales de un grupo de VMs"""
+    vms: int = 0
+    vcpus: int = 0
+    memoryGB: int = 0
+    diskGB: int = 0
+
+    def add(self, other: 'CapacityTotals', sign: int = 1) -> None:
+        self.vms += sign * other.vms
+        self.vcpus += sign * other.vcpus
+        self.memoryGB += sign * other.memoryGB
+        self.diskGB += sign * other.diskGB
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "vms": self.vms,
+            "vcpus": self.vcpus,
+            "memoryGB": self.memoryGB,
+            "diskGB": self.diskGB
+        }
+
+
+class CapacityAggregator:
+    """
+    Listener del inventario que mantiene los totales por (proveedor, región, estado)
+
+    Cada evento ajusta solo el grupo afectado, así que consultar la capacidad
+    cuesta O(grupos) en lugar de recorrer todas las VMs. La aportación de cada
+    VM se guarda al darla de alta, de modo que las bajas y los cambios de
+    estado restan exactamente lo que se sumó. Las VMs terminadas no cuentan.
+
+    Uso:
+        capacity = CapacityAggregator()
+        capacity.attach(inventory)
+        capacity.summary(provider='aws')
+    """
+
+    def __init__(self, registry: ProviderRegistry = provider_registry):
+        self._registry = registry
+        self._lock = threading.Lock()
+        self._groups: Dict[CapacityKey, CapacityTotals] = {}
+        self._contributions: Dict[str, Tuple[CapacityKey, CapacityTotals]] = {}
+
+    def attach(self, inventory) -> None:
+        """Carga las VMs existentes y se suscribe a los eventos del inventario"""
+        with inventory.lock:
+            for vm in inventory.find():
+                if vm.status != VMStatus.TERMINATED:
+                    self._add(vm)
+            inventory.add_listener(self.on_event)
+
+    def on_event(self, event) -> None:
+        """Listener de InventoryEvent (se invoca dentro del lock del inventario)"""
+        # Alta (o reemplazo) y cambio de estado: se resta la aportación anterior.
+        # Las VMs terminadas ya no consumen capacidad.
+        self._remove(event.vm.vmId)
+        if event.kind != 'deleted' and event.vm.status != VMStatus.TERMINATED:
+            self._add(event.vm)
+
+    # ===== Mantenimiento incremental =====
+    def _key(self, vm: MachineVirtual) -> CapacityKey:
+        provider = self._registry.canonical(vm.provider) or vm.provider
+        return (provider, vm.get_region(), vm.status.value)
+
+    @staticmethod
+    def _contribution(vm: MachineVirtual) -> CapacityTotals:
+        disk_gb = sum(disk.size_gb for disk in vm.disks or [])
+        return CapacityTotals(vms=1, vcpus=vm.vcpus or 0, memoryGB=vm.memoryGB or 0, diskGB=disk_gb)
+
+    def _add(self, vm: MachineVirtual) -> None:
+        key, totals = self._key(vm), self._contribution(vm)
+        with self._lock:
+            self._contributions[vm.vmId] = (key, totals)
+            self._groups.setdefault(key, CapacityTotals()).add(totals)
+
+    def _remove(self, vm_id: str) -> None:
+        with self._lock:
+            previous = self._contributions.pop(vm_id, None)
+            if previous is None:
+                return
+            key, totals = previous
+            group = self._groups[key]
+            group.add(totals, sign=-1)
+            if group.vms == 0:
+                del self._groups[key]
+
+    # ===== Consulta =====
+    def summary(self, provider: Optional[str] = None, region: Optional[str] = None,
+                status: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Totales globales y desglose por grupo, con filtros opcionales
+
+        Returns:
+            {'totals': {...}, 'groups': [{'provider', 'region', 'status', 'vms', ...}]}
+        """
+        if provider:
+            provider = self._registry.canonical(provider) or provider
+
+        totals = CapacityTotals()
+        groups: List[Dict[str, Any]] = []
+        with self._lock:
+            for (group_provider, group_region, group_status), group in sorted(
+                    self._groups.items(), key=lambda item: tuple(part or '' for part in item[0])):
+                if provider and group_provider != provider:
+                    continue
+                if region and group_region != region:
+                    continue
+                if status and group_status != status:
+                    continue
+                totals.add(group)
+                groups.append({
+                    "provider": group_provider,
+                    "region": group_region,
+                    "status": group_status,
+                    **group.to_dict()
+                })
+        return {"totals": totals.to_dict(), "groups": groups}
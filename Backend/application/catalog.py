@@ -0,0 +1,160 @@
+"""
+Application Layer - Catálogo de tipos de instancia
+Catálogo filtrable y paginado construido sobre VMInstanceType con índices secundarios
+"""
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from application.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+from domain.entities import VMInstanceType
+from domain.registry import ProviderRegistry, provider_registry
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """Tipo de instancia de un proveedor con sus especificaciones"""
+    provider: str
+    instance_type: str
+    family: Optional[str]
+    vcpus: int
+    memoryGB: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "provider": self.provider,
+            "instance_type": self.instance_type,
+            "family": self.family,
+            "vcpus": self.vcpus,
+            "memoryGB": self.memoryGB
+        }
+
+
+@dataclass
+class CatalogPage:
+    """Página de resultados del catálogo"""
+    items: List[CatalogEntry]
+    next_cursor: Optional[str]
+    limit: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "items": [entry.to_dict() for entry in self.items],
+            "count": len(self.items),
+            "next_cursor": self.next_cursor,
+            "limit": self.limit
+        }
+
+
+class InstanceCatalog:
+    """
+    Catálogo inmutable de tipos de instancia.
+
+    Los índices se construyen una sola vez:
+    - provider -> posiciones
+    - family -> posiciones
+    - listas ordenadas (vcpus, posición) y (memoryGB, posición) para rangos con bisect
+
+    El orden global (proveedor y orden de declaración) es estable, por lo que
+    el cursor solo necesita la última posición devuelta.
+    """
+
+    def __init__(self, entries: Iterable[CatalogEntry], registry: ProviderRegistry = provider_registry):
+        self._registry = registry
+        self._entries: List[CatalogEntry] = list(entries)
+        self._by_provider: Dict[str, Set[int]] = {}
+        self._by_family: Dict[str, Set[int]] = {}
+        self._by_vcpus: List[Tuple[int, int]] = []
+        self._by_memory: List[Tuple[int, int]] = []
+
+        for pos, entry in enumerate(self._entries):
+            self._by_provider.setdefault(entry.provider, set()).add(pos)
+            if entry.family:
+                self._by_family.setdefault(entry.family, set()).add(pos)
+            self._by_vcpus.append((entry.vcpus, pos))
+            self._by_memory.append((entry.memoryGB, pos))
+
+        self._by_vcpus.sort()
+        self._by_memory.sort()
+
+    @classmethod
+    def from_instance_types(cls, registry: ProviderRegistry = provider_registry) -> 'InstanceCatalog':
+        """Construye el catálogo a partir de los catálogos del registro de proveedores"""
+        entries = []
+        for descriptor in registry.descriptors():
+            types_dict = descriptor.catalog
+            for instance_type, specs in types_dict.items():
+                entries.append(CatalogEntry(
+                    provider=descriptor.key,
+                    instance_type=instance_type,
+                    family=VMInstanceType.get_family(types_dict, instance_type),
+                    vcpus=specs['vcpus'],
+                    memoryGB=specs['memoryGB']
+                ))
+        return cls(entries, registry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def providers(self) -> List[str]:
+        return list(self._by_provider.keys())
+
+    def families(self) -> List[str]:
+        return list(self._by_family.keys())
+
+    @staticmethod
+    def _range(index: List[Tuple[int, int]], low: Optional[int], high: Optional[int]) -> Set[int]:
+        """Posiciones cuyo valor está en [low, high] usando búsqueda binaria"""
+        start = bisect_left(index, (low, -1)) if low is not None else 0
+        end = bisect_right(index, (high, len(index))) if high is not None else len(index)
+        return {pos for _, pos in index[start:end]}
+
+    def query(self, provider: Optional[str] = None, family: Optional[str] = None,
+              min_vcpus: Optional[int] = None, max_vcpus: Optional[int] = None,
+              min_memory: Optional[int] = None, max_memory: Optional[int] = None,
+              cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> CatalogPage:
+        """
+        Filtra el catálogo intersectando los índices secundarios
+
+        Raises:
+            ValueError: Si el cursor es inválido
+        """
+        candidates: Optional[Set[int]] = None
+
+        def narrow(positions: Set[int]) -> None:
+            nonlocal candidates
+            candidates = positions if candidates is None else candidates & positions
+
+        if provider:
+            narrow(self._by_provider.get(self._registry.canonical(provider), set()))
+        if family:
+            narrow(self._by_family.get(family.lower().strip(), set()))
+        if min_vcpus is not None or max_vcpus is not None:
+            narrow(self._range(self._by_vcpus, min_vcpus, max_vcpus))
+        if min_memory is not None or max_memory is not None:
+            narrow(self._range(self._by_memory, min_memory, max_memory))
+
+        after = -1
+        if cursor:
+            position = decode_cursor(cursor).get('pos')
+            # bool es subclase de int y una posición < -1 retrocedería el rango
+            if type(position) is not int or position < -1:
+                raise ValueError("Cursor inválido")
+            after = position
+
+        if candidates is None:
+            positions = range(after + 1, len(self._entries))
+        else:
+            positions = sorted(pos for pos in candidates if pos > after)
+
+        page = [pos for _, pos in zip(range(limit + 1), positions)]
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor({'pos': page[-1]})
+
+        return CatalogPage(
+            items=[self._entries[pos] for pos in page],
+            next_cursor=next_cursor,
+            limit=limit
+        )
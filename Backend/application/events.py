@@ -0,0 +1,164 @@
+"""
+Application Layer - Feed de eventos del inventario
+Buffer circular de eventos con IDs crecientes para Server-Sent Events
+
+Cada cambio del inventario (alta, cambio de estado, baja) se publica con un
+ID `<época>-<n>`: n es un entero creciente y la época identifica al proceso
+que lo emitió. Con varios workers cada uno numera sus propios eventos, así
+que un Last-Event-ID de otra época (otro worker u otro arranque) no se
+compara con los IDs locales. Los clientes reanudan con `Last-Event-ID`: si
+ese ID ya salió del buffer o es de otra época el feed lo indica para que el
+cliente vuelva a sincronizarse con GET /api/vms.
+"""
+import os
+import secrets
+import threading
+from collections import deque
+from itertools import islice
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Tipos de evento publicados
+VM_CREATED = 'vm.created'
+VM_STATUS_CHANGED = 'vm.status_changed'
+VM_DELETED = 'vm.deleted'
+
+_KIND_TO_TYPE = {
+    'created': VM_CREATED,
+    'status_changed': VM_STATUS_CHANGED,
+    'deleted': VM_DELETED
+}
+
+
+# Posición que no corresponde a este feed: since() reenvía el buffer como incompleto
+RESYNC = -1
+
+
+@dataclass(frozen=True)
+class FeedEvent:
+    id: int
+    type: str
+    data: Dict[str, Any]
+    epoch: str = ''
+
+    @property
+    def event_id(self) -> str:
+        """ID publicado en el campo `id:` de SSE"""
+        return f"{self.epoch}-{self.id}"
+
+
+class EventFeed:
+    """
+    Buffer circular thread-safe de los últimos `capacity` eventos
+
+    Uso:
+        feed = EventFeed()
+        feed.attach(inventory)
+        events, complete = feed.wait(feed.parse_id(last_event_id), timeout=15)
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self._events: Deque[FeedEvent] = deque(maxlen=capacity)
+        self._last_id = 0
+        self._condition = threading.Condition()
+        self._epoch = ''
+        self._epoch_pid: Optional[int] = None
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    @property
+    def epoch(self) -> str:
+        """Época del proceso actual (cada worker de un servidor pre-fork tiene la suya)"""
+        if self._epoch_pid != os.getpid():
+            self._epoch = secrets.token_hex(4)
+            self._epoch_pid = os.getpid()
+        return self._epoch
+
+    def format_id(self, position: int) -> str:
+        """ID `<época>-<n>` de una posición del feed"""
+        return f"{self.epoch}-{position}"
+
+    def parse_id(self, event_id: Optional[str]) -> Optional[int]:
+        """
+        Posición local de un Last-Event-ID; RESYNC si es de otra época
+        (otro worker, otro arranque o un ID entero antiguo)
+
+        Raises:
+            ValueError: Si el ID no tiene el formato `<época>-<n>` ni es un entero
+        """
+        if not event_id:
+            return None
+        epoch, separator, position = event_id.rpartition('-')
+        if not separator:
+            int(event_id)
+            return RESYNC
+        if not position.isdigit() or not epoch:
+            raise ValueError(f"ID de evento inválido: {event_id}")
+        return int(position) if epoch == self.epoch else RESYNC
+
+    def attach(self, inventory) -> None:
+        """Publica los eventos del inventario en el feed"""
+        inventory.add_listener(self.on_event)
+
+    def on_event(self, event) -> None:
+        """Listener de InventoryEvent (se invoca dentro del lock del inventario)"""
+        vm = event.vm
+        data: Dict[str, Any] = {
+            'vmId': vm.vmId,
+            'provider': vm.provider,
+            'status': vm.status.value,
+            'timestamp': event.timestamp.isoformat()
+        }
+        if event.previous_status is not None:
+            data['previous_status'] = event.previous_status.value
+        if event.kind == 'created':
+            data['vm'] = vm.to_dict()
+        self.publish(_KIND_TO_TYPE[event.kind], data)
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> int:
+        """Agrega un evento al buffer, despierta a los suscriptores y retorna su ID"""
+        with self._condition:
+            self._last_id += 1
+            self._events.append(FeedEvent(self._last_id, event_type, data, self.epoch))
+            self._condition.notify_all()
+            return self._last_id
+
+    def since(self, last_id: Optional[int]) -> Tuple[List[FeedEvent], bool]:
+        """
+        Eventos posteriores a `last_id` (None: solo los nuevos a partir de ahora)
+
+        Returns:
+            (eventos, completo): completo es False si se perdieron eventos
+            porque `last_id` ya no está en el buffer o no es de este feed (RESYNC)
+        """
+        with self._condition:
+            return self._since(last_id)
+
+    def _since(self, last_id: Optional[int]) -> Tuple[List[FeedEvent], bool]:
+        if last_id is None or last_id == self._last_id:
+            return [], True
+        if last_id > self._last_id or last_id == RESYNC:
+            # ID de otro worker o arranque: se reenvía todo el buffer
+            return list(self._events), False
+        oldest = self._events[0].id if self._events else self._last_id + 1
+        if last_id < oldest - 1:
+            return list(self._events), False
+        # Los IDs son consecutivos: el primer evento pendiente está en la posición last_id + 1 - oldest
+        start = last_id + 1 - oldest
+        return list(islice(self._events, start, None)), True
+
+    def wait(self, last_id: Optional[int], timeout: float) -> Tuple[List[FeedEvent], bool]:
+        """Como since(), pero bloquea hasta `timeout` segundos si no hay eventos nuevos"""
+        with self._condition:
+            if last_id is None:
+                last_id = self._last_id
+            self._condition.wait_for(lambda: self._last_id != last_id, timeout=timeout)
+            return self._since(last_id)
+
+
+def format_sse(event: FeedEvent, payload: str) -> str:
+    """Codifica un evento en el formato text/event-stream"""
+    return f"id: {event.event_id}\nevent: {event.type}\ndata: {payload}\n\n"
+
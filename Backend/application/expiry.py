@@ -0,0 +1,198 @@
+"""
+Application Layer - Expiración de VMs efímeras
+VMs con TTL (expiresAt) y un reaper en segundo plano que las termina
+
+- ExpiryTracker: min-heap de (expiresAt, vmId). Programar y extraer vencidos
+  cuesta O(log n); las cancelaciones son perezosas (la entrada queda en el
+  heap y se descarta al salir) y el heap se reconstruye si acumula demasiadas.
+- ExpiryReaper: hilo que cada `interval` segundos extrae las VMs vencidas y
+  las termina en lotes con VMLifecycleService.
+"""
+import heapq
+import logging
+import os
+import threading
+import time
+import weakref
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from domain.entities import MachineVirtual, VMStatus
+from domain.lifecycle import VMAction
+
+logger = logging.getLogger(__name__)
+
+# TTL por defecto de las VMs del preset 'minimal' (desarrollo/testing)
+DEFAULT_MINIMAL_TTL_SECONDS = 24 * 3600
+
+# TTL máximo aceptado: 90 días
+MAX_TTL_SECONDS = 90 * 24 * 3600
+
+
+def parse_ttl(value: Any) -> Optional[int]:
+    """
+    Valida un TTL en segundos. None = no indicado, 0 = sin expiración.
+
+    Raises:
+        ValueError: Si no es un entero entre 0 y MAX_TTL_SECONDS
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError("'ttl_seconds' debe ser un entero")
+    if value < 0 or value > MAX_TTL_SECONDS:
+        raise ValueError(f"'ttl_seconds' debe estar entre 0 y {MAX_TTL_SECONDS}")
+    return value
+
+
+def apply_ttl(vm: MachineVirtual, ttl_seconds: Optional[int]) -> MachineVirtual:
+    """Fija expiresAt = createdAt + TTL (un TTL de 0 o None no expira)"""
+    if ttl_seconds:
+        vm.expiresAt = vm.createdAt + timedelta(seconds=ttl_seconds)
+    return vm
+
+
+class ExpiryTracker:
+    """
+    Vencimientos pendientes del inventario
+
+    Se suscribe a los eventos del inventario: las altas con expiresAt se
+    programan y las bajas o terminaciones se cancelan.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._heap: List[Tuple[float, str]] = []
+        self._deadlines: Dict[str, float] = {}
+
+    def attach(self, inventory) -> None:
+        """Programa las VMs existentes y se suscribe a los eventos del inventario"""
+        with inventory.lock:
+            for vm in inventory.find():
+                self._track(vm)
+            inventory.add_listener(self.on_event)
+
+    def on_event(self, event) -> None:
+        """Listener de InventoryEvent (se invoca dentro del lock del inventario)"""
+        if event.kind == 'deleted':
+            self.cancel(event.vm.vmId)
+        else:
+            self._track(event.vm)
+
+    def _track(self, vm: MachineVirtual) -> None:
+        if vm.expiresAt is None or vm.status == VMStatus.TERMINATED:
+            self.cancel(vm.vmId)
+        else:
+            self.schedule(vm.vmId, vm.expiresAt.timestamp())
+
+    def schedule(self, vm_id: str, deadline: float) -> None:
+        with self._lock:
+            if self._deadlines.get(vm_id) == deadline:
+                return
+            self._deadlines[vm_id] = deadline
+            heapq.heappush(self._heap, (deadline, vm_id))
+            self._maybe_rebuild()
+
+    def cancel(self, vm_id: str) -> None:
+        with self._lock:
+            if self._deadlines.pop(vm_id, None) is not None:
+                self._maybe_rebuild()
+
+    def _maybe_rebuild(self) -> None:
+        # Las entradas obsoletas (canceladas o reprogramadas) se purgan si dominan el heap
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [(deadline, vm_id) for vm_id, deadline in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+    def pop_expired(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[str]:
+        """Extrae hasta `limit` VMs vencidas, de la más antigua a la más reciente"""
+        now = time.time() if now is None else now
+        expired: List[str] = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now and (limit is None or len(expired) < limit):
+                deadline, vm_id = heapq.heappop(self._heap)
+                if self._deadlines.get(vm_id) == deadline:
+                    del self._deadlines[vm_id]
+                    expired.append(vm_id)
+        return expired
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+
+# Reapers en marcha: su hilo no sobrevive a un fork (gunicorn --preload), así
+# que cada hijo arranca el suyo (el lease decide cuál termina las VMs)
+_reapers: 'weakref.WeakSet[ExpiryReaper]' = weakref.WeakSet()
+
+
+def _restart_reapers_after_fork() -> None:
+    for reaper in list(_reapers):
+        reaper._thread = None
+        reaper.start()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_reapers_after_fork)
+
+
+class ExpiryReaper:
+    """
+    Hilo que termina las VMs cuyo TTL venció
+
+    Las VMs que no se pudieron terminar (p.ej. aún en CREATING o un fallo
+    del proveedor) se reprograman tras `retry_delay` segundos.
+
+    Con varios workers, `leader` decide antes de cada pasada si este worker
+    es el que termina las VMs (los demás se saltan la pasada).
+    """
+
+    def __init__(self, tracker: ExpiryTracker, lifecycle_service, interval: float = 30.0,
+                 batch_size: int = 100, retry_delay: float = 300.0,
+                 leader: Optional[Callable[[], bool]] = None):
+        self.tracker = tracker
+        self.leader = leader
+        self.lifecycle = lifecycle_service
+        self.interval = interval
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self, now: Optional[float] = None) -> int:
+        """Termina todas las VMs vencidas, en lotes; retorna cuántas se terminaron"""
+        now = time.time() if now is None else now
+        terminated = 0
+        while True:
+            batch = self.tracker.pop_expired(now, self.batch_size)
+            if not batch:
+                break
+            for result in self.lifecycle.apply(VMAction.TERMINATE, batch):
+                if result.success:
+                    terminated += 1
+                elif result.previous_status is not None and result.status != VMStatus.TERMINATED.value:
+                    self.tracker.schedule(result.vm_id, now + self.retry_delay)
+        if terminated:
+            logger.info(f"Reaper: {terminated} VMs expiradas terminadas")
+        return terminated
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                if self.leader is None or self.leader():
+                    self.run_once()
+            except Exception as e:
+                logger.error(f"Error en el reaper de VMs expiradas: {str(e)}", exc_info=True)
+
+    def start(self) -> None:
+        if self._thread is None and not self._stop.is_set():
+            self._thread = threading.Thread(target=self._run, name='vm-expiry-reaper', daemon=True)
+            self._thread.start()
+            _reapers.add(self)
+
+    def stop(self) -> None:
+        self._stop.set()
+        _reapers.discard(self)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
@@ -3,19 +3,37 @@ Application Layer - Factory Pattern
 Implementación del patrón Factory Method
 Aplicando OCP y DIP
 """
-from typing import Dict, Any, Optional, Type
+from typing import Dict, Any, Optional, Type, Union
 import logging
 
 from pydantic import ValidationError
-from application.schemas import get_validator_for
 from domain.interfaces import ProveedorAbstracto
 from domain.entities import ProvisioningResult, VMStatus, MachineVirtual
-from domain.builder import VMBuilder, VMDirector
-from infrastructure.providers import AWS, Azure, Google, OnPremise  # Esta importación sigue funcionando gracias al __init__.py
-from infrastructure.builders import AWSVMBuilder, AzureVMBuilder, GoogleVMBuilder, OnPremiseVMBuilder
+from domain.builder import VMBuilder, VMDirector, VMBuildPlanCache
+from domain.registry import ProviderDescriptor, ProviderRegistry, provider_registry
+from application.inventory import VMInventory
+import application.schemas  # noqa: F401 - registra los validadores integrados
+from application.expiry import DEFAULT_MINIMAL_TTL_SECONDS, apply_ttl
+from application.labels import parse_labels
+from application.request_summary import annotate, stage
+from domain.tracing import traced
 
 logger = logging.getLogger(__name__)
 
+ProviderRef = Union[str, ProviderDescriptor]
+
+# Clases de los proveedores integrados (rutas de importación, carga perezosa)
+BUILTIN_COMPONENTS = {
+    'aws': ('infrastructure.providers.aws.AWS', 'infrastructure.builders.aws_builder.AWSVMBuilder'),
+    'azure': ('infrastructure.providers.azure.Azure', 'infrastructure.builders.azure_builder.AzureVMBuilder'),
+    'google': ('infrastructure.providers.google.Google', 'infrastructure.builders.google_builder.GoogleVMBuilder'),
+    'onpremise': ('infrastructure.providers.onpremise.OnPremise',
+                  'infrastructure.builders.onpremise_builder.OnPremiseVMBuilder')
+}
+
+for _name, (_provider, _builder) in BUILTIN_COMPONENTS.items():
+    provider_registry.update(_name, provider=_provider, builder=_builder)
+
 
 class VMProviderFactory:
     """
@@ -28,59 +46,60 @@ class VMProviderFactory:
     - SRP: Solo se encarga de crear proveedores
     """
     
-    # Registro de proveedores disponibles (facilita extensibilidad)
-    _providers = {
-        'aws': AWS,
-        'azure': Azure,
-        'google': Google,
-        'gcp': Google, 
-        'onpremise': OnPremise  
-    }
+    # Registro unificado de proveedores (claves, alias y clases con carga perezosa)
+    _registry: ProviderRegistry = provider_registry
     
     @classmethod
-    def register_provider(cls, name: str, provider_class):
+    def register_provider(cls, name: str, provider_class: Union[str, type]):
         """
         Permite registrar nuevos proveedores dinámicamente
         Mejora la extensibilidad (OCP)
+
+        provider_class puede ser la clase o su ruta de importación
+        ('paquete.modulo.Clase') para cargarla de forma perezosa.
+        Si `name` es un alias, se actualiza el proveedor canónico.
         """
-        cls._providers[name.lower()] = provider_class
-        logger.info(f"Proveedor registrado: {name}")
+        cls._registry.update(name, provider=provider_class)
+        logger.debug("Proveedor registrado: %s", name)
     
     @classmethod
-    def create_provider(cls, provider_type: str, config: Dict[str, Any]) -> Optional[ProveedorAbstracto]:
+    @traced('create_provider')
+    def create_provider(cls, provider_type: ProviderRef, config: Dict[str, Any]) -> Optional[ProveedorAbstracto]:
         """
         Factory Method: Crea el proveedor apropiado según el tipo
         
         Args:
             provider_type: Tipo de proveedor (aws, azure, google, onpremise)
+                           o su descriptor ya resuelto
             config: Configuración específica del proveedor
             
         Returns:
             Instancia del proveedor o None si no existe
         """
-        provider_type = provider_type.lower().strip()
-        
-        provider_class = cls._providers.get(provider_type)
+        descriptor = (provider_type if isinstance(provider_type, ProviderDescriptor)
+                      else cls._registry.resolve(provider_type))
         
-        if provider_class is None:
+        if descriptor is None or descriptor.provider is None:
             logger.error(f"Proveedor no soportado: {provider_type}")
             return None
         
         try:
+            provider_class = descriptor.provider_class()
+
             # Crear instancia del proveedor
             provider = provider_class(config)
             
-            logger.info(f"Proveedor creado exitosamente: {provider_type}")
+            logger.debug("Proveedor creado exitosamente: %s", descriptor.key)
             return provider
             
         except Exception as e:
-            logger.error(f"Error creando proveedor {provider_type}: {str(e)}")
+            logger.error(f"Error creando proveedor {descriptor.key}: {str(e)}")
             return None
     
     @classmethod
     def get_available_providers(cls) -> list:
         """Retorna lista de proveedores disponibles"""
-        return list(cls._providers.keys())
+        return cls._registry.names('provider')
 
 
 class ProviderOrchestrator:
@@ -91,6 +110,7 @@ class ProviderOrchestrator:
     def __init__(self, factory: VMProviderFactory):
         self.factory = factory
 
+    @traced('get_validated_provider')
     def get_validated_provider(self, provider_type: str, config: Dict[str, Any]) -> tuple[Optional[ProveedorAbstracto], Optional[ProvisioningResult]]:
         """
         Valida la solicitud y devuelve el proveedor o un resultado de error.
@@ -103,12 +123,16 @@ class ProviderOrchestrator:
             )
             return None, error_result
 
+        # Resolver una sola vez el proveedor (alias incluidos) a su descriptor canónico
+        descriptor = self.factory._registry.resolve(provider_type)
+
         # 1. Validar el `config` usando el esquema de Pydantic correspondiente
-        validator = get_validator_for(provider_type)
+        validator = descriptor.validator_class() if descriptor else None
         if validator:
             try:
                 # Pydantic parsea, valida y asigna valores por defecto
-                validated_config = validator.model_validate(config)
+                with stage('validate'):
+                    validated_config = validator.model_validate(config)
                 # Usamos la configuración validada y enriquecida para la creación
                 config = validated_config.model_dump()
             except ValidationError as e:
@@ -121,7 +145,8 @@ class ProviderOrchestrator:
                 )
                 return None, error_result
 
-        provider = self.factory.create_provider(provider_type, config)
+        with stage('factory'):
+            provider = self.factory.create_provider(descriptor, config) if descriptor else None
 
         if provider is None:
             available = self.factory.get_available_providers()
@@ -154,23 +179,31 @@ class VMProvisioningService:
     - SRP: Solo se encarga de orquestar el aprovisionamiento
     - DIP: Depende de abstracciones (ProveedorAbstracto)
     - ISP: Interfaz específica para aprovisionamiento
+
+    Si se inyecta un VMInventory, cada VM creada se registra en él.
     """
     
-    def __init__(self):
+    def __init__(self, inventory: Optional[VMInventory] = None):
         factory = VMProviderFactory()
         self.orchestrator = ProviderOrchestrator(factory)
+        self.inventory = inventory
 
-    def provision_vm(self, provider_type: str, config: Dict[str, Any]) -> ProvisioningResult:
+    def provision_vm(self, provider_type: str, config: Dict[str, Any],
+                     ttl_seconds: Optional[int] = None,
+                     labels: Optional[Dict[str, str]] = None) -> ProvisioningResult:
         """
         Aprovisiona una VM usando el proveedor especificado
         
         Args:
             provider_type: Tipo de proveedor (aws, azure, google, onpremise)
             config: Configuración de la VM a crear
+            ttl_seconds: Segundos de vida de la VM (None o 0: no expira)
+            labels: Etiquetas clave=valor de la VM
             
         Returns:
             ProvisioningResult con el resultado de la operación
         """
+        annotate(provider=provider_type)
         try:
             # 1. Delegar validación y obtención del proveedor
             provider, error_result = self.orchestrator.get_validated_provider(provider_type, config)
@@ -183,13 +216,21 @@ class VMProvisioningService:
             assert provider is not None
 
             # Aprovisionar VM (RNF4 - Logging sin información sensible)
-            logger.info(f"Iniciando aprovisionamiento en {provider_type} con proveedor validado.")
-            
-            vm = provider.provisionar()
+            logger.debug("Iniciando aprovisionamiento en %s con proveedor validado.", provider_type)
+
+            with stage('provision'):
+                vm = provider.provisionar()
             
             # Validar creación
             if vm and vm.status == VMStatus.RUNNING:
-                logger.info(f"VM aprovisionada exitosamente - ID: {vm.vmId}")
+                logger.debug("VM aprovisionada exitosamente - ID: %s", vm.vmId)
+                annotate(vm_id=vm.vmId, instance_type=vm.instance_type)
+
+                apply_ttl(vm, ttl_seconds)
+                vm.labels = labels
+                if self.inventory is not None:
+                    with stage('register'):
+                        self.inventory.add(vm)
                 
                 return ProvisioningResult(
                     success=True,
@@ -230,47 +271,50 @@ class VMBuilderFactory:
     - DIP: Retorna abstracciones (VMBuilder) no implementaciones
     """
 
-    # Registro de builders disponibles
-    _builders = {
-        'aws': AWSVMBuilder,
-        'azure': AzureVMBuilder,
-        'google': GoogleVMBuilder,
-        'gcp': GoogleVMBuilder,  # Alias
-        'onpremise': OnPremiseVMBuilder,
-        'on-premise': OnPremiseVMBuilder  # Alias
-    }
+    # Registro unificado de proveedores (el builder es uno de sus componentes)
+    _registry: ProviderRegistry = provider_registry
 
     @classmethod
-    def create_builder(cls, provider_type: str) -> Optional[VMBuilder]:
+    def register_builder(cls, name: str, builder_class: Union[str, type]):
+        """
+        Permite registrar nuevos builders dinámicamente (clase o ruta de importación)
+        """
+        cls._registry.update(name, builder=builder_class)
+        logger.debug("Builder registrado: %s", name)
+
+    @classmethod
+    @traced('create_builder')
+    def create_builder(cls, provider_type: ProviderRef) -> Optional[VMBuilder]:
         """
         Factory Method: Crea el builder apropiado según el tipo
 
         Args:
             provider_type: Tipo de proveedor (aws, azure, google, onpremise)
+                           o su descriptor ya resuelto
 
         Returns:
             Instancia del builder o None si no existe
         """
-        provider_type = provider_type.lower().strip()
-
-        builder_class = cls._builders.get(provider_type)
+        descriptor = (provider_type if isinstance(provider_type, ProviderDescriptor)
+                      else cls._registry.resolve(provider_type))
 
-        if builder_class is None:
+        if descriptor is None or descriptor.builder is None:
             logger.error(f"Builder no soportado: {provider_type}")
             return None
 
         try:
+            builder_class = descriptor.builder_class()
             builder = builder_class()
-            logger.info(f"Builder creado exitosamente: {provider_type}")
+            logger.debug("Builder creado exitosamente: %s", descriptor.key)
             return builder
         except Exception as e:
-            logger.error(f"Error creando builder {provider_type}: {str(e)}")
+            logger.error(f"Error creando builder {descriptor.key}: {str(e)}")
             return None
 
     @classmethod
     def get_available_builders(cls) -> list:
         """Retorna lista de builders disponibles"""
-        return list(cls._builders.keys())
+        return cls._registry.names('builder')
 
 
 class VMBuildingService:
@@ -280,13 +324,32 @@ class VMBuildingService:
     Aplicando:
     - SRP: Solo se encarga de orquestar la construcción con builders
     - Builder Pattern: Usa builders para construcción compleja
+
+    Con use_compiled_plans, los presets del Director se compilan una vez por
+    (proveedor, preset, tamaño) y se reutilizan en cada construcción.
+    Si se inyecta un VMInventory, cada VM construida se registra en él.
     """
 
-    def __init__(self):
+    def __init__(self, use_compiled_plans: bool = True, inventory: Optional[VMInventory] = None,
+                 minimal_ttl_seconds: Optional[int] = DEFAULT_MINIMAL_TTL_SECONDS):
         self.builder_factory = VMBuilderFactory()
+        self.plan_cache: Optional[VMBuildPlanCache] = VMBuildPlanCache() if use_compiled_plans else None
+        self.inventory = inventory
+        self.minimal_ttl_seconds = minimal_ttl_seconds
+
+    def _register(self, vm: MachineVirtual, ttl_seconds: Optional[int] = None,
+                  labels: Optional[Dict[str, str]] = None) -> None:
+        """Fija TTL y etiquetas y registra la VM construida en el inventario (si hay uno configurado)"""
+        annotate(vm_id=vm.vmId, instance_type=vm.instance_type)
+        apply_ttl(vm, ttl_seconds)
+        vm.labels = labels
+        if self.inventory is not None:
+            with stage('register'):
+                self.inventory.add(vm)
 
     def build_vm_with_config(self, provider_type: str,
-                            build_config: Dict[str, Any]) -> ProvisioningResult:
+                            build_config: Dict[str, Any],
+                            ttl_seconds: Optional[int] = None) -> ProvisioningResult:
         """
         Construye una VM usando el builder con configuración personalizada
 
@@ -303,15 +366,24 @@ class VMBuildingService:
                     "location": "us-east-1",
                     "network_id": "vpc-123",
                     "cidr": "10.0.0.0/16",
-                    "advanced_options": {...}
+                    "advanced_options": {...},
+                    "labels": {"env": "prod", "team": "payments"}
                 }
 
+                Las etiquetas también se aceptan en advanced_options["labels"].
+            ttl_seconds: TTL ya validado (parse_ttl); None = sin expiración
+
         Returns:
             ProvisioningResult con el resultado de la operación
         """
+        annotate(provider=provider_type, preset='custom')
         try:
+            labels = parse_labels(build_config.get('labels',
+                                                   (build_config.get('advanced_options') or {}).get('labels')))
+
             # Crear builder
-            builder = self.builder_factory.create_builder(provider_type)
+            with stage('factory'):
+                builder = self.builder_factory.create_builder(provider_type)
 
             if builder is None:
                 available = self.builder_factory.get_available_builders()
@@ -322,46 +394,48 @@ class VMBuildingService:
                     provider=provider_type
                 )
 
-            # Construir VM paso a paso
-            builder.reset()
-
-            # Configuración básica
-            if 'name' in build_config and 'vm_type' in build_config:
-                builder.set_basic_config(build_config['name'], build_config['vm_type'])
-
-            # Recursos de cómputo
-            if 'cpu' in build_config or 'ram' in build_config:
-                builder.set_compute_resources(
-                    cpu=build_config.get('cpu'),
-                    ram=build_config.get('ram')
-                )
-
-            # Almacenamiento
-            if 'disk_gb' in build_config:
-                builder.set_storage(
-                    size_gb=build_config['disk_gb'],
-                    disk_type=build_config.get('disk_type')
-                )
-
-            # Red
-            if 'network_id' in build_config or 'cidr' in build_config:
-                builder.set_network(
-                    network_id=build_config.get('network_id'),
-                    cidr=build_config.get('cidr')
-                )
-
-            # Ubicación
-            if 'location' in build_config:
-                builder.set_location(build_config['location'])
-
-            # Opciones avanzadas
-            if 'advanced_options' in build_config:
-                builder.set_advanced_options(build_config['advanced_options'])
-
-            # Construir
-            vm = builder.build()
-
-            logger.info(f"VM construida exitosamente con Builder - ID: {vm.vmId}")
+            with stage('build'):
+                # Construir VM paso a paso
+                builder.reset()
+
+                # Configuración básica
+                if 'name' in build_config and 'vm_type' in build_config:
+                    builder.set_basic_config(build_config['name'], build_config['vm_type'])
+
+                # Recursos de cómputo
+                if 'cpu' in build_config or 'ram' in build_config:
+                    builder.set_compute_resources(
+                        cpu=build_config.get('cpu'),
+                        ram=build_config.get('ram')
+                    )
+
+                # Almacenamiento
+                if 'disk_gb' in build_config:
+                    builder.set_storage(
+                        size_gb=build_config['disk_gb'],
+                        disk_type=build_config.get('disk_type')
+                    )
+
+                # Red
+                if 'network_id' in build_config or 'cidr' in build_config:
+                    builder.set_network(
+                        network_id=build_config.get('network_id'),
+                        cidr=build_config.get('cidr')
+                    )
+
+                # Ubicación
+                if 'location' in build_config:
+                    builder.set_location(build_config['location'])
+
+                # Opciones avanzadas
+                if 'advanced_options' in build_config:
+                    builder.set_advanced_options(build_config['advanced_options'])
+
+                # Construir
+                vm = builder.build()
+
+            logger.debug("VM construida exitosamente con Builder - ID: %s", vm.vmId)
+            self._register(vm, ttl_seconds, labels)
 
             return ProvisioningResult(
                 success=True,
@@ -371,6 +445,14 @@ class VMBuildingService:
                 vm_details=vm.to_dict()
             )
 
+        except ValueError as ve:
+            logger.error(f"Error de validación: {str(ve)}")
+            return ProvisioningResult(
+                success=False,
+                message="Error de validación",
+                error_detail=str(ve),
+                provider=provider_type
+            )
         except Exception as e:
             logger.error(f"Error en construcción con builder: {str(e)}", exc_info=True)
             return ProvisioningResult(
@@ -383,7 +465,9 @@ class VMBuildingService:
     def build_predefined_vm(self, provider_type: str,
                            preset: str,
                            name: str,
-                           location: str = "us-east-1") -> ProvisioningResult:
+                           location: str = "us-east-1",
+                           ttl_seconds: Optional[int] = None,
+                           labels: Optional[Dict[str, str]] = None) -> ProvisioningResult:
         """
         Construye una VM usando configuraciones predefinidas a través del Director
 
@@ -392,13 +476,18 @@ class VMBuildingService:
             preset: Tipo de VM predefinida (minimal, standard, high-performance)
             name: Nombre de la VM
             location: Ubicación de despliegue
+            ttl_seconds: Segundos de vida de la VM (0: no expira). Sin indicar,
+                         las VMs 'minimal' expiran tras minimal_ttl_seconds
+            labels: Etiquetas clave=valor de la VM
 
         Returns:
             ProvisioningResult con el resultado de la operación
         """
+        annotate(provider=provider_type, preset=preset)
         try:
             # Crear builder
-            builder = self.builder_factory.create_builder(provider_type)
+            with stage('factory'):
+                builder = self.builder_factory.create_builder(provider_type)
 
             if builder is None:
                 return ProvisioningResult(
@@ -408,16 +497,19 @@ class VMBuildingService:
                 )
 
             # Crear director
-            director = VMDirector(builder)
+            director = VMDirector(builder, plan_cache=self.plan_cache)
 
             # Construir según preset
-            if preset == 'minimal':
-                vm = director.build_minimal_vm(name)
-            elif preset == 'standard':
-                vm = director.build_standard_vm(name, location)
-            elif preset == 'high-performance':
-                vm = director.build_high_performance_vm(name, location)
-            else:
+            with stage('build'):
+                if preset == 'minimal':
+                    vm = director.build_minimal_vm(name)
+                elif preset == 'standard':
+                    vm = director.build_standard_vm(name, location)
+                elif preset == 'high-performance':
+                    vm = director.build_high_performance_vm(name, location)
+                else:
+                    vm = None
+            if vm is None:
                 return ProvisioningResult(
                     success=False,
                     message=f"Preset '{preset}' no soportado",
@@ -425,7 +517,10 @@ class VMBuildingService:
                     provider=provider_type
                 )
 
-            logger.info(f"VM predefinida '{preset}' construida exitosamente - ID: {vm.vmId}")
+            logger.debug("VM predefinida '%s' construida exitosamente - ID: %s", preset, vm.vmId)
+            if ttl_seconds is None and preset == 'minimal':
+                ttl_seconds = self.minimal_ttl_seconds
+            self._register(vm, ttl_seconds, labels)
 
             return ProvisioningResult(
                 success=True,
@@ -445,7 +540,9 @@ class VMBuildingService:
             )
         
     def build_vm_type(self, provider_type: str, vm_type: str,
-                      name: str, location: str, size: str = 'medium') -> ProvisioningResult:
+                      name: str, location: str, size: str = 'medium',
+                      ttl_seconds: Optional[int] = None,
+                      labels: Optional[Dict[str, str]] = None) -> ProvisioningResult:
         """
         Construye una VM de uno de los 3 tipos especificados en el PDF usando Director
         
@@ -458,13 +555,17 @@ class VMBuildingService:
             name: Nombre de la VM
             location: Región/ubicación
             size: Tamaño de la VM (small, medium, large)
+            ttl_seconds: Segundos de vida de la VM (None o 0: no expira)
+            labels: Etiquetas clave=valor de la VM
         
         Returns:
             ProvisioningResult con el resultado de la operación
         """
+        annotate(provider=provider_type, preset=vm_type, size=size)
         try:
             # Crear builder
-            builder = self.builder_factory.create_builder(provider_type)
+            with stage('factory'):
+                builder = self.builder_factory.create_builder(provider_type)
 
             if builder is None:
                 available = self.builder_factory.get_available_builders()
@@ -476,20 +577,22 @@ class VMBuildingService:
                 )
 
             # Crear director
-            from domain.builder import VMDirector
-            director = VMDirector(builder)
+            director = VMDirector(builder, plan_cache=self.plan_cache)
 
             # Construir según el tipo de VM del PDF
-            if vm_type == 'standard':
-                vm = director.build_standard_vm(name, location, size)
-                type_description = "Standard VM (General Purpose)"
-            elif vm_type == 'memory-optimized':
-                vm = director.build_memory_optimized_vm(name, location, size)
-                type_description = "VM Optimizada en Memoria (Memory-Optimized)"
-            elif vm_type == 'disk-optimized':
-                vm = director.build_disk_optimized_vm(name, location, size)
-                type_description = "VM Optimizada en Disco (Compute-Optimized)"
-            else:
+            with stage('build'):
+                if vm_type == 'standard':
+                    vm = director.build_standard_vm(name, location, size)
+                    type_description = "Standard VM (General Purpose)"
+                elif vm_type == 'memory-optimized':
+                    vm = director.build_memory_optimized_vm(name, location, size)
+                    type_description = "VM Optimizada en Memoria (Memory-Optimized)"
+                elif vm_type == 'disk-optimized':
+                    vm = director.build_disk_optimized_vm(name, location, size)
+                    type_description = "VM Optimizada en Disco (Compute-Optimized)"
+                else:
+                    vm = None
+            if vm is None:
                 return ProvisioningResult(
                     success=False,
                     message=f"Tipo de VM '{vm_type}' no soportado",
@@ -497,9 +600,10 @@ class VMBuildingService:
                     provider=provider_type
                 )
 
-            logger.info(f"VM tipo '{vm_type}' construida exitosamente - ID: {vm.vmId}")
-            logger.info(f"Especificaciones: {vm.instance_type} - {vm.vcpus} vCPUs, {vm.memoryGB}GB RAM")
-            logger.info(f"Optimizaciones: Memory={vm.memoryOptimization}, Disk={vm.diskOptimization}")
+            logger.debug("VM tipo '%s' construida exitosamente - ID: %s, %s - %s vCPUs, %sGB RAM, "
+                         "Optimizaciones: Memory=%s, Disk=%s", vm_type, vm.vmId, vm.instance_type, vm.vcpus,
+                         vm.memoryGB, vm.memoryOptimization, vm.diskOptimization)
+            self._register(vm, ttl_seconds, labels)
 
             return ProvisioningResult(
                 success=True,
@@ -0,0 +1,341 @@
+"""
+Application Layer - Inventario de VMs
+Registro en memoria de las VMs creadas con búsqueda O(1) por vmId e índices
+secundarios por proveedor, región, estado y tipo de instancia
+"""
+import logging
+import math
+import threading
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from application.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+from domain.entities import MachineVirtual, VMInstanceType, VMStatus
+from domain.registry import ProviderRegistry, provider_registry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class InventoryEvent:
+    """
+    Cambio en el inventario
+
+    kind: 'created', 'status_changed' o 'deleted'
+    """
+    kind: str
+    vm: MachineVirtual
+    previous_status: Optional[VMStatus] = None
+    timestamp: datetime = field(default_factory=datetime.now)
+
+    CREATED = 'created'
+    STATUS_CHANGED = 'status_changed'
+    DELETED = 'deleted'
+
+
+InventoryListener = Callable[[InventoryEvent], None]
+
+# Clave de orden estable del inventario: (createdAt epoch, vmId)
+SortKey = Tuple[float, str]
+
+
+@dataclass
+class InventoryPage:
+    """Página de VMs del inventario"""
+    items: List[MachineVirtual]
+    next_cursor: Optional[str]
+    limit: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "vms": [vm.to_dict() for vm in self.items],
+            "count": len(self.items),
+            "next_cursor": self.next_cursor,
+            "limit": self.limit
+        }
+
+
+class VMInventory:
+    """
+    Inventario thread-safe de MachineVirtual
+
+    - _vms: vmId -> VM (búsqueda O(1))
+    - _indexes: campo -> valor -> conjunto de vmIds
+    - _order: lista ordenada de (createdAt, vmId) para paginar por cursor;
+      como los IDs son ordenables por tiempo, las altas se insertan al final
+
+    Los proveedores se indexan por su clave canónica (google/gcp, onpremise/
+    on-premise) y los cambios de estado deben hacerse con set_status() para
+    mantener los índices. Los listeners reciben cada InventoryEvent en orden,
+    dentro del lock del inventario.
+
+    Los listeners críticos (p.ej. el inventario compartido entre workers) se
+    invocan primero: si uno falla, el cambio se deshace y la excepción llega a
+    quien lo hizo. Los errores de los demás listeners solo se registran.
+    """
+
+    INDEXED_FIELDS = ('provider', 'region', 'status', 'instance_type', 'vm_type')
+
+    def __init__(self, registry: ProviderRegistry = provider_registry):
+        self._registry = registry
+        self._lock = threading.RLock()
+        self._vms: Dict[str, MachineVirtual] = {}
+        self._indexes: Dict[str, Dict[Any, Set[str]]] = {name: {} for name in self.INDEXED_FIELDS}
+        self._listeners: List[InventoryListener] = []
+        self._critical_listeners: List[InventoryListener] = []
+        self._order: List[SortKey] = []
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Lock reentrante del inventario, para lecturas coherentes con la secuencia de eventos"""
+        return self._lock
+
+    # ===== Listeners =====
+    def add_listener(self, listener: InventoryListener, critical: bool = False) -> None:
+        """
+        Suscribe un listener. Si es crítico, un error al procesar el evento
+        deshace el cambio y se propaga (el cambio no se publica a los demás)
+        """
+        with self._lock:
+            (self._critical_listeners if critical else self._listeners).append(listener)
+
+    def remove_listener(self, listener: InventoryListener) -> None:
+        with self._lock:
+            for listeners in (self._critical_listeners, self._listeners):
+                if listener in listeners:
+                    listeners.remove(listener)
+
+    def _commit(self, event: InventoryEvent, undo: Callable[[], None]) -> None:
+        """Confirma el cambio con los listeners críticos (o lo deshace) y lo publica"""
+        try:
+            for listener in self._critical_listeners:
+                listener(event)
+        except Exception:
+            undo()
+            raise
+        self._emit(event)
+
+    def _emit(self, event: InventoryEvent) -> None:
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.error(f"Error en listener del inventario: {str(e)}", exc_info=True)
+
+    # ===== Índices =====
+    def _canonical_provider(self, provider: Optional[str]) -> Optional[str]:
+        return self._registry.canonical(provider) or provider
+
+    @staticmethod
+    def _sort_key(vm: MachineVirtual) -> SortKey:
+        return (vm.createdAt.timestamp(), vm.vmId)
+
+    @staticmethod
+    def _vm_type(vm: MachineVirtual) -> Optional[str]:
+        """Familia del catálogo (standard, memory-optimized, disk-optimized) del tipo de instancia"""
+        types_dict = VMInstanceType.get_catalog(vm.provider)
+        if not types_dict or not vm.instance_type:
+            return None
+        return VMInstanceType.get_family(types_dict, vm.instance_type)
+
+    def _index_values(self, vm: MachineVirtual) -> Dict[str, Any]:
+        return {
+            'provider': self._canonical_provider(vm.provider),
+            'region': vm.get_region(),
+            'status': vm.status,
+            'instance_type': vm.instance_type,
+            'vm_type': self._vm_type(vm)
+        }
+
+    def _index(self, vm: MachineVirtual) -> None:
+        for name, value in self._index_values(vm).items():
+            self._indexes[name].setdefault(value, set()).add(vm.vmId)
+
+    def _unindex(self, vm: MachineVirtual) -> None:
+        for name, value in self._index_values(vm).items():
+            ids = self._indexes[name].get(value)
+            if ids is not None:
+                ids.discard(vm.vmId)
+                if not ids:
+                    del self._indexes[name][value]
+
+    # ===== Escritura =====
+    def _insert(self, vm: MachineVirtual) -> None:
+        self._vms[vm.vmId] = vm
+        self._index(vm)
+        insort(self._order, self._sort_key(vm))
+
+    def _delete(self, vm: MachineVirtual) -> None:
+        del self._vms[vm.vmId]
+        self._unindex(vm)
+        self._remove_order(vm)
+
+    def add(self, vm: MachineVirtual) -> MachineVirtual:
+        """Registra una VM (si el vmId ya existe se reemplaza)"""
+        with self._lock:
+            previous = self._vms.get(vm.vmId)
+            if previous is not None:
+                self._delete(previous)
+            self._insert(vm)
+
+            def undo() -> None:
+                self._delete(vm)
+                if previous is not None:
+                    self._insert(previous)
+            self._commit(InventoryEvent(InventoryEvent.CREATED, vm), undo)
+        return vm
+
+    def set_status(self, vm_id: str, status: VMStatus) -> Optional[MachineVirtual]:
+        """Cambia el estado de una VM actualizando el índice de estado"""
+        with self._lock:
+            vm = self._vms.get(vm_id)
+            if vm is None:
+                return None
+            previous = vm.status
+            if previous == status:
+                return vm
+            self._set_status(vm, status)
+            self._commit(InventoryEvent(InventoryEvent.STATUS_CHANGED, vm, previous_status=previous),
+                         lambda: self._set_status(vm, previous))
+        return vm
+
+    def _set_status(self, vm: MachineVirtual, status: VMStatus) -> None:
+        self._unindex(vm)
+        vm.status = status
+        self._index(vm)
+
+    def remove(self, vm_id: str) -> Optional[MachineVirtual]:
+        """Elimina una VM del inventario"""
+        with self._lock:
+            vm = self._vms.get(vm_id)
+            if vm is None:
+                return None
+            self._delete(vm)
+            self._commit(InventoryEvent(InventoryEvent.DELETED, vm), lambda: self._insert(vm))
+        return vm
+
+    def _remove_order(self, vm: MachineVirtual) -> None:
+        key = self._sort_key(vm)
+        pos = bisect_left(self._order, key)
+        if pos < len(self._order) and self._order[pos] == key:
+            del self._order[pos]
+
+    # ===== Lectura =====
+    def get(self, vm_id: str) -> Optional[MachineVirtual]:
+        return self._vms.get(vm_id)
+
+    def __contains__(self, vm_id: str) -> bool:
+        return vm_id in self._vms
+
+    def __len__(self) -> int:
+        return len(self._vms)
+
+    def _normalize_filters(self, provider: Optional[str], region: Optional[str],
+                           status: Union[VMStatus, str, None],
+                           instance_type: Optional[str], vm_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Raises:
+            ValueError: Si el estado no es un VMStatus válido
+        """
+        filters: Dict[str, Any] = {}
+        if provider:
+            filters['provider'] = self._canonical_provider(provider)
+        if region:
+            filters['region'] = region
+        if status:
+            try:
+                filters['status'] = status if isinstance(status, VMStatus) else VMStatus(status)
+            except ValueError:
+                valid = ', '.join(s.value for s in VMStatus)
+                raise ValueError(f"Estado '{status}' no válido. Estados: {valid}")
+        if instance_type:
+            filters['instance_type'] = instance_type
+        if vm_type:
+            if vm_type not in VMInstanceType.FAMILIES:
+                raise ValueError(f"Tipo de VM '{vm_type}' no válido. Tipos: {', '.join(VMInstanceType.FAMILIES)}")
+            filters['vm_type'] = vm_type
+        return filters
+
+    def _matching_ids(self, filters: Dict[str, Any]) -> Set[str]:
+        """Intersección de índices empezando por el conjunto más pequeño"""
+        candidates = sorted((self._indexes[name].get(value, set()) for name, value in filters.items()),
+                            key=len)
+        return candidates[0].intersection(*candidates[1:])
+
+    def find(self, provider: Optional[str] = None, region: Optional[str] = None,
+             status: Union[VMStatus, str, None] = None,
+             instance_type: Optional[str] = None, vm_type: Optional[str] = None) -> List[MachineVirtual]:
+        """
+        VMs que cumplen todos los filtros, ordenadas por (createdAt, vmId).
+
+        Raises:
+            ValueError: Si el estado o el tipo de VM no son válidos
+        """
+        filters = self._normalize_filters(provider, region, status, instance_type, vm_type)
+        with self._lock:
+            if not filters:
+                return [self._vms[vm_id] for _, vm_id in self._order]
+            vms = [self._vms[vm_id] for vm_id in self._matching_ids(filters)]
+        vms.sort(key=self._sort_key)
+        return vms
+
+    def page(self, provider: Optional[str] = None, region: Optional[str] = None,
+             status: Union[VMStatus, str, None] = None, instance_type: Optional[str] = None,
+             vm_type: Optional[str] = None, cursor: Optional[str] = None,
+             limit: int = DEFAULT_PAGE_SIZE) -> InventoryPage:
+        """
+        Página de VMs filtradas en orden estable (createdAt, vmId).
+
+        El cursor guarda la clave de la última VM devuelta, así que las altas
+        y bajas entre páginas no duplican ni saltan resultados. Si los filtros
+        son selectivos se ordenan solo los candidatos; si no, se recorre el
+        orden global desde el cursor hasta llenar la página.
+
+        Raises:
+            ValueError: Si el cursor o algún filtro no son válidos
+        """
+        filters = self._normalize_filters(provider, region, status, instance_type, vm_type)
+        after = self._decode_position(cursor) if cursor else None
+
+        with self._lock:
+            if not filters:
+                start = bisect_right(self._order, after) if after else 0
+                keys = self._order[start:start + limit + 1]
+            else:
+                ids = self._matching_ids(filters)
+                if len(ids) * 8 < len(self._order):
+                    candidates = sorted(self._sort_key(self._vms[vm_id]) for vm_id in ids)
+                    start = bisect_right(candidates, after) if after else 0
+                    keys = candidates[start:start + limit + 1]
+                else:
+                    order = self._order
+                    keys = []
+                    for pos in range(bisect_right(order, after) if after else 0, len(order)):
+                        key = order[pos]
+                        if key[1] in ids:
+                            keys.append(key)
+                            if len(keys) > limit:
+                                break
+            items = [self._vms[vm_id] for _, vm_id in keys[:limit]]
+
+        next_cursor = None
+        if len(keys) > limit:
+            last = keys[limit - 1]
+            next_cursor = encode_cursor({'created': last[0], 'id': last[1]})
+        return InventoryPage(items=items, next_cursor=next_cursor, limit=limit)
+
+    @staticmethod
+    def _decode_position(cursor: str) -> SortKey:
+        data = decode_cursor(cursor)
+        created, vm_id = data.get('created'), data.get('id')
+        # bool es subclase de int y NaN/Infinity (aceptados por json) no se ordenan con bisect
+        if type(created) not in (int, float) or not math.isfinite(created) or type(vm_id) is not str:
+            raise ValueError("Cursor inválido")
+        return (float(created), vm_id)
+
+    def count_by(self, name: str) -> Dict[Any, int]:
+        """Número de VMs por valor de un campo indexado"""
+        with self._lock:
+            return {value: len(ids) for value, ids in self._indexes[name].items()}
@@ -0,0 +1,318 @@
+"""
+Application Layer - Etiquetas de VMs
+Validación de etiquetas, índice de bitmaps y consultas booleanas
+
+Cada VM recibe una posición (slot) fija mientras esté en el índice; los slots
+de las VMs dadas de baja se reutilizan (el más bajo primero), así que los
+bitmaps crecen con las VMs vivas y no con todas las creadas. Por cada par
+clave=valor se mantiene un bitmap (un int de Python) con los slots de las VMs
+que lo tienen, de modo que una consulta como
+
+    env=prod AND team=payments AND NOT provider=azure
+
+se resuelve con operaciones AND/OR/NOT entre enteros. Además de las
+etiquetas se indexan los campos provider (clave canónica), region y status.
+
+Gramática de las consultas (AND tiene más precedencia que OR):
+    expr   := and ('OR' and)*
+    and    := unary ('AND' unary)*
+    unary  := 'NOT' unary | '(' expr ')' | term
+    term   := clave '=' valor | clave '!=' valor | clave   (clave existe)
+
+El parser y la evaluación son recursivos, así que las consultas se limitan a
+MAX_QUERY_TOKENS tokens y MAX_QUERY_DEPTH niveles de NOT/paréntesis.
+"""
+import heapq
+import re
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from domain.entities import MachineVirtual
+from domain.registry import ProviderRegistry, provider_registry
+
+# Campos de la VM consultables como si fueran etiquetas
+BUILTIN_FIELDS = ('provider', 'region', 'status')
+
+MAX_LABELS = 64
+MAX_LABEL_LENGTH = 63
+_LABEL_KEY = re.compile(r'^[a-z0-9]([a-z0-9._/-]*[a-z0-9])?$')
+_LABEL_VALUE = re.compile(r'^[A-Za-z0-9._/-]*$')
+
+
+def parse_labels(value: Any) -> Optional[Dict[str, str]]:
+    """
+    Valida las etiquetas recibidas en una petición
+
+    Raises:
+        ValueError: Si no son un objeto clave -> valor válido
+    """
+    if value is None:
+        return None
+    if not isinstance(value, dict):
+        raise ValueError("'labels' debe ser un objeto clave: valor")
+    if len(value) > MAX_LABELS:
+        raise ValueError(f"Máximo {MAX_LABELS} etiquetas por VM")
+    labels = {}
+    for key, item in value.items():
+        if not isinstance(key, str) or len(key) > MAX_LABEL_LENGTH or not _LABEL_KEY.match(key):
+            raise ValueError(f"Clave de etiqueta inválida: '{key}' (minúsculas, dígitos, '.', '_', '-', '/')")
+        if key in BUILTIN_FIELDS:
+            raise ValueError(f"'{key}' está reservado y no puede usarse como etiqueta")
+        if isinstance(item, bool) or not isinstance(item, (str, int)):
+            raise ValueError(f"El valor de la etiqueta '{key}' debe ser texto")
+        item = str(item)
+        if len(item) > MAX_LABEL_LENGTH or not _LABEL_VALUE.match(item):
+            raise ValueError(f"Valor de etiqueta inválido: '{key}={item}'")
+        labels[key] = item
+    return labels or None
+
+
+# ===== Consultas =====
+_TOKEN = re.compile(r'\s*(?:(\()|(\))|(!=|=)|([^\s()!=]+))')
+_KEYWORDS = {'AND', 'OR', 'NOT'}
+MAX_QUERY_TOKENS = 256
+MAX_QUERY_DEPTH = 32
+
+# Nodos del árbol: ('and', a, b) | ('or', a, b) | ('not', a) | ('eq', k, v) | ('has', k)
+Query = Tuple[Any, ...]
+
+
+def _tokenize(text: str) -> List[str]:
+    tokens, pos = [], 0
+    text = text.strip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f"Consulta inválida cerca de '{text[pos:]}'")
+        tokens.append(next(group for group in match.groups() if group is not None))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+        self.pos = 0
+        self.depth = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self) -> str:
+        token = self.peek()
+        if token is None:
+            raise ValueError("Consulta incompleta")
+        self.pos += 1
+        return token
+
+    def expr(self) -> Query:
+        node = self.conjunction()
+        while self.peek() is not None and self.peek().upper() == 'OR':
+            self.take()
+            node = ('or', node, self.conjunction())
+        return node
+
+    def conjunction(self) -> Query:
+        node = self.unary()
+        while self.peek() is not None and self.peek().upper() == 'AND':
+            self.take()
+            node = ('and', node, self.unary())
+        return node
+
+    def unary(self) -> Query:
+        token = self.take()
+        if token.upper() == 'NOT' or token == '(':
+            self.depth += 1
+            if self.depth > MAX_QUERY_DEPTH:
+                raise ValueError(f"Consulta inválida: más de {MAX_QUERY_DEPTH} niveles de NOT o paréntesis")
+            try:
+                if token == '(':
+                    node = self.expr()
+                    if self.take() != ')':
+                        raise ValueError("Falta ')' en la consulta")
+                    return node
+                return ('not', self.unary())
+            finally:
+                self.depth -= 1
+        if token in (')', '=', '!=') or token.upper() in _KEYWORDS:
+            raise ValueError(f"Token inesperado '{token}'")
+        if self.peek() in ('=', '!='):
+            operator = self.take()
+            value = self.take()
+            if value in ('(', ')', '=', '!='):
+                raise ValueError(f"Falta el valor de '{token}'")
+            node = ('eq', token, value)
+            return ('not', node) if operator == '!=' else node
+        return ('has', token)
+
+
+def parse_query(text: str) -> Query:
+    """
+    Raises:
+        ValueError: Si la consulta no es válida
+    """
+    tokens = _tokenize(text)
+    if not tokens:
+        raise ValueError("La consulta está vacía")
+    if len(tokens) > MAX_QUERY_TOKENS:
+        raise ValueError(f"Consulta inválida: más de {MAX_QUERY_TOKENS} tokens")
+    parser = _Parser(tokens)
+    node = parser.expr()
+    if parser.peek() is not None:
+        raise ValueError(f"Token inesperado '{parser.peek()}'")
+    return node
+
+
+class LabelIndex:
+    """
+    Listener del inventario con un bitmap por par clave=valor
+
+    Uso:
+        labels = LabelIndex()
+        labels.attach(inventory)
+        labels.query('env=prod AND NOT provider=azure')  # -> (total, [vmId, ...])
+    """
+
+    def __init__(self, registry: ProviderRegistry = provider_registry):
+        self._registry = registry
+        self._lock = threading.Lock()
+        self._slots: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        # Orden de alta de la VM de cada slot (un slot reutilizado no conserva el orden)
+        self._order: List[int] = []
+        self._next_order = 0
+        self._free: List[int] = []  # heap de slots libres
+        self._pairs: Dict[str, Dict[str, str]] = {}
+        self._bitmaps: Dict[Tuple[str, str], int] = {}
+        self._keys: Dict[str, int] = {}
+        self._all = 0
+
+    def attach(self, inventory) -> None:
+        """Indexa las VMs existentes y se suscribe a los eventos del inventario"""
+        with inventory.lock:
+            for vm in inventory.find():
+                self.add(vm)
+            inventory.add_listener(self.on_event)
+
+    def on_event(self, event) -> None:
+        """Listener de InventoryEvent"""
+        if event.kind == 'deleted':
+            self.remove(event.vm.vmId)
+        else:
+            self.add(event.vm)
+
+    # ===== Mantenimiento =====
+    def _pairs_of(self, vm: MachineVirtual) -> Dict[str, str]:
+        pairs = dict(vm.labels or {})
+        pairs['provider'] = self._registry.canonical(vm.provider) or vm.provider
+        pairs['status'] = vm.status.value
+        region = vm.get_region()
+        if region:
+            pairs['region'] = region
+        return pairs
+
+    def add(self, vm: MachineVirtual) -> None:
+        """Alta o actualización (cambio de estado) de una VM"""
+        pairs = self._pairs_of(vm)
+        with self._lock:
+            slot = self._slots.get(vm.vmId)
+            if slot is None:
+                slot = self._allocate(vm.vmId)
+            previous = self._pairs.get(vm.vmId, {})
+            if previous == pairs:
+                return
+            bit = 1 << slot
+            for key, value in previous.items():
+                if pairs.get(key) != value:
+                    self._clear(key, value, bit)
+            for key, value in pairs.items():
+                if previous.get(key) != value:
+                    self._bitmaps[(key, value)] = self._bitmaps.get((key, value), 0) | bit
+                    self._keys[key] = self._keys.get(key, 0) | bit
+            self._pairs[vm.vmId] = pairs
+
+    def remove(self, vm_id: str) -> None:
+        with self._lock:
+            slot = self._slots.pop(vm_id, None)
+            if slot is None:
+                return
+            bit = 1 << slot
+            # Los pares de la VM son todos los bitmaps con su bit: al limpiarlos
+            # el slot queda libre en todos y puede reutilizarse
+            for key, value in self._pairs.pop(vm_id, {}).items():
+                self._clear(key, value, bit)
+            self._ids[slot] = None
+            self._all &= ~bit
+            heapq.heappush(self._free, slot)
+
+    def _allocate(self, vm_id: str) -> int:
+        """Asigna el slot libre más bajo (o uno nuevo al final)"""
+        if self._free:
+            slot = heapq.heappop(self._free)
+            self._ids[slot] = vm_id
+            self._order[slot] = self._next_order
+        else:
+            slot = len(self._ids)
+            self._ids.append(vm_id)
+            self._order.append(self._next_order)
+        self._next_order += 1
+        self._slots[vm_id] = slot
+        self._all |= 1 << slot
+        return slot
+
+    def _clear(self, key: str, value: str, bit: int) -> None:
+        bitmap = self._bitmaps.get((key, value), 0) & ~bit
+        if bitmap:
+            self._bitmaps[(key, value)] = bitmap
+        else:
+            self._bitmaps.pop((key, value), None)
+        # Otra etiqueta con la misma clave no puede existir en la misma VM
+        keys = self._keys.get(key, 0) & ~bit
+        if keys:
+            self._keys[key] = keys
+        else:
+            self._keys.pop(key, None)
+
+    # ===== Consulta =====
+    def _evaluate(self, node: Query) -> int:
+        op = node[0]
+        if op == 'and':
+            left = self._evaluate(node[1])
+            return left & self._evaluate(node[2]) if left else 0
+        if op == 'or':
+            return self._evaluate(node[1]) | self._evaluate(node[2])
+        if op == 'not':
+            return self._all & ~self._evaluate(node[1])
+        if op == 'has':
+            return self._keys.get(node[1], 0)
+        key, value = node[1], node[2]
+        if key == 'provider':
+            value = self._registry.canonical(value) or value
+        return self._bitmaps.get((key, value), 0)
+
+    def _iter_slots(self, bitmap: int) -> Iterator[int]:
+        while bitmap:
+            low = bitmap & -bitmap
+            yield low.bit_length() - 1
+            bitmap ^= low
+
+    def query(self, text: str, limit: int = 50) -> Tuple[int, List[str]]:
+        """
+        Evalúa una consulta
+
+        Returns:
+            (total de VMs que cumplen, primeros `limit` vmIds en orden de alta)
+
+        Raises:
+            ValueError: Si la consulta no es válida
+        """
+        node = parse_query(text)
+        with self._lock:
+            bitmap = self._evaluate(node)
+            # Con slots reutilizados el orden de los slots no es el de alta
+            slots = heapq.nsmallest(limit, self._iter_slots(bitmap), key=self._order.__getitem__)
+            ids = [self._ids[slot] for slot in slots]
+        return bin(bitmap).count('1'), ids
+
+    def __len__(self) -> int:
+        return len(self._slots)
@@ -0,0 +1,159 @@
+"""
+Application Layer - Operaciones de ciclo de vida
+Aplica stop / start / terminate a muchas VMs en paralelo con resultado por VM
+"""
+import logging
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from application.factory import VMProviderFactory
+from application.inventory import VMInventory
+from domain.entities import VMStatus
+from domain.interfaces import ProveedorAbstracto
+from domain.lifecycle import InvalidTransitionError, VMAction, next_status
+
+logger = logging.getLogger(__name__)
+
+# Filtros admitidos en un selector (los mismos que VMInventory.find)
+SELECTOR_FIELDS = ('instance_type', 'provider', 'region', 'status', 'vm_type')
+
+# Método del proveedor que ejecuta cada acción
+_OPERATIONS = {
+    VMAction.STOP: 'detener_vm',
+    VMAction.START: 'iniciar_vm',
+    VMAction.TERMINATE: 'terminar_vm'
+}
+
+
+@dataclass
+class ActionResult:
+    """Resultado de una acción sobre una VM"""
+    vm_id: str
+    success: bool
+    previous_status: Optional[str] = None
+    status: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            "vm_id": self.vm_id,
+            "success": self.success,
+            "previous_status": self.previous_status,
+            "status": self.status
+        }
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+# Servicios vivos: los hilos del pool no sobreviven a un fork (gunicorn
+# --preload) y el pool heredado quedaría sin workers, así que se recrea
+_services: 'weakref.WeakSet[VMLifecycleService]' = weakref.WeakSet()
+
+
+def _reset_services_after_fork() -> None:
+    for service in list(_services):
+        service._reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_services_after_fork)
+
+
+class VMLifecycleService:
+    """
+    Application Service: acciones masivas de ciclo de vida sobre el inventario
+
+    Cada VM se procesa en un pool de hilos compartido: se valida la transición
+    con la máquina de estados, se invoca la operación del proveedor (fuera del
+    lock del inventario) y se registra el nuevo estado con set_status(). Si otra
+    petición cambió el estado mientras tanto, el resultado de esa VM es un
+    conflicto y el estado no se toca. Un fallo en una VM no afecta al resto.
+    """
+
+    def __init__(self, inventory: VMInventory, factory: Optional[VMProviderFactory] = None,
+                 max_workers: int = 16):
+        self.inventory = inventory
+        self.factory = factory or VMProviderFactory()
+        self.max_workers = max_workers
+        self._providers: Dict[str, ProveedorAbstracto] = {}
+        self._reset()
+        _services.add(self)
+
+    def _reset(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='vm-lifecycle')
+        self._providers_lock = threading.Lock()
+
+    def select(self, selector: Dict[str, Any]) -> List[str]:
+        """
+        IDs de las VMs que cumplen el selector (mismos filtros que VMInventory.find)
+
+        Raises:
+            ValueError: Si algún filtro no es válido
+        """
+        unknown = [str(name) for name in selector if name not in SELECTOR_FIELDS]
+        if unknown:
+            raise ValueError(f"Filtros no soportados: {', '.join(sorted(unknown))}. "
+                             f"Filtros: {', '.join(SELECTOR_FIELDS)}")
+        for name, value in selector.items():
+            if not isinstance(value, str):
+                raise ValueError(f"El filtro '{name}' debe ser texto")
+        return [vm.vmId for vm in self.inventory.find(**selector)]
+
+    def apply(self, action: VMAction, vm_ids: Iterable[str]) -> List[ActionResult]:
+        """Aplica la acción a cada VM en paralelo; los resultados siguen el orden de entrada"""
+        unique_ids = list(dict.fromkeys(vm_ids))
+        futures = [self._executor.submit(self._apply_one, action, vm_id) for vm_id in unique_ids]
+        results = [future.result() for future in futures]
+
+        succeeded = sum(1 for result in results if result.success)
+        logger.info(f"Acción '{action.value}': {succeeded}/{len(results)} VMs correctas")
+        return results
+
+    def _provider_for(self, provider_name: str) -> Optional[ProveedorAbstracto]:
+        """Una instancia de proveedor por clave, reutilizada entre acciones"""
+        with self._providers_lock:
+            provider = self._providers.get(provider_name)
+            if provider is None:
+                provider = self.factory.create_provider(provider_name, {})
+                if provider is not None:
+                    self._providers[provider_name] = provider
+            return provider
+
+    def _apply_one(self, action: VMAction, vm_id: str) -> ActionResult:
+        with self.inventory.lock:
+            vm = self.inventory.get(vm_id)
+            if vm is None:
+                return ActionResult(vm_id, False, error=f"VM '{vm_id}' no encontrada")
+            previous: VMStatus = vm.status
+            try:
+                target = next_status(previous, action)
+            except InvalidTransitionError as e:
+                return ActionResult(vm_id, False, previous.value, previous.value, str(e))
+
+        try:
+            provider = self._provider_for(vm.provider)
+            if provider is None:
+                raise RuntimeError(f"Proveedor '{vm.provider}' no soportado")
+            getattr(provider, _OPERATIONS[action])(vm)
+        except Exception as e:
+            logger.error(f"Error en '{action.value}' de la VM {vm_id}: {str(e)}")
+            return ActionResult(vm_id, False, previous.value, previous.value, str(e))
+
+        with self.inventory.lock:
+            if vm_id not in self.inventory or vm.status != previous:
+                return ActionResult(vm_id, False, previous.value, vm.status.value,
+                                    "El estado de la VM cambió durante la operación")
+            try:
+                self.inventory.set_status(vm_id, target)
+            except Exception as e:
+                logger.error(f"No se pudo registrar '{action.value}' de la VM {vm_id}: {str(e)}")
+                return ActionResult(vm_id, False, previous.value, previous.value, str(e))
+        return ActionResult(vm_id, True, previous.value, target.value)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,55 @@
+"""
+Application Layer - Paginación por cursor
+Utilidades compartidas para cursores opacos y tamaños de página acotados
+"""
+import base64
+import json
+from typing import Any, Dict, Optional
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(data: Dict[str, Any]) -> str:
+    """
+    Codifica la posición de paginación como un cursor opaco (base64 URL-safe).
+    El cliente no debe interpretar su contenido, solo devolverlo.
+    """
+    raw = json.dumps(data, separators=(',', ':'), sort_keys=True).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decodifica un cursor generado por encode_cursor.
+
+    Raises:
+        ValueError: Si el cursor está malformado
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError("Cursor inválido")
+
+    if not isinstance(data, dict):
+        raise ValueError("Cursor inválido")
+    return data
+
+
+def parse_page_size(value: Optional[str], default: int = DEFAULT_PAGE_SIZE,
+                    maximum: int = MAX_PAGE_SIZE) -> int:
+    """
+    Interpreta el parámetro `limit` y lo acota a [1, maximum].
+
+    Raises:
+        ValueError: Si el valor no es un entero
+    """
+    if value is None or value == '':
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Parámetro 'limit' inválido: {value}")
+    return max(1, min(limit, maximum))
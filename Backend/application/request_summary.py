@@ -0,0 +1,104 @@
+"""
+Application Layer - Resumen estructurado por petición
+Un único registro de log por petición con proveedor, preset, tiempos por
+etapa y resultado, en lugar de varias líneas INFO por construcción
+
+La API abre un resumen al empezar cada petición (begin) y lo emite al
+terminar; los servicios lo completan sin conocerlo:
+
+    with stage('build'):
+        vm = director.build_standard_vm(...)
+    annotate(provider='aws', preset='standard', vm_id=vm.vmId)
+
+Fuera de una petición (tests, scripts) stage() y annotate() no hacen nada.
+El mensaje se renderiza como pares clave=valor (logfmt) solo si el registro
+se emite, y el diccionario completo viaja en el atributo `request_summary`
+del LogRecord para formatters estructurados (JSON).
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Iterator, Optional
+
+from domain.tracing import span
+
+_current: ContextVar[Optional['RequestSummary']] = ContextVar('request_summary', default=None)
+
+
+class RequestSummary:
+    """Campos y tiempos (en ms) de una petición"""
+
+    def __init__(self, method: str, path: str):
+        self.fields: Dict[str, Any] = {'method': method, 'path': path}
+        self.stages: Dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    def annotate(self, **fields: Any) -> None:
+        self.fields.update((key, value) for key, value in fields.items() if value is not None)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Acumula la duración de una etapa (una etapa puede repetirse)"""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds * 1000
+
+    def finish(self, status: int) -> Dict[str, Any]:
+        """Cierra el resumen con el código HTTP y la duración total"""
+        self.fields['status'] = status
+        self.fields['outcome'] = ('success' if status < 400 else
+                                  'rejected' if status < 500 else 'error')
+        self.fields['duration_ms'] = round((time.perf_counter() - self._started) * 1000, 3)
+        return self.to_dict()
+
+    def server_timing(self) -> str:
+        """
+        Valor de la cabecera Server-Timing: una métrica por etapa y el total
+        (p.ej. `factory;dur=0.021, build;dur=0.220, total;dur=4.866`)
+        """
+        metrics = [f"{name};dur={ms:.3f}" for name, ms in self.stages.items()]
+        if 'duration_ms' in self.fields:
+            metrics.append(f"total;dur={self.fields['duration_ms']:.3f}")
+        return ', '.join(metrics)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = dict(self.fields)
+        data['stages'] = {name: round(ms, 3) for name, ms in self.stages.items()}
+        return data
+
+    def __str__(self) -> str:
+        parts = [f"{key}={value}" for key, value in self.fields.items()]
+        parts.extend(f"{name}_ms={ms:.3f}" for name, ms in self.stages.items())
+        return ' '.join(parts)
+
+
+def begin(method: str, path: str) -> Token:
+    """Abre el resumen de la petición en curso; retorna el token para end()"""
+    return _current.set(RequestSummary(method, path))
+
+
+def end(token: Token) -> None:
+    _current.reset(token)
+
+
+def current() -> Optional[RequestSummary]:
+    return _current.get()
+
+
+def annotate(**fields: Any) -> None:
+    """Agrega campos al resumen de la petición en curso (los None se ignoran)"""
+    summary = _current.get()
+    if summary is not None:
+        summary.annotate(**fields)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Mide una etapa de la petición en curso (también como span, si hay trazas)"""
+    summary = _current.get()
+    with span(name):
+        if summary is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            summary.record(name, time.perf_counter() - start)
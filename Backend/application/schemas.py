@@ -7,6 +7,8 @@ de cada proveedor, cumpliendo con la extensión opcional del PDF.
 from pydantic import BaseModel, Field
 from typing import Optional, Type, Dict, Any
 
+from domain.registry import provider_registry
+
 
 class AWSConfig(BaseModel):
     """Esquema de validación para AWS."""
@@ -45,16 +47,16 @@ class OnPremiseConfig(BaseModel):
     raidLevel: Optional[int] = None
 
 
-# Mapeo para obtener el validador correcto
-_validators: Dict[str, Type[BaseModel]] = {
-    'aws': AWSConfig,
-    'azure': AzureConfig,
-    'google': GoogleConfig,
-    'gcp': GoogleConfig,
-    'onpremise': OnPremiseConfig,
-    'on-premise': OnPremiseConfig
-}
+# Validadores de los proveedores integrados
+for _name, _validator in (('aws', AWSConfig), ('azure', AzureConfig),
+                          ('google', GoogleConfig), ('onpremise', OnPremiseConfig)):
+    provider_registry.update(_name, validator=_validator)
+
 
 def get_validator_for(provider_type: str) -> Optional[Type[BaseModel]]:
-    """Retorna la clase de validación para un proveedor."""
-    return _validators.get(provider_type.lower().strip())
\ No newline at end of file
+    """
+    Retorna la clase de validación para un proveedor.
+    El mapeo proveedor -> validador vive en el registro unificado (domain.registry).
+    """
+    descriptor = provider_registry.resolve(provider_type)
+    return descriptor.validator_class() if descriptor else None
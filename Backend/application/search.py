@@ -0,0 +1,123 @@
+"""
+Application Layer - Búsqueda de VMs por nombre
+Índice incremental sobre MachineVirtual.name para búsquedas por prefijo y
+por subcadena sin recorrer todo el inventario
+
+- Prefijo: lista ordenada de (nombre, vmId); bisect localiza el rango en O(log n)
+- Subcadena: índice invertido de trigramas; se intersectan las listas de los
+  trigramas de la consulta y se verifican los candidatos
+
+Las búsquedas no distinguen mayúsculas de minúsculas.
+"""
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Set, Tuple
+
+from domain.entities import MachineVirtual
+
+# Longitud mínima de consulta para buscar por subcadena (las más cortas solo por prefijo)
+MIN_SUBSTRING_QUERY = 3
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class NameIndex:
+    """
+    Listener del inventario con el índice de nombres
+
+    Uso:
+        names = NameIndex()
+        names.attach(inventory)
+        names.search('web-pro', limit=20)  # -> [vmId, ...]
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._names: Dict[str, str] = {}
+        self._sorted: List[Tuple[str, str]] = []
+        self._trigrams: Dict[str, Set[str]] = {}
+
+    def attach(self, inventory) -> None:
+        """Indexa las VMs existentes y se suscribe a los eventos del inventario"""
+        with inventory.lock:
+            for vm in inventory.find():
+                self.add(vm)
+            inventory.add_listener(self.on_event)
+
+    def on_event(self, event) -> None:
+        """Listener de InventoryEvent (el nombre no cambia con el estado)"""
+        if event.kind == 'created':
+            self.add(event.vm)
+        elif event.kind == 'deleted':
+            self.remove(event.vm.vmId)
+
+    # ===== Mantenimiento =====
+    def add(self, vm: MachineVirtual) -> None:
+        name = (vm.name or '').lower()
+        with self._lock:
+            if vm.vmId in self._names:
+                self._remove(vm.vmId)
+            self._names[vm.vmId] = name
+            insort(self._sorted, (name, vm.vmId))
+            for gram in _trigrams(name):
+                self._trigrams.setdefault(gram, set()).add(vm.vmId)
+
+    def remove(self, vm_id: str) -> None:
+        with self._lock:
+            self._remove(vm_id)
+
+    def _remove(self, vm_id: str) -> None:
+        name = self._names.pop(vm_id, None)
+        if name is None:
+            return
+        pos = bisect_left(self._sorted, (name, vm_id))
+        if pos < len(self._sorted) and self._sorted[pos] == (name, vm_id):
+            del self._sorted[pos]
+        for gram in _trigrams(name):
+            ids = self._trigrams.get(gram)
+            if ids is not None:
+                ids.discard(vm_id)
+                if not ids:
+                    del self._trigrams[gram]
+
+    # ===== Consulta =====
+    def _prefix(self, query: str, limit: int) -> List[str]:
+        matches = []
+        pos = bisect_left(self._sorted, (query, ''))
+        while pos < len(self._sorted) and len(matches) < limit:
+            name, vm_id = self._sorted[pos]
+            if not name.startswith(query):
+                break
+            matches.append(vm_id)
+            pos += 1
+        return matches
+
+    def _substring(self, query: str) -> List[Tuple[str, str]]:
+        postings = sorted((self._trigrams.get(gram, set()) for gram in _trigrams(query)), key=len)
+        if not postings or not postings[0]:
+            return []
+        candidates = postings[0].intersection(*postings[1:])
+        return sorted((self._names[vm_id], vm_id) for vm_id in candidates if query in self._names[vm_id])
+
+    def search(self, query: str, limit: int = 50) -> List[str]:
+        """
+        vmIds cuyo nombre contiene la consulta: primero las coincidencias por
+        prefijo y después el resto, cada grupo en orden alfabético
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+        with self._lock:
+            results = self._prefix(query, limit)
+            if len(results) < limit and len(query) >= MIN_SUBSTRING_QUERY:
+                for name, vm_id in self._substring(query):
+                    if not name.startswith(query):
+                        results.append(vm_id)
+                        if len(results) == limit:
+                            break
+        return results
+
+    def __len__(self) -> int:
+        return len(self._names)
@@ -0,0 +1,98 @@
+"""
+Benchmark: planes compilados del Director vs cadena de setters
+
+Mide el throughput de los endpoints /api/vm/build/* con el cliente de pruebas
+de Flask, alternando VMBuildingService con y sin planes compilados. Ambos
+servicios se crean como en api/main.py (registrando en el inventario del
+servidor, con sus listeners); tras cada pasada se retiran las VMs creadas
+para que el inventario tenga el mismo tamaño en todas.
+
+Se hacen varias rondas alternando qué modo va primero y se informa la
+mediana de cada modo.
+
+Uso:
+    python benchmarks/build_plans.py [--requests 2000] [--rounds 5]
+"""
+import argparse
+import io
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import api.main as api_main
+from application.factory import VMBuildingService
+
+ENDPOINTS = ['standard', 'memory-optimized', 'disk-optimized']
+PROVIDERS = ['aws', 'azure', 'google', 'onpremise']
+
+
+def run(client, requests_per_endpoint: int) -> float:
+    """Ejecuta las peticiones y retorna peticiones por segundo"""
+    total = 0
+    start = time.perf_counter()
+    for endpoint in ENDPOINTS:
+        for i in range(requests_per_endpoint):
+            provider = PROVIDERS[i % len(PROVIDERS)]
+            response = client.post(f'/api/vm/build/{endpoint}', json={
+                'provider': provider,
+                'name': f'bench-{i}',
+                'location': 'region-1',
+                'size': 'medium'
+            })
+            assert response.status_code == 200, response.data
+            total += 1
+    return total / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000,
+                        help='Peticiones por endpoint y modo')
+    parser.add_argument('--rounds', type=int, default=5,
+                        help='Rondas (cada una mide ambos modos, en orden alterno)')
+    args = parser.parse_args()
+
+    # Los logs INFO se formatean igual que en el servidor, pero a un buffer en memoria
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.StreamHandler(io.StringIO()))
+    root.setLevel(logging.INFO)
+
+    client = api_main.app.test_client()
+    inventory = api_main.vm_inventory
+    modes = [(label, VMBuildingService(use_compiled_plans=compiled, inventory=inventory))
+             for label, compiled in (('cadena de setters', False), ('planes compilados', True))]
+    existing = {vm.vmId for vm in inventory.find()}
+
+    def measure(service, requests_per_endpoint: int) -> float:
+        api_main.building_service = service
+        try:
+            return run(client, requests_per_endpoint)
+        finally:
+            for vm in inventory.find():
+                if vm.vmId not in existing:
+                    inventory.remove(vm.vmId)
+
+    for _, service in modes:
+        measure(service, 50)  # calentamiento de ambos modos antes de medir
+
+    results = {label: [] for label, _ in modes}
+    for round_number in range(args.rounds):
+        ordered = modes if round_number % 2 == 0 else modes[::-1]
+        for label, service in ordered:
+            results[label].append(measure(service, args.requests))
+
+    baseline = statistics.median(results['cadena de setters'])
+    for label, samples in results.items():
+        rps = statistics.median(samples)
+        print(f"{label:20s} {rps:10.1f} req/s  ({rps / baseline:.2f}x)  "
+              f"[{min(samples):.1f} - {max(samples):.1f}]")
+
+
+if __name__ == '__main__':
+    main()
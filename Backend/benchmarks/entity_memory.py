@@ -0,0 +1,93 @@
+"""
+Benchmark: memoria por VM de las entidades vs sus variantes compactas
+
+Construye N VMs (con red y disco) como dataclasses normales, variantes con
+__slots__ y variantes frozen, mide la memoria asignada con tracemalloc y la
+extrapola a un millón de VMs.
+
+Uso:
+    python benchmarks/entity_memory.py [--count 100000]
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from domain.compact import to_compact
+from domain.entities import MachineVirtual, Network, StorageDisk, VMStatus
+
+REGIONS = ['us-east-1', 'us-west-2', 'eu-west-1', 'sa-east-1']
+
+
+def make_vm(i: int) -> MachineVirtual:
+    """VM equivalente a la de AWSVMBuilder (cadenas construidas por VM, como en los builders)"""
+    region = REGIONS[i % len(REGIONS)]
+    return MachineVirtual(
+        vmId=f"aws-{uuid.uuid4()}",
+        name=f"vm-{i}",
+        status=VMStatus.RUNNING,
+        createdAt=datetime.now(),
+        provider=''.join(['a', 'w', 's']),
+        vcpus=2,
+        memoryGB=4,
+        network=Network(
+            networkId=f"vpc-{uuid.uuid4().hex[:8]}",
+            name=f"aws-net-{region}",
+            cidr_block='.'.join(['10', '0', '0', '0/16']),
+            provider=''.join(['a', 'w', 's']),
+            region=f"{region}",
+            firewallRules=['HTTP', 'HTTPS'],
+            publicIP=True
+        ),
+        disks=[StorageDisk(
+            diskId=f"vol-{uuid.uuid4().hex[:12]}",
+            name=f"aws-disk-{'gp2'}",
+            size_gb=50,
+            disk_type=''.join(['g', 'p', '2']),
+            provider=''.join(['a', 'w', 's']),
+            region=f"{region}"
+        )],
+        memoryOptimization=False,
+        diskOptimization=False,
+        instance_type=''.join(['t3', '.medium'])
+    )
+
+
+def measure(count: int, convert) -> float:
+    """Bytes por VM retenidos tras construir `count` VMs"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    inventory = [convert(make_vm(i)) for i in range(count)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del inventory
+    return (after - before) / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    variants = [
+        ('dataclass', lambda vm: vm),
+        ('__slots__', lambda vm: to_compact(vm)),
+        ('__slots__ frozen', lambda vm: to_compact(vm, frozen=True))
+    ]
+    baseline = None
+    for label, convert in variants:
+        per_vm = measure(args.count, convert)
+        baseline = baseline or per_vm
+        print(f"{label:18s} {per_vm:8.0f} B/VM  {per_vm * 1_000_000 / 2**20:8.0f} MiB/millón  "
+              f"({per_vm / baseline:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: agregación de capacidad con objetos vs flota columnar
+
+Suma vCPUs y memoria por proveedor y filtra VMs en ejecución de un proveedor
+sobre N VMs, recorriendo objetos MachineVirtual y usando Fleet.
+
+Uso:
+    python benchmarks/fleet_aggregation.py [--count 200000]
+"""
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from domain.entities import MachineVirtual, StorageDisk, VMStatus
+from domain.fleet import Fleet, numpy
+
+PROVIDERS = ['aws', 'azure', 'google', 'on-premise']
+STATUSES = [VMStatus.RUNNING, VMStatus.RUNNING, VMStatus.STOPPED, VMStatus.ERROR]
+
+
+def make_vms(count: int):
+    now = datetime.now()
+    for i in range(count):
+        provider = PROVIDERS[i % len(PROVIDERS)]
+        yield MachineVirtual(
+            vmId=f"vm-{i}", name=f"vm-{i}", status=STATUSES[i % len(STATUSES)],
+            createdAt=now, provider=provider, vcpus=2 + i % 8, memoryGB=4 + i % 32,
+            disks=[StorageDisk(f"d-{i}", "disk", 50, "ssd", provider, "region-1")]
+        )
+
+
+def timed(label: str, func, repeat: int = 5) -> float:
+    best = min(_once(func) for _ in range(repeat))
+    print(f"  {label:38s} {best * 1000:9.2f} ms")
+    return best
+
+
+def _once(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def objects_sum_by_provider(vms):
+    totals = defaultdict(lambda: [0, 0])
+    for vm in vms:
+        totals[vm.provider][0] += vm.vcpus
+        totals[vm.provider][1] += vm.memoryGB
+    return totals
+
+
+def objects_running_aws(vms):
+    return [vm for vm in vms if vm.provider == 'aws' and vm.status == VMStatus.RUNNING]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=200000)
+    args = parser.parse_args()
+
+    vms = list(make_vms(args.count))
+    fleet = Fleet(vms)
+    print(f"{args.count} VMs (numpy {'disponible' if numpy is not None else 'no instalado'})")
+
+    print("Suma de vCPUs y memoria por proveedor:")
+    base = timed("objetos", lambda: objects_sum_by_provider(vms))
+    columnar = timed("Fleet.sum_by", lambda: (fleet.sum_by('vcpus', 'provider'),
+                                              fleet.sum_by('memoryGB', 'provider')))
+    print(f"  speedup: {base / columnar:.1f}x")
+
+    print("Filtro provider='aws' AND status=RUNNING:")
+    base = timed("objetos", lambda: objects_running_aws(vms))
+    columnar = timed("Fleet.where", lambda: fleet.where(provider='aws', status=VMStatus.RUNNING))
+    print(f"  speedup: {base / columnar:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping, Tuple
+import threading
 from domain.entities import MachineVirtual, Network, StorageDisk, VMInstanceType
+from domain.tracing import traced
 
 
 class VMBuilder(ABC):
@@ -8,12 +12,25 @@ class VMBuilder(ABC):
     Builder abstracto para construcción de VMs
     Permite construcción paso a paso con validación de región
     """
+
+    # Claves de configuración con IDs generados por los setters; se excluyen de
+    # las plantillas compiladas para que build() genere IDs nuevos en cada VM
+    _generated_keys: Tuple[str, ...] = ()
+
     def __init__(self):
         self._vm: Optional[MachineVirtual] = None
         self._network: Optional[Network] = None
         self._disk: Optional[StorageDisk] = None
         self._config: Dict[str, Any] = {}
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Los setters y build() de cada builder concreto se trazan como spans
+        # (p.ej. AWSVMBuilder.set_storage)
+        for attr, value in list(vars(cls).items()):
+            if callable(value) and (attr.startswith('set_') or attr == 'build'):
+                setattr(cls, attr, traced()(value))
+
     @abstractmethod
     def reset(self) -> 'VMBuilder':
         """Reinicia el builder"""
@@ -83,6 +100,67 @@ class VMBuilder(ABC):
     def get_config(self) -> Dict[str, Any]:
         return self._config.copy()
 
+    @traced()
+    def set_name(self, name: str) -> 'VMBuilder':
+        """Configura solo el nombre de la VM"""
+        self._config['name'] = name
+        return self
+
+    @traced()
+    def load_config(self, config: Mapping[str, Any]) -> 'VMBuilder':
+        """
+        Carga una configuración completa sin recorrer los setters
+        (usado por las plantillas compiladas de VMBuildPlan)
+        """
+        self._config = {key: list(value) if isinstance(value, tuple) else value
+                        for key, value in config.items()}
+        return self
+
+
+@dataclass(frozen=True)
+class VMBuildPlan:
+    """
+    Plantilla compilada de un preset del Director para un builder concreto.
+    La configuración se resuelve una sola vez; cada build solo completa
+    nombre, ubicación e IDs nuevos.
+    """
+    builder_class: type
+    preset: str
+    size: str
+    config: Mapping[str, Any]
+
+    @classmethod
+    def from_builder(cls, builder: VMBuilder, preset: str, size: str) -> 'VMBuildPlan':
+        config = builder.get_config()
+        for key in builder._generated_keys + ('name',):
+            config.pop(key, None)
+        # Congelar listas para que ninguna VM comparta estado mutable con la plantilla
+        frozen = {key: tuple(value) if isinstance(value, list) else value
+                  for key, value in config.items()}
+        return cls(type(builder), preset, size, MappingProxyType(frozen))
+
+
+class VMBuildPlanCache:
+    """Caché de planes compilados por (builder, preset, tamaño)"""
+
+    def __init__(self):
+        self._plans: Dict[Tuple[type, str, str], VMBuildPlan] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compile(self, director: 'VMDirector', preset: str, size: str) -> VMBuildPlan:
+        key = (type(director.builder), preset, size)
+        plan = self._plans.get(key)
+        if plan is None:
+            with self._lock:
+                plan = self._plans.get(key)
+                if plan is None:
+                    plan = director.compile_plan(preset, size)
+                    self._plans[key] = plan
+        return plan
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
 
 class VMDirector:
     """
@@ -90,15 +168,59 @@ class VMDirector:
     1. Standard VM
     2. VM Optimizada en Memoria
     3. VM Optimizada en Disco
+
+    Con plan_cache, los presets se compilan una vez por (builder, preset, tamaño)
+    en un VMBuildPlan y cada construcción solo completa nombre, ubicación e IDs.
     """
+
+    # Nombre y ubicación provisionales usados al compilar un plan
+    _PLAN_NAME = '__plan__'
+    _PLAN_LOCATION = '__plan__'
     
-    def __init__(self, builder: VMBuilder):
+    def __init__(self, builder: VMBuilder, plan_cache: Optional[VMBuildPlanCache] = None):
         self._builder = builder
+        self._plan_cache = plan_cache
+        self._presets = {
+            'standard': self._configure_standard_vm,
+            'memory-optimized': self._configure_memory_optimized_vm,
+            'disk-optimized': self._configure_disk_optimized_vm
+        }
+
+    @property
+    def builder(self) -> VMBuilder:
+        return self._builder
 
     def change_builder(self, builder: VMBuilder) -> None:
         """Cambia el builder para usar otro proveedor"""
         self._builder = builder
 
+    # ===== Planes compilados =====
+    def compile_plan(self, preset: str, size: str = "medium") -> VMBuildPlan:
+        """
+        Ejecuta una vez la cadena de setters del preset y congela la configuración resultante
+        """
+        configure = self._presets.get(preset)
+        if configure is None:
+            raise ValueError(f"Preset '{preset}' no soportado")
+        configure(self._PLAN_NAME, self._PLAN_LOCATION, size)
+        return VMBuildPlan.from_builder(self._builder, preset, size)
+
+    def build_from_plan(self, plan: VMBuildPlan, name: str, location: str) -> MachineVirtual:
+        """Construye una VM a partir de un plan compilado"""
+        if not isinstance(self._builder, plan.builder_class):
+            raise ValueError(f"El plan fue compilado para {plan.builder_class.__name__}")
+        return (self._builder
+                .load_config(plan.config)
+                .set_name(name)
+                .set_location(location)
+                .build())
+
+    def _build_preset(self, preset: str, name: str, location: str, size: str) -> MachineVirtual:
+        if self._plan_cache is not None:
+            plan = self._plan_cache.get_or_compile(self, preset, size)
+            return self.build_from_plan(plan, name, location)
+        return self._presets[preset](name, location, size).build()
+
     # ===== 1. STANDARD VM (según PDF) =====
     def build_standard_vm(self, name: str, location: str, size: str = "medium") -> MachineVirtual:
         """
@@ -115,6 +237,10 @@ class VMDirector:
             location: Región/ubicación
             size: Tamaño ('small', 'medium', 'large')
         """
+        return self._build_preset('standard', name, location, size)
+
+    def _configure_standard_vm(self, name: str, location: str, size: str) -> VMBuilder:
+        """Cadena de setters de la Standard VM (sin construir)"""
         return (self._builder
                 .reset()
                 .set_basic_config(name, "standard")
@@ -124,8 +250,7 @@ class VMDirector:
                 .set_advanced_options({
                     "memoryOptimization": False,
                     "diskOptimization": False
-                })
-                .build())
+                }))
 
     # ===== 2. VM OPTIMIZADA EN MEMORIA (según PDF) =====
     def build_memory_optimized_vm(self, name: str, location: str, size: str = "medium") -> MachineVirtual:
@@ -143,6 +268,10 @@ class VMDirector:
             location: Región/ubicación
             size: Tamaño ('small', 'medium', 'large')
         """
+        return self._build_preset('memory-optimized', name, location, size)
+
+    def _configure_memory_optimized_vm(self, name: str, location: str, size: str) -> VMBuilder:
+        """Cadena de setters de la VM optimizada en memoria (sin construir)"""
         return (self._builder
                 .reset()
                 .set_basic_config(name, "memory-optimized")
@@ -153,8 +282,7 @@ class VMDirector:
                     "memoryOptimization": True,  # ✅ Optimización de memoria activada
                     "diskOptimization": False,
                     "keyPairName": "memory-key"
-                })
-                .build())
+                }))
 
     # ===== 3. VM OPTIMIZADA EN DISCO (según PDF) =====
     def build_disk_optimized_vm(self, name: str, location: str, size: str = "medium") -> MachineVirtual:
@@ -172,6 +300,10 @@ class VMDirector:
             location: Región/ubicación
             size: Tamaño ('small', 'medium', 'large')
         """
+        return self._build_preset('disk-optimized', name, location, size)
+
+    def _configure_disk_optimized_vm(self, name: str, location: str, size: str) -> VMBuilder:
+        """Cadena de setters de la VM optimizada en disco (sin construir)"""
         return (self._builder
                 .reset()
                 .set_basic_config(name, "disk-optimized")
@@ -182,8 +314,7 @@ class VMDirector:
                     "memoryOptimization": False,
                     "diskOptimization": True,  # ✅ Optimización de disco activada
                     "keyPairName": "disk-key"
-                })
-                .build())
+                }))
 
     # ===== Métodos adicionales (compatibilidad) =====
     def build_minimal_vm(self, name: str) -> MachineVirtual:
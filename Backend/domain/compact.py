@@ -0,0 +1,128 @@
+"""
+Domain Layer - Representaciones compactas de entidades
+Variantes con __slots__ (y opcionalmente inmutables) de Network, StorageDisk y
+MachineVirtual para inventarios grandes en memoria.
+
+- Sin __dict__ por instancia: los atributos viven en slots
+- Cadenas repetidas (proveedor, región, tipos, etiquetas) se internan con sys.intern
+- Las variantes frozen guardan listas como tuplas y las etiquetas como tupla
+  ordenada de pares (clave, valor), así que son hashables
+
+Los campos, valores por defecto y to_dict() se derivan de las entidades
+originales, por lo que ambas representaciones serializan igual.
+"""
+import sys
+from dataclasses import MISSING, field, fields, make_dataclass
+from typing import Any, Dict, Tuple, Type
+
+from domain.entities import MachineVirtual, Network, StorageDisk
+
+
+def _with_slots(cls: type) -> type:
+    """Recrea una dataclass con __slots__ (equivalente a slots=True de Python 3.10+)"""
+    cls_dict = dict(cls.__dict__)
+    field_names = tuple(f.name for f in fields(cls))
+    cls_dict['__slots__'] = field_names
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+    new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
+
+
+def _interning_post_init(names: Tuple[str, ...]):
+    def __post_init__(self):
+        for name in names:
+            value = getattr(self, name)
+            if type(value) is str:
+                object.__setattr__(self, name, sys.intern(value))
+    return __post_init__
+
+
+def _compact_variant(entity_cls: type, name: str, frozen: bool,
+                     interned: Tuple[str, ...], **methods: Any) -> type:
+    """Genera la variante compacta de una entidad a partir de sus campos"""
+    spec = []
+    for f in fields(entity_cls):
+        if f.default is not MISSING:
+            spec.append((f.name, f.type, field(default=f.default)))
+        else:
+            spec.append((f.name, f.type))
+    namespace = {
+        '__module__': __name__,
+        '__post_init__': _interning_post_init(interned),
+        'to_dict': entity_cls._serialize,
+        **methods
+    }
+    return _with_slots(make_dataclass(name, spec, namespace=namespace, frozen=frozen))
+
+
+_NETWORK_INTERNED = ('provider', 'region', 'cidr_block', 'name')
+_DISK_INTERNED = ('provider', 'region', 'disk_type', 'name')
+_VM_INTERNED = ('provider', 'instance_type', 'keyPairName')
+_VM_METHODS = {
+    'is_active': MachineVirtual.is_active,
+    'get_id': MachineVirtual.get_id,
+    'get_region': MachineVirtual.get_region
+}
+
+CompactNetwork = _compact_variant(Network, 'CompactNetwork', False, _NETWORK_INTERNED)
+CompactStorageDisk = _compact_variant(StorageDisk, 'CompactStorageDisk', False, _DISK_INTERNED)
+CompactMachineVirtual = _compact_variant(MachineVirtual, 'CompactMachineVirtual', False,
+                                         _VM_INTERNED, **_VM_METHODS)
+
+FrozenNetwork = _compact_variant(Network, 'FrozenNetwork', True, _NETWORK_INTERNED)
+FrozenStorageDisk = _compact_variant(StorageDisk, 'FrozenStorageDisk', True, _DISK_INTERNED)
+FrozenMachineVirtual = _compact_variant(MachineVirtual, 'FrozenMachineVirtual', True,
+                                        _VM_INTERNED, **_VM_METHODS)
+
+_VARIANTS: Dict[bool, Tuple[Type, Type, Type]] = {
+    False: (CompactNetwork, CompactStorageDisk, CompactMachineVirtual),
+    True: (FrozenNetwork, FrozenStorageDisk, FrozenMachineVirtual)
+}
+
+
+def _labels(labels: Dict[str, str], frozen: bool):
+    """Etiquetas con claves y valores internados (tupla ordenada de pares si es frozen)"""
+    pairs = [(sys.intern(key), sys.intern(value)) for key, value in labels.items()]
+    return tuple(sorted(pairs)) if frozen else dict(pairs)
+
+
+def _values(entity: Any, frozen: bool) -> Dict[str, Any]:
+    values = {f.name: getattr(entity, f.name) for f in fields(entity)}
+    if values.get('labels'):
+        values['labels'] = _labels(values['labels'], frozen)
+    if frozen:
+        values = {key: tuple(value) if isinstance(value, list) else value
+                  for key, value in values.items()}
+    return values
+
+
+def to_compact(vm: MachineVirtual, frozen: bool = False):
+    """Convierte una MachineVirtual (con su red y discos) a la variante compacta"""
+    network_cls, disk_cls, vm_cls = _VARIANTS[frozen]
+    values = _values(vm, frozen)
+    if vm.network is not None:
+        values['network'] = network_cls(**_values(vm.network, frozen))
+    if vm.disks is not None:
+        disks = [disk_cls(**_values(disk, frozen)) for disk in vm.disks]
+        values['disks'] = tuple(disks) if frozen else disks
+    return vm_cls(**values)
+
+
+def from_compact(compact: Any) -> MachineVirtual:
+    """Reconstruye la entidad MachineVirtual original a partir de una variante compacta"""
+    def thaw(entity: Any) -> Dict[str, Any]:
+        return {f.name: list(getattr(entity, f.name)) if isinstance(getattr(entity, f.name), tuple)
+                else getattr(entity, f.name) for f in fields(entity)}
+
+    values = thaw(compact)
+    if compact.labels:
+        values['labels'] = dict(compact.labels)
+    if compact.network is not None:
+        values['network'] = Network(**thaw(compact.network))
+    if compact.disks is not None:
+        values['disks'] = [StorageDisk(**thaw(disk)) for disk in compact.disks]
+    return MachineVirtual(**values)
@@ -1,7 +1,9 @@
+from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict, Any, List
+from itertools import count
+from typing import Optional, Dict, Any, List, Hashable
 
 
 class VMStatus(Enum):
@@ -10,10 +12,55 @@ class VMStatus(Enum):
     RUNNING = "running"
     ERROR = "error"
     STOPPED = "stopped"
+    TERMINATED = "terminated"
+
+
+# Sellos globales: cada modificación de una entidad recibe uno distinto
+_stamps = count(1)
+
+
+class CachedSerialization(ABC):
+    """
+    Memoriza el resultado de to_dict() hasta que cambia algún campo
+
+    Cualquier asignación a un campo público renueva el sello de la entidad y
+    descarta la forma serializada; las entidades compuestas incluyen los sellos
+    de sus hijos en la clave de caché. Las mutaciones en sitio de listas de
+    valores (p. ej. firewallRules.append) no se detectan: usar invalidate().
+
+    to_dict() retorna una copia superficial de la forma memorizada: agregar o
+    reemplazar claves no afecta a la caché, pero los valores anidados (red,
+    discos, etiquetas) se comparten y no deben modificarse en sitio.
+    """
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name[0] != '_':
+            self.__dict__['_stamp'] = next(_stamps)
+
+    def invalidate(self) -> None:
+        """Fuerza a regenerar la forma serializada en el próximo to_dict()"""
+        self.__dict__['_stamp'] = next(_stamps)
+
+    def _cache_key(self) -> Hashable:
+        return self.__dict__.get('_stamp')
+
+    @abstractmethod
+    def _serialize(self) -> Dict[str, Any]:
+        """Forma serializada de la entidad (se memoriza en to_dict())"""
+
+    def to_dict(self) -> Dict[str, Any]:
+        key = self._cache_key()
+        cached = self.__dict__.get('_dict_cache')
+        if cached is not None and cached[0] == key:
+            return dict(cached[1])
+        data = self._serialize()
+        self.__dict__['_dict_cache'] = (key, data)
+        return dict(data)
 
 
 @dataclass
-class Network:
+class Network(CachedSerialization):
     """
     Network con parámetros del PDF (Página 2):
     - region (obligatorio)
@@ -28,7 +75,20 @@ class Network:
     firewallRules: Optional[List[str]] = None  # OPCIONAL según PDF
     publicIP: Optional[bool] = None  # OPCIONAL según PDF
 
-    def to_dict(self) -> Dict[str, Any]:
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Network':
+        """Reconstruye la red a partir de to_dict()"""
+        return cls(
+            networkId=data["networkId"],
+            name=data["name"],
+            cidr_block=data["cidr_block"],
+            provider=data["provider"],
+            region=data["region"],
+            firewallRules=data.get("firewallRules"),
+            publicIP=data.get("publicIP")
+        )
+
+    def _serialize(self) -> Dict[str, Any]:
         return {
             "networkId": self.networkId,
             "name": self.name,
@@ -41,7 +101,7 @@ class Network:
 
 
 @dataclass
-class StorageDisk:
+class StorageDisk(CachedSerialization):
     """
     Storage con parámetros del PDF (Página 2):
     - region (obligatorio)
@@ -55,7 +115,20 @@ class StorageDisk:
     region: str  # OBLIGATORIO según PDF
     iops: Optional[int] = None  # OPCIONAL según PDF
 
-    def to_dict(self) -> Dict[str, Any]:
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'StorageDisk':
+        """Reconstruye el disco a partir de to_dict()"""
+        return cls(
+            diskId=data["diskId"],
+            name=data["name"],
+            size_gb=data["size_gb"],
+            disk_type=data["disk_type"],
+            provider=data["provider"],
+            region=data["region"],
+            iops=data.get("iops")
+        )
+
+    def _serialize(self) -> Dict[str, Any]:
         return {
             "diskId": self.diskId,
             "name": self.name,
@@ -68,7 +141,7 @@ class StorageDisk:
 
 
 @dataclass
-class MachineVirtual:
+class MachineVirtual(CachedSerialization):
     """
     VirtualMachine con parámetros del PDF (Página 2):
     - provider (obligatorio)
@@ -91,6 +164,8 @@ class MachineVirtual:
     diskOptimization: Optional[bool] = None  # OPCIONAL según PDF
     keyPairName: Optional[str] = None  # OPCIONAL según PDF
     instance_type: Optional[str] = None  # Tipo de instancia (t3.medium, D2s_v3, etc.)
+    expiresAt: Optional[datetime] = None  # Fin del TTL (VMs efímeras), None si no expira
+    labels: Optional[Dict[str, str]] = None  # Etiquetas clave=valor (env, team, ...)
 
     def is_active(self) -> bool:
         return self.status == VMStatus.RUNNING
@@ -98,7 +173,51 @@ class MachineVirtual:
     def get_id(self) -> str:
         return self.vmId
 
-    def to_dict(self) -> Dict[str, Any]:
+    def get_region(self) -> Optional[str]:
+        """Región de la VM (la de su red o, si no tiene, la de su primer disco)"""
+        if self.network is not None:
+            return self.network.region
+        if self.disks:
+            return self.disks[0].region
+        return None
+
+    def attach_disk(self, disk: StorageDisk) -> None:
+        """Agrega un disco a la VM invalidando su forma serializada"""
+        self.disks = (self.disks or []) + [disk]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MachineVirtual':
+        """Reconstruye la VM (con su red y discos) a partir de to_dict()"""
+        network = data.get("network")
+        return cls(
+            vmId=data["vmId"],
+            name=data["name"],
+            status=VMStatus(data["status"]),
+            createdAt=datetime.fromisoformat(data["createdAt"]),
+            provider=data["provider"],
+            vcpus=data["vcpus"],
+            memoryGB=data["memoryGB"],
+            network=Network.from_dict(network) if network else None,
+            disks=[StorageDisk.from_dict(disk) for disk in data.get("disks") or []],
+            memoryOptimization=data.get("memoryOptimization"),
+            diskOptimization=data.get("diskOptimization"),
+            keyPairName=data.get("keyPairName"),
+            instance_type=data.get("instance_type"),
+            expiresAt=datetime.fromisoformat(data["expiresAt"]) if data.get("expiresAt") else None,
+            labels=data.get("labels") or None
+        )
+
+    def _cache_key(self) -> Hashable:
+        attrs = self.__dict__
+        network = attrs['network']
+        disks = attrs['disks']
+        return (
+            attrs.get('_stamp'),
+            network.__dict__.get('_stamp') if network is not None else None,
+            tuple([disk.__dict__.get('_stamp') for disk in disks]) if disks else ()
+        )
+
+    def _serialize(self) -> Dict[str, Any]:
         return {
             "vmId": self.vmId,
             "name": self.name,
@@ -111,6 +230,8 @@ class MachineVirtual:
             "diskOptimization": self.diskOptimization,
             "keyPairName": self.keyPairName,
             "instance_type": self.instance_type,
+            "expiresAt": self.expiresAt.isoformat() if self.expiresAt else None,
+            "labels": dict(self.labels) if self.labels else {},
             "network": self.network.to_dict() if self.network else None,
             "disks": [d.to_dict() for d in self.disks] if self.disks else []
         }
@@ -214,25 +335,60 @@ class VMInstanceType:
         "onprem-cpu3": {"vcpus": 8, "memoryGB": 8}
     }
     
+    @classmethod
+    def get_catalog(cls, provider: str) -> Optional[Dict[str, Dict[str, int]]]:
+        """
+        Obtiene el diccionario de tipos de un proveedor (acepta alias)
+        """
+        from domain.registry import provider_registry
+
+        descriptor = provider_registry.resolve(provider)
+        return descriptor.catalog if descriptor else None
+
     @classmethod
     def get_specs(cls, provider: str, instance_type: str) -> Optional[Dict[str, int]]:
         """
         Obtiene las especificaciones (vCPU, memoryGB) para un tipo de instancia
         """
-        provider_map = {
-            'aws': cls.AWS_TYPES,
-            'azure': cls.AZURE_TYPES,
-            'google': cls.GCP_TYPES,
-            'gcp': cls.GCP_TYPES,
-            'onpremise': cls.ONPREMISE_TYPES,
-            'on-premise': cls.ONPREMISE_TYPES
-        }
-        
-        types_dict = provider_map.get(provider.lower())
+        types_dict = cls.get_catalog(provider)
         if types_dict:
             return types_dict.get(instance_type)
         return None
     
+    # Familias de VM del PDF, en el orden en que aparecen en cada diccionario
+    FAMILIES = ('standard', 'memory-optimized', 'disk-optimized')
+
+    # Familia de cada tipo de instancia (explícita: no depende del orden ni del
+    # número de tipos de cada diccionario)
+    FAMILY_BY_TYPE = {
+        # AWS
+        "t3.medium": "standard", "m5.large": "standard", "m5.xlarge": "standard",
+        "r5.large": "memory-optimized", "r5.xlarge": "memory-optimized", "r5.2xlarge": "memory-optimized",
+        "c5.large": "disk-optimized", "c5.xlarge": "disk-optimized", "c5.2xlarge": "disk-optimized",
+        # Azure
+        "D2s_v3": "standard", "D4s_v3": "standard", "D8s_v3": "standard",
+        "E2s_v3": "memory-optimized", "E4s_v3": "memory-optimized", "E8s_v3": "memory-optimized",
+        "F2s_v2": "disk-optimized", "F4s_v2": "disk-optimized", "F8s_v2": "disk-optimized",
+        # Google Cloud
+        "e2-standard-2": "standard", "e2-standard-4": "standard", "e2-standard-8": "standard",
+        "n2-highmem-2": "memory-optimized", "n2-highmem-4": "memory-optimized", "n2-highmem-8": "memory-optimized",
+        "n2-highcpu-2": "disk-optimized", "n2-highcpu-4": "disk-optimized", "n2-highcpu-8": "disk-optimized",
+        # On-Premise
+        "onprem-std1": "standard", "onprem-std2": "standard", "onprem-std3": "standard",
+        "onprem-mem1": "memory-optimized", "onprem-mem2": "memory-optimized", "onprem-mem3": "memory-optimized",
+        "onprem-cpu1": "disk-optimized", "onprem-cpu2": "disk-optimized", "onprem-cpu3": "disk-optimized"
+    }
+
+    @classmethod
+    def get_family(cls, types_dict: Dict[str, Dict[str, int]], instance_type: str) -> Optional[str]:
+        """
+        Obtiene la familia (standard, memory-optimized, disk-optimized) de un tipo
+        de instancia del diccionario, o None si no es un tipo de familia conocida
+        """
+        if instance_type not in types_dict:
+            return None
+        return cls.FAMILY_BY_TYPE.get(instance_type)
+
     @classmethod
     def get_instance_by_type(cls, provider: str, vm_type: str, size: str = "medium") -> Optional[str]:
         """
@@ -241,40 +397,12 @@ class VMInstanceType:
         vm_type: 'standard', 'memory-optimized', 'disk-optimized'
         size: 'small', 'medium', 'large'
         """
-        provider = provider.lower()
         size_map = {'small': 0, 'medium': 1, 'large': 2}
         idx = size_map.get(size, 1)
         
-        if provider == 'aws':
-            if vm_type == 'standard':
-                return list(cls.AWS_TYPES.keys())[0:3][idx]
-            elif vm_type == 'memory-optimized':
-                return list(cls.AWS_TYPES.keys())[3:6][idx]
-            elif vm_type == 'disk-optimized':
-                return list(cls.AWS_TYPES.keys())[6:9][idx]
-        
-        elif provider in ['azure']:
-            if vm_type == 'standard':
-                return list(cls.AZURE_TYPES.keys())[0:3][idx]
-            elif vm_type == 'memory-optimized':
-                return list(cls.AZURE_TYPES.keys())[3:6][idx]
-            elif vm_type == 'disk-optimized':
-                return list(cls.AZURE_TYPES.keys())[6:9][idx]
-        
-        elif provider in ['google', 'gcp']:
-            if vm_type == 'standard':
-                return list(cls.GCP_TYPES.keys())[0:3][idx]
-            elif vm_type == 'memory-optimized':
-                return list(cls.GCP_TYPES.keys())[3:6][idx]
-            elif vm_type == 'disk-optimized':
-                return list(cls.GCP_TYPES.keys())[6:9][idx]
-        
-        elif provider in ['onpremise', 'on-premise']:
-            if vm_type == 'standard':
-                return list(cls.ONPREMISE_TYPES.keys())[0:3][idx]
-            elif vm_type == 'memory-optimized':
-                return list(cls.ONPREMISE_TYPES.keys())[3:6][idx]
-            elif vm_type == 'disk-optimized':
-                return list(cls.ONPREMISE_TYPES.keys())[6:9][idx]
+        types_dict = cls.get_catalog(provider)
+        if not types_dict or vm_type not in cls.FAMILIES:
+            return None
         
-        return None
\ No newline at end of file
+        start = cls.FAMILIES.index(vm_type) * 3
+        return list(types_dict.keys())[start:start + 3][idx]
@@ -0,0 +1,252 @@
+"""
+Domain Layer - Flota columnar
+Contenedor struct-of-arrays para muchas MachineVirtual orientado a analítica
+
+Los campos numéricos y categóricos se guardan en columnas tipadas (array.array):
+proveedor, estado, región y tipo de instancia como códigos enteros; vcpus,
+memoryGB, disco total, createdAt y expiresAt (epoch) como números. Las sumas y filtros
+recorren columnas contiguas en lugar de objetos, y si numpy está instalado se
+vectorizan (las columnas se exponen sin copia con numpy.frombuffer).
+
+Las entidades MachineVirtual se reconstruyen bajo demanda con get()/select().
+"""
+import math
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from domain.entities import MachineVirtual, Network, StorageDisk, VMStatus
+
+try:
+    import numpy
+except ImportError:  # numpy es opcional
+    numpy = None
+
+# Valor de la columna expiresAt para las VMs sin TTL
+_NO_EXPIRY = math.nan
+
+
+class _CodeTable:
+    """Tabla de códigos enteros para valores categóricos repetidos"""
+
+    def __init__(self, values: Iterable[Any] = ()):
+        self._values: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value: Any) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._values)
+            self._codes[value] = code
+            self._values.append(value)
+        return code
+
+    def lookup(self, value: Any) -> Optional[int]:
+        return self._codes.get(value)
+
+    def value(self, code: int) -> Any:
+        return self._values[code]
+
+    def values(self) -> List[Any]:
+        return list(self._values)
+
+
+class Fleet:
+    """
+    Flota de VMs almacenada por columnas
+
+    Columnas numéricas (array.array):
+    - provider, status, region, instance_type: códigos ('H')
+    - vcpus, memoryGB, disk_gb: enteros ('q')
+    - createdAt, expiresAt: epoch en segundos ('d'; expiresAt es NaN si no expira)
+
+    Los campos de texto únicos por VM (vmId, name), las etiquetas y los objetos
+    de red/discos se guardan en listas para poder reconstruir la entidad completa.
+    """
+
+    NUMERIC_COLUMNS = ('vcpus', 'memoryGB', 'disk_gb', 'createdAt', 'expiresAt')
+    CODED_COLUMNS = ('provider', 'status', 'region', 'instance_type')
+
+    def __init__(self, vms: Iterable[MachineVirtual] = ()):
+        self._tables = {
+            'provider': _CodeTable(),
+            'status': _CodeTable(),
+            'region': _CodeTable(),
+            'instance_type': _CodeTable()
+        }
+        self._columns: Dict[str, array] = {
+            'provider': array('H'),
+            'status': array('H'),
+            'region': array('H'),
+            'instance_type': array('H'),
+            'vcpus': array('q'),
+            'memoryGB': array('q'),
+            'disk_gb': array('q'),
+            'createdAt': array('d'),
+            'expiresAt': array('d')
+        }
+        self._vm_ids: List[str] = []
+        self._names: List[str] = []
+        self._options: List[tuple] = []
+        self._labels: List[Optional[Dict[str, str]]] = []
+        self._networks: List[Optional[Network]] = []
+        self._disks: List[Optional[List[StorageDisk]]] = []
+        self._positions: Dict[str, int] = {}
+        self.extend(vms)
+
+    # ===== Carga =====
+    def append(self, vm: MachineVirtual) -> int:
+        """Agrega una VM y retorna su posición"""
+        columns = self._columns
+        tables = self._tables
+        columns['provider'].append(tables['provider'].code(vm.provider))
+        columns['status'].append(tables['status'].code(vm.status))
+        columns['region'].append(tables['region'].code(vm.get_region()))
+        columns['instance_type'].append(tables['instance_type'].code(vm.instance_type))
+        columns['vcpus'].append(int(vm.vcpus))
+        columns['memoryGB'].append(int(vm.memoryGB))
+        columns['disk_gb'].append(sum(disk.size_gb for disk in vm.disks) if vm.disks else 0)
+        columns['createdAt'].append(vm.createdAt.timestamp())
+        columns['expiresAt'].append(vm.expiresAt.timestamp() if vm.expiresAt else _NO_EXPIRY)
+
+        position = len(self._vm_ids)
+        self._vm_ids.append(vm.vmId)
+        self._names.append(vm.name)
+        self._options.append((vm.memoryOptimization, vm.diskOptimization, vm.keyPairName))
+        self._labels.append(dict(vm.labels) if vm.labels else None)
+        self._networks.append(vm.network)
+        self._disks.append(vm.disks)
+        self._positions[vm.vmId] = position
+        return position
+
+    def extend(self, vms: Iterable[MachineVirtual]) -> None:
+        for vm in vms:
+            self.append(vm)
+
+    def __len__(self) -> int:
+        return len(self._vm_ids)
+
+    # ===== Acceso =====
+    def column(self, name: str) -> array:
+        """
+        Columna tipada (no modificar). Con numpy: numpy.frombuffer(fleet.column('vcpus'), dtype='q')
+        """
+        return self._columns[name]
+
+    def codes(self, name: str) -> List[Any]:
+        """Valores correspondientes a cada código de una columna categórica"""
+        return self._tables[name].values()
+
+    def position(self, vm_id: str) -> Optional[int]:
+        return self._positions.get(vm_id)
+
+    def set_status(self, position: int, status: VMStatus) -> None:
+        self._columns['status'][position] = self._tables['status'].code(status)
+
+    def get(self, position: int) -> MachineVirtual:
+        """Reconstruye la entidad MachineVirtual de una posición"""
+        columns = self._columns
+        tables = self._tables
+        memory_opt, disk_opt, key_pair = self._options[position]
+        expires_at = columns['expiresAt'][position]
+        labels = self._labels[position]
+        return MachineVirtual(
+            vmId=self._vm_ids[position],
+            name=self._names[position],
+            status=tables['status'].value(columns['status'][position]),
+            createdAt=datetime.fromtimestamp(columns['createdAt'][position]),
+            provider=tables['provider'].value(columns['provider'][position]),
+            vcpus=columns['vcpus'][position],
+            memoryGB=columns['memoryGB'][position],
+            network=self._networks[position],
+            disks=self._disks[position],
+            memoryOptimization=memory_opt,
+            diskOptimization=disk_opt,
+            keyPairName=key_pair,
+            instance_type=tables['instance_type'].value(columns['instance_type'][position]),
+            expiresAt=None if math.isnan(expires_at) else datetime.fromtimestamp(expires_at),
+            labels=dict(labels) if labels else None
+        )
+
+    def __getitem__(self, position: int) -> MachineVirtual:
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("Posición fuera de la flota")
+        return self.get(position)
+
+    def select(self, positions: Iterable[int]) -> Iterator[MachineVirtual]:
+        for position in positions:
+            yield self.get(position)
+
+    # ===== Filtros =====
+    def where(self, **filters: Any) -> List[int]:
+        """
+        Posiciones que cumplen todos los filtros de igualdad sobre columnas categóricas
+        Ejemplo: fleet.where(provider='aws', status=VMStatus.RUNNING)
+        """
+        wanted = {}
+        for name, value in filters.items():
+            if name not in self.CODED_COLUMNS:
+                raise ValueError(f"Columna no filtrable: {name}")
+            code = self._tables[name].lookup(value)
+            if code is None:
+                return []
+            wanted[name] = code
+
+        if not wanted:
+            return list(range(len(self)))
+
+        if numpy is not None:
+            mask = numpy.ones(len(self), dtype=bool)
+            for name, code in wanted.items():
+                mask &= numpy.frombuffer(self._columns[name], dtype=numpy.uint16) == code
+            return numpy.flatnonzero(mask).tolist()
+
+        items = list(wanted.items())
+        name, code = items[0]
+        positions = [i for i, value in enumerate(self._columns[name]) if value == code]
+        for name, code in items[1:]:
+            column = self._columns[name]
+            positions = [i for i in positions if column[i] == code]
+        return positions
+
+    # ===== Agregados =====
+    def total(self, column: str, positions: Optional[Sequence[int]] = None) -> float:
+        """Suma de una columna numérica, opcionalmente solo en las posiciones dadas"""
+        values = self._columns[column]
+        if positions is None:
+            return sum(values)
+        return sum(values[i] for i in positions)
+
+    def sum_by(self, column: str, by: str) -> Dict[Any, float]:
+        """
+        Suma de una columna numérica agrupada por una columna categórica
+        Ejemplo: fleet.sum_by('vcpus', 'provider') -> {'aws': 120, 'azure': 48}
+        """
+        if by not in self.CODED_COLUMNS:
+            raise ValueError(f"Columna no agrupable: {by}")
+        labels = self._tables[by].values()
+
+        if numpy is not None and len(self):
+            codes = numpy.frombuffer(self._columns[by], dtype=numpy.uint16)
+            weights = numpy.frombuffer(self._columns[column], dtype=self._columns[column].typecode)
+            totals = numpy.bincount(codes, weights=weights, minlength=len(labels)).tolist()
+            if self._columns[column].typecode != 'd':
+                totals = [int(round(value)) for value in totals]
+            return dict(zip(labels, totals))
+
+        sums = [0] * len(labels)
+        for code, value in zip(self._columns[by], self._columns[column]):
+            sums[code] += value
+        return dict(zip(labels, sums))
+
+    def count_by(self, by: str) -> Dict[Any, int]:
+        """Número de VMs por valor de una columna categórica"""
+        counts = [0] * len(self._tables[by].values())
+        for code in self._columns[by]:
+            counts[code] += 1
+        labels = self._tables[by].values()
+        return {labels[code]: count for code, count in enumerate(counts) if count}
@@ -0,0 +1,135 @@
+"""
+Domain Layer - Generador de identificadores
+IDs monotónicos y ordenables por tiempo (estilo ULID) para VMs, redes y discos
+
+Formato: <prefijo>-<ulid>, donde el ULID son 26 caracteres Crockford base32
+(minúsculas): 10 de timestamp en milisegundos + 16 de secuencia.
+
+- Ordenables: el orden lexicográfico coincide con el orden de creación, por lo
+  que los índices del inventario crecen por el final y admiten rangos por fecha
+- Monotónicos por proceso: dentro del mismo milisegundo la secuencia se
+  incrementa en lugar de volver a sortearse
+- Baratos: solo se lee os.urandom al cambiar de milisegundo (uuid4 lo hace en
+  cada llamada) y la codificación usa una tabla de 10 bits por par de caracteres
+"""
+import os
+import threading
+import time
+import weakref
+from datetime import datetime
+from typing import Dict, Optional
+
+ENCODING = '0123456789abcdefghjkmnpqrstvwxyz'
+ULID_LENGTH = 26
+
+_PAIRS = [a + b for a in ENCODING for b in ENCODING]
+_DECODE = {char: value for value, char in enumerate(ENCODING)}
+_SHIFTS = {pairs: range((pairs - 1) * 10, -1, -10) for pairs in (5, 8)}
+_SEQUENCE_BITS = 80
+# La semilla deja libre el bit alto para que la secuencia no desborde en la práctica
+_SEED_MASK = (1 << (_SEQUENCE_BITS - 1)) - 1
+
+
+def _encode_pairs(value: int, pairs: int) -> str:
+    """Codifica `value` en 2*pairs caracteres base32, 10 bits por par"""
+    return ''.join([_PAIRS[(value >> shift) & 0x3FF] for shift in _SHIFTS[pairs]])
+
+
+# Generadores vivos: un proceso hijo no debe continuar la secuencia del padre.
+# Un único hook de fork los reinicia todos (os.register_at_fork no permite
+# retirar hooks, así que registrar uno por instancia las mantendría vivas)
+_generators: 'weakref.WeakSet[IdGenerator]' = weakref.WeakSet()
+
+
+def _reset_generators_after_fork() -> None:
+    for generator in list(_generators):
+        generator._reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_generators_after_fork)
+
+
+class IdGenerator:
+    """
+    Generador de IDs thread-safe
+
+    Los prefijos se configuran por proveedor (clave canónica) y tipo de recurso
+    ('vm', 'network', 'disk'); los valores por defecto conservan los prefijos
+    históricos de cada proveedor (aws-, vpc-, vol-, azure-, gcp-, onprem-, ...).
+    """
+
+    DEFAULT_PREFIXES: Dict[str, Dict[str, str]] = {
+        'aws': {'vm': 'aws', 'network': 'vpc', 'disk': 'vol'},
+        'azure': {'vm': 'azure', 'network': 'vnet', 'disk': 'disk'},
+        'google': {'vm': 'gcp', 'network': 'net', 'disk': 'disk'},
+        'onpremise': {'vm': 'onprem', 'network': 'vlan', 'disk': 'disk'}
+    }
+
+    def __init__(self, prefixes: Optional[Dict[str, Dict[str, str]]] = None):
+        source = self.DEFAULT_PREFIXES if prefixes is None else prefixes
+        self._prefixes = {provider: dict(kinds) for provider, kinds in source.items()}
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._time_part = ''
+        self._sequence = 0
+        _generators.add(self)
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._last_ms = -1
+
+    def set_prefix(self, provider: str, kind: str, prefix: str) -> None:
+        """Configura el prefijo de un tipo de recurso para un proveedor"""
+        with self._lock:
+            self._prefixes.setdefault(provider, {})[kind] = prefix
+
+    def prefix(self, provider: str, kind: str = 'vm') -> str:
+        kinds = self._prefixes.get(provider, {})
+        return kinds.get(kind) or kind
+
+    def generate(self) -> str:
+        """Genera un ULID (26 caracteres) monotónico en este proceso"""
+        now_ms = time.time_ns() // 1_000_000
+        with self._lock:
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._time_part = _encode_pairs(now_ms, 5)
+                self._sequence = int.from_bytes(os.urandom(10), 'big') & _SEED_MASK
+            else:
+                # Mismo milisegundo (o reloj que retrocede): se incrementa la secuencia
+                self._sequence += 1
+                if self._sequence >> _SEQUENCE_BITS:
+                    self._last_ms += 1
+                    self._time_part = _encode_pairs(self._last_ms, 5)
+                    self._sequence = 0
+            return self._time_part + _encode_pairs(self._sequence, 8)
+
+    def new_id(self, provider: str, kind: str = 'vm', *parts: str) -> str:
+        """
+        Genera un ID con prefijo: new_id('aws') -> 'aws-01j...'
+
+        Args:
+            provider: Clave canónica del proveedor
+            kind: Tipo de recurso ('vm', 'network', 'disk')
+            parts: Segmentos intermedios opcionales (p. ej. el pool de almacenamiento)
+        """
+        segments = [self.prefix(provider, kind)]
+        segments.extend(str(part) for part in parts)
+        segments.append(self.generate())
+        return '-'.join(segments)
+
+    @staticmethod
+    def timestamp_of(identifier: str) -> datetime:
+        """Fecha de creación codificada en un ID generado por esta clase"""
+        ulid = identifier[-ULID_LENGTH:].lower()
+        if len(ulid) != ULID_LENGTH or any(char not in _DECODE for char in ulid):
+            raise ValueError(f"ID no ordenable por tiempo: {identifier}")
+        millis = 0
+        for char in ulid[:10]:
+            millis = (millis << 5) | _DECODE[char]
+        return datetime.fromtimestamp(millis / 1000)
+
+
+# Generador compartido del proceso
+id_generator = IdGenerator()
@@ -2,9 +2,13 @@
 Domain Layer - Interfaces
 Abstracciones que definen contratos (DIP - Dependency Inversion Principle)
 """
+import logging
 from abc import ABC, abstractmethod
 from typing import Dict, Any
 from domain.entities import MachineVirtual, Network, StorageDisk
+from domain.tracing import span
+
+logger = logging.getLogger(__name__)
 
 
 class ProveedorAbstracto(ABC):
@@ -52,13 +56,33 @@ class ProveedorAbstracto(ABC):
         if not self._estado:
             raise Exception("Proveedor no disponible")
         
-        # 1. Crear recursos dependientes (Red y Disco)
-        network = self.crear_network()
-        disk = self.crear_disk()
-        
-        # 2. Crear el recurso principal (VM) y asociar los otros
-        vm = self.crear_vm()
-        vm.network = network
-        vm.disks = [disk]
+        with span('provisionar', provider=type(self).__name__):
+            # 1. Crear recursos dependientes (Red y Disco)
+            with span('provisionar.network'):
+                network = self.crear_network()
+            with span('provisionar.disk'):
+                disk = self.crear_disk()
+
+            # 2. Crear el recurso principal (VM) y asociar los otros
+            with span('provisionar.vm'):
+                vm = self.crear_vm()
+            vm.network = network
+            vm.disks = [disk]
         
-        return vm
\ No newline at end of file
+        return vm
+
+    # ===== Ciclo de vida =====
+    # Los proveedores son simulados: por defecto la operación solo se registra.
+    # Un proveedor real sobrescribe estos métodos con la llamada a su API y
+    # lanza una excepción si la operación falla.
+    def detener_vm(self, vm: MachineVirtual) -> None:
+        """Detiene una VM en ejecución"""
+        logger.debug("Deteniendo VM %s en %s", vm.vmId, vm.provider)
+
+    def iniciar_vm(self, vm: MachineVirtual) -> None:
+        """Arranca una VM detenida"""
+        logger.debug("Iniciando VM %s en %s", vm.vmId, vm.provider)
+
+    def terminar_vm(self, vm: MachineVirtual) -> None:
+        """Elimina la VM y sus recursos en el proveedor"""
+        logger.debug("Terminando VM %s en %s", vm.vmId, vm.provider)
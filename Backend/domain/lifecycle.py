@@ -0,0 +1,71 @@
+"""
+Domain Layer - Ciclo de vida de las VMs
+Máquina de estados de VMStatus para las operaciones stop / start / terminate
+
+    PENDING ──► CREATING ──► RUNNING ◄──start── STOPPED
+                                │ ──stop──────────►│
+                                ▼                  ▼
+                            TERMINATED ◄──────terminate (también desde ERROR)
+
+TERMINATED es final: una VM terminada no admite más acciones.
+"""
+from enum import Enum
+from typing import Dict, FrozenSet, List, Tuple
+
+from domain.entities import VMStatus
+
+
+class VMAction(Enum):
+    STOP = "stop"
+    START = "start"
+    TERMINATE = "terminate"
+
+
+class InvalidTransitionError(ValueError):
+    """La acción no está permitida desde el estado actual de la VM"""
+
+    def __init__(self, action: VMAction, status: VMStatus):
+        self.action = action
+        self.status = status
+        super().__init__(f"No se puede aplicar '{action.value}' a una VM en estado '{status.value}'")
+
+
+# Acción -> (estados de origen permitidos, estado destino)
+TRANSITIONS: Dict[VMAction, Tuple[FrozenSet[VMStatus], VMStatus]] = {
+    VMAction.STOP: (frozenset({VMStatus.RUNNING}), VMStatus.STOPPED),
+    VMAction.START: (frozenset({VMStatus.STOPPED}), VMStatus.RUNNING),
+    VMAction.TERMINATE: (
+        frozenset({VMStatus.RUNNING, VMStatus.STOPPED, VMStatus.ERROR}),
+        VMStatus.TERMINATED
+    )
+}
+
+
+def parse_action(name: str) -> VMAction:
+    """
+    Raises:
+        ValueError: Si la acción no existe
+    """
+    try:
+        return VMAction(name.lower().strip())
+    except (ValueError, AttributeError):
+        valid = ', '.join(action.value for action in VMAction)
+        raise ValueError(f"Acción '{name}' no válida. Acciones: {valid}")
+
+
+def next_status(status: VMStatus, action: VMAction) -> VMStatus:
+    """
+    Estado resultante de aplicar una acción
+
+    Raises:
+        InvalidTransitionError: Si la transición no está permitida
+    """
+    sources, target = TRANSITIONS[action]
+    if status not in sources:
+        raise InvalidTransitionError(action, status)
+    return target
+
+
+def allowed_actions(status: VMStatus) -> List[VMAction]:
+    """Acciones aplicables a una VM en el estado dado"""
+    return [action for action, (sources, _) in TRANSITIONS.items() if status in sources]
@@ -0,0 +1,174 @@
+"""
+Domain Layer - Registro unificado de proveedores
+Fuente única de claves canónicas, alias y componentes de cada proveedor
+
+Cada proveedor se describe con un ProviderDescriptor (clase del proveedor,
+builder, validador y catálogo de tipos). Las clases se referencian por ruta
+de importación y se cargan de forma perezosa en el primer uso. El dominio no
+conoce esas rutas: las registran las capas que definen o usan los componentes.
+
+Las lecturas no toman ningún lock: el estado es una instantánea inmutable que
+las escrituras (register/unregister) reemplazan por completo (copy-on-write).
+"""
+import importlib
+import threading
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from domain.entities import VMInstanceType
+
+
+ClassRef = Union[str, type, None]
+
+# Caché de rutas de importación ya resueltas
+_import_cache: Dict[str, type] = {}
+
+
+def import_string(path: str) -> type:
+    """
+    Importa un objeto a partir de su ruta ('paquete.modulo.Clase').
+
+    Raises:
+        ImportError / AttributeError: Si el módulo o el atributo no existen
+    """
+    cached = _import_cache.get(path)
+    if cached is not None:
+        return cached
+    module_path, _, attr = path.rpartition('.')
+    value = getattr(importlib.import_module(module_path), attr)
+    _import_cache[path] = value
+    return value
+
+
+def _resolve(ref: ClassRef) -> Optional[type]:
+    if isinstance(ref, str):
+        return import_string(ref)
+    return ref
+
+
+def normalize_provider_name(name: str) -> str:
+    """Normaliza el nombre recibido en la petición (minúsculas, sin espacios)"""
+    return name.lower().strip()
+
+
+@dataclass(frozen=True)
+class ProviderDescriptor:
+    """
+    Descriptor canónico de un proveedor
+
+    - key: clave canónica (aws, azure, google, onpremise)
+    - aliases: nombres alternativos (gcp, on-premise)
+    - provider / builder / validator: clase o ruta de importación
+    - catalog: tipos de instancia del proveedor (VMInstanceType)
+    """
+    key: str
+    aliases: Tuple[str, ...] = ()
+    provider: ClassRef = None
+    builder: ClassRef = None
+    validator: ClassRef = None
+    catalog: Mapping[str, Dict[str, int]] = field(default_factory=dict, compare=False, hash=False)
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return (self.key,) + self.aliases
+
+    def provider_class(self) -> Optional[type]:
+        return _resolve(self.provider)
+
+    def builder_class(self) -> Optional[type]:
+        return _resolve(self.builder)
+
+    def validator_class(self) -> Optional[type]:
+        return _resolve(self.validator)
+
+
+class ProviderRegistry:
+    """
+    Registro de proveedores con resolución de alias en una sola búsqueda.
+
+    El estado es la tupla (descriptores por clave, índice nombre -> descriptor).
+    resolve() lee la referencia actual sin bloquear; las escrituras construyen
+    una tupla nueva bajo un lock y la publican con una única asignación.
+    """
+
+    def __init__(self, descriptors: Iterable[ProviderDescriptor] = ()):
+        self._write_lock = threading.Lock()
+        self._state: Tuple[Dict[str, ProviderDescriptor], Dict[str, ProviderDescriptor]] = ({}, {})
+        for descriptor in descriptors:
+            self.register(descriptor)
+
+    @staticmethod
+    def _build_index(descriptors: Dict[str, ProviderDescriptor]) -> Dict[str, ProviderDescriptor]:
+        index: Dict[str, ProviderDescriptor] = {}
+        for descriptor in descriptors.values():
+            for name in descriptor.names:
+                index[name] = descriptor
+        return index
+
+    def resolve(self, name: Optional[str]) -> Optional[ProviderDescriptor]:
+        """Normaliza el nombre y retorna su descriptor canónico (o None)"""
+        if not name:
+            return None
+        return self._state[1].get(normalize_provider_name(name))
+
+    def canonical(self, name: Optional[str]) -> Optional[str]:
+        """Clave canónica de un nombre o alias"""
+        descriptor = self.resolve(name)
+        return descriptor.key if descriptor else None
+
+    def register(self, descriptor: ProviderDescriptor) -> ProviderDescriptor:
+        """Registra (o reemplaza) un descriptor completo"""
+        with self._write_lock:
+            descriptors = dict(self._state[0])
+            descriptors[descriptor.key] = descriptor
+            self._state = (descriptors, self._build_index(descriptors))
+        return descriptor
+
+    def update(self, name: str, **components) -> ProviderDescriptor:
+        """
+        Actualiza componentes (provider, builder, validator, catalog, aliases)
+        del proveedor al que resuelve `name`; si no existe, lo crea.
+        """
+        with self._write_lock:
+            key = normalize_provider_name(name)
+            current = self._state[1].get(key)
+            descriptor = replace(current, **components) if current else ProviderDescriptor(key=key, **components)
+            descriptors = dict(self._state[0])
+            descriptors[descriptor.key] = descriptor
+            self._state = (descriptors, self._build_index(descriptors))
+        return descriptor
+
+    def unregister(self, name: str) -> None:
+        """Elimina el proveedor al que resuelve `name`"""
+        with self._write_lock:
+            current = self._state[1].get(normalize_provider_name(name))
+            if current is None:
+                return
+            descriptors = dict(self._state[0])
+            descriptors.pop(current.key, None)
+            self._state = (descriptors, self._build_index(descriptors))
+
+    def descriptors(self) -> List[ProviderDescriptor]:
+        return list(self._state[0].values())
+
+    def names(self, component: Optional[str] = None) -> List[str]:
+        """
+        Nombres aceptados (claves y alias), opcionalmente solo de los
+        proveedores que tienen el componente indicado ('provider', 'builder')
+        """
+        result = []
+        for descriptor in self._state[0].values():
+            if component is None or getattr(descriptor, component) is not None:
+                result.extend(descriptor.names)
+        return result
+
+
+# Registro global con los proveedores del PDF. El dominio solo declara claves,
+# alias y catálogos; las capas externas completan los componentes (clases de
+# proveedor y builder en application.factory, validadores en application.schemas)
+provider_registry = ProviderRegistry([
+    ProviderDescriptor(key='aws', catalog=VMInstanceType.AWS_TYPES),
+    ProviderDescriptor(key='azure', catalog=VMInstanceType.AZURE_TYPES),
+    ProviderDescriptor(key='google', aliases=('gcp',), catalog=VMInstanceType.GCP_TYPES),
+    ProviderDescriptor(key='onpremise', aliases=('on-premise',), catalog=VMInstanceType.ONPREMISE_TYPES)
+])
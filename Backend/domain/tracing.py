@@ -0,0 +1,234 @@
+"""
+Domain Layer - Trazas ligeras
+Spans anidados con IDs de traza propagados por contextvars
+
+Cada petición abre un span raíz y las operaciones que ejecuta (parseo,
+validación, fábricas, provisionar, setters del builder, build, serialización)
+abren spans hijos. Al cerrarse, cada span se entrega a los exportadores
+registrados (ver infrastructure.tracing).
+
+Sin exportadores el tracer está desactivado: span() devuelve un span nulo
+compartido y no mide ni genera IDs.
+
+Los IDs siguen el formato W3C Trace Context (traza de 32 y span de 16
+caracteres hexadecimales), de modo que una cabecera `traceparent` entrante
+continúa la traza del cliente.
+"""
+import functools
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_TRACEPARENT = re.compile(r'^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+
+
+def _new_trace_id() -> str:
+    return f"{random.getrandbits(128):032x}"
+
+
+def _new_span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str]]:
+    """(trace_id, span_id padre) de una cabecera traceparent, o None si no es válida"""
+    if not header:
+        return None
+    match = _TRACEPARENT.match(header.strip().lower())
+    if match is None or match.group(1) == '0' * 32 or match.group(2) == '0' * 16:
+        return None
+    return match.group(1), match.group(2)
+
+
+class Span:
+    """Operación medida dentro de una traza"""
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'start_time', 'duration_ms',
+                 'attributes', 'status', 'error', '_start')
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_span_id()
+        self.parent_id = parent_id
+        self.start_time = time.time()
+        self.duration_ms: Optional[float] = None
+        self.attributes: Dict[str, Any] = attributes or {}
+        self.status = 'ok'
+        self.error: Optional[str] = None
+        self._start = time.perf_counter()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        if error is not None:
+            self.status = 'error'
+            self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_time': self.start_time,
+            'duration_ms': round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            'attributes': self.attributes,
+            'status': self.status,
+            'error': self.error
+        }
+
+
+class _NoopSpan:
+    """Span nulo del tracer desactivado (reutilizable y sin estado)"""
+
+    trace_id = None
+    span_id = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> '_NoopSpan':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class SpanExporter(ABC):
+    """Destino de los spans terminados; export() no debe bloquear la petición"""
+
+    @abstractmethod
+    def export(self, span: Span) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+
+class _ActiveSpan:
+    """Context manager de un span real"""
+
+    __slots__ = ('_tracer', '_span', '_token')
+
+    def __init__(self, tracer: 'Tracer', span: Span):
+        self._tracer = tracer
+        self._span = span
+        self._token: Optional[Token] = None
+
+    def __enter__(self) -> Span:
+        self._token = self._tracer._current.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self._tracer.end_span(self._span, self._token, exc)
+        return False
+
+
+class Tracer:
+    """
+    Uso:
+        tracer.add_exporter(exporter)
+        with tracer.span('provisionar', provider='aws'):
+            ...
+    """
+
+    def __init__(self):
+        self._current: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+        self._exporters: List[SpanExporter] = []
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._exporters)
+
+    @property
+    def exporters(self) -> List[SpanExporter]:
+        return list(self._exporters)
+
+    def add_exporter(self, exporter: SpanExporter) -> None:
+        with self._lock:
+            self._exporters = self._exporters + [exporter]
+
+    def remove_exporter(self, exporter: SpanExporter) -> None:
+        with self._lock:
+            self._exporters = [item for item in self._exporters if item is not exporter]
+
+    def current_span(self) -> Optional[Span]:
+        return self._current.get()
+
+    def start_span(self, name: str, remote_parent: Optional[Tuple[str, str]] = None,
+                   **attributes: Any) -> Tuple[Optional[Span], Optional[Token]]:
+        """
+        Abre un span hijo del actual (o raíz, continuando `remote_parent`
+        si se indica) y lo hace actual. Retorna (None, None) si está desactivado.
+        """
+        if not self._exporters:
+            return None, None
+        parent = self._current.get()
+        if parent is not None:
+            span = Span(name, parent.trace_id, parent.span_id, attributes)
+        elif remote_parent is not None:
+            span = Span(name, remote_parent[0], remote_parent[1], attributes)
+        else:
+            span = Span(name, _new_trace_id(), None, attributes)
+        return span, self._current.set(span)
+
+    def end_span(self, span: Optional[Span], token: Optional[Token],
+                 error: Optional[BaseException] = None) -> None:
+        """Cierra un span abierto con start_span() y lo exporta"""
+        if span is None:
+            return
+        span.finish(error)
+        if token is not None:
+            self._current.reset(token)
+        for exporter in self._exporters:
+            exporter.export(span)
+
+    def span(self, name: str, **attributes: Any):
+        """Context manager que mide un span hijo del actual"""
+        if not self._exporters:
+            return NOOP_SPAN
+        parent = self._current.get()
+        trace_id = parent.trace_id if parent is not None else _new_trace_id()
+        parent_id = parent.span_id if parent is not None else None
+        return _ActiveSpan(self, Span(name, trace_id, parent_id, attributes))
+
+
+# Tracer del proceso
+tracer = Tracer()
+
+
+def span(name: str, **attributes: Any):
+    """Abre un span en el tracer del proceso"""
+    return tracer.span(name, **attributes)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorador: ejecuta la función dentro de un span (por defecto con su __qualname__)"""
+    def decorator(function: Callable) -> Callable:
+        span_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not tracer._exporters:
+                return function(*args, **kwargs)
+            with tracer.span(span_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_trace_id() -> Optional[str]:
+    current = tracer.current_span()
+    return current.trace_id if current is not None else None
@@ -1,15 +1,30 @@
 """
 Infrastructure Layer - Builders
 Builders concretos para cada proveedor
+
+Las clases se importan de forma perezosa (PEP 562): el módulo de cada builder
+solo se carga la primera vez que se accede a su clase.
 """
-from infrastructure.builders.aws_builder import AWSVMBuilder
-from infrastructure.builders.azure_builder import AzureVMBuilder
-from infrastructure.builders.google_builder import GoogleVMBuilder
-from infrastructure.builders.onpremise_builder import OnPremiseVMBuilder
-
-__all__ = [
-    'AWSVMBuilder',
-    'AzureVMBuilder',
-    'GoogleVMBuilder',
-    'OnPremiseVMBuilder'
-]
+import importlib
+
+_exports = {
+    'AWSVMBuilder': 'infrastructure.builders.aws_builder',
+    'AzureVMBuilder': 'infrastructure.builders.azure_builder',
+    'GoogleVMBuilder': 'infrastructure.builders.google_builder',
+    'OnPremiseVMBuilder': 'infrastructure.builders.onpremise_builder'
+}
+
+__all__ = list(_exports.keys())
+
+
+def __getattr__(name):
+    module_path = _exports.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_path), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + __all__)
@@ -1,10 +1,10 @@
-import uuid
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 import logging
 
 from domain.builder import VMBuilder
 from domain.entities import MachineVirtual, VMStatus, Network, StorageDisk, VMInstanceType
+from domain.ids import id_generator
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +14,9 @@ class AWSVMBuilder(VMBuilder):
     Builder concreto para AWS con parámetros del PDF
     Implementa validación de región y tipos de instancia exactos
     """
+
+    # set_network genera el ID de la VPC; no debe reutilizarse desde una plantilla
+    _generated_keys = ('vpc_id',)
     
     def __init__(self):
         super().__init__()
@@ -68,7 +71,7 @@ class AWSVMBuilder(VMBuilder):
             self._config['vcpus'] = specs['vcpus']
             self._config['memoryGB'] = specs['memoryGB']
         
-        logger.info(f"AWS Builder: Configuración básica - Nombre: {name}, Tipo: {vm_type}, Instance: {self._config['instance_type']}")
+        logger.debug("AWS Builder: Configuración básica - Nombre: %s, Tipo: %s, Instance: %s", name, vm_type, self._config['instance_type'])
         return self
 
     def set_instance_type(self, instance_type: str) -> 'AWSVMBuilder':
@@ -83,7 +86,7 @@ class AWSVMBuilder(VMBuilder):
         if specs:
             self._config['vcpus'] = specs['vcpus']
             self._config['memoryGB'] = specs['memoryGB']
-            logger.info(f"AWS Builder: Instance Type configurado - {instance_type} ({specs['vcpus']} vCPUs, {specs['memoryGB']} GB RAM)")
+            logger.debug("AWS Builder: Instance Type configurado - %s (%s vCPUs, %s GB RAM)", instance_type, specs['vcpus'], specs['memoryGB'])
         else:
             logger.warning(f"AWS Builder: Instance Type '{instance_type}' no reconocido, usando valores por defecto")
         
@@ -96,7 +99,7 @@ class AWSVMBuilder(VMBuilder):
         if ram is not None:
             self._config['memoryGB'] = ram
         
-        logger.info(f"AWS Builder: Recursos de cómputo - CPU: {self._config['vcpus']}, RAM: {self._config['memoryGB']}GB")
+        logger.debug("AWS Builder: Recursos de cómputo - CPU: %s, RAM: %sGB", self._config['vcpus'], self._config['memoryGB'])
         return self
 
     def set_storage(self, size_gb: int, disk_type: Optional[str] = None,
@@ -119,7 +122,7 @@ class AWSVMBuilder(VMBuilder):
         if iops is not None:
             self._config['iops'] = iops
         
-        logger.info(f"AWS Builder: Almacenamiento - {size_gb}GB, Tipo: {self._config['volume_type']}, IOPS: {iops}")
+        logger.debug("AWS Builder: Almacenamiento - %sGB, Tipo: %s, IOPS: %s", size_gb, self._config['volume_type'], iops)
         return self
 
     def set_network(self, network_id: Optional[str] = None, cidr: Optional[str] = None,
@@ -129,7 +132,7 @@ class AWSVMBuilder(VMBuilder):
         firewall_rules: Reglas de seguridad (opcional)
         public_ip: IP pública asignada (opcional)
         """
-        self._config['vpc_id'] = network_id or f"vpc-{uuid.uuid4().hex[:8]}"
+        self._config['vpc_id'] = network_id or id_generator.new_id('aws', 'network')
         self._config['cidr_block'] = cidr or '10.0.0.0/16'
         
         # Parámetros opcionales del PDF
@@ -138,13 +141,13 @@ class AWSVMBuilder(VMBuilder):
         if public_ip is not None:
             self._config['publicIP'] = public_ip
         
-        logger.info(f"AWS Builder: Red - VPC: {self._config['vpc_id']}, Firewall: {firewall_rules}, Public IP: {public_ip}")
+        logger.debug("AWS Builder: Red - VPC: %s, Firewall: %s, Public IP: %s", self._config['vpc_id'], firewall_rules, public_ip)
         return self
 
     def set_location(self, location: str) -> 'AWSVMBuilder':
         """Configura la región de AWS"""
         self._config['region'] = location
-        logger.info(f"AWS Builder: Ubicación - Región: {location}")
+        logger.debug("AWS Builder: Ubicación - Región: %s", location)
         return self
 
     def set_advanced_options(self, options: Dict[str, Any]) -> 'AWSVMBuilder':
@@ -170,7 +173,7 @@ class AWSVMBuilder(VMBuilder):
             self._config['security_group'] = options['security_group']
         
         self._config.update(options)
-        logger.info("AWS Builder: Opciones avanzadas configuradas")
+        logger.debug("AWS Builder: Opciones avanzadas configuradas")
         return self
 
     def build(self) -> MachineVirtual:
@@ -182,7 +185,7 @@ class AWSVMBuilder(VMBuilder):
         
         # Crear Network con región obligatoria (PDF Página 2)
         network = Network(
-            networkId=self._config.get('vpc_id', f"vpc-{uuid.uuid4().hex[:8]}"),
+            networkId=self._config.get('vpc_id', id_generator.new_id('aws', 'network')),
             name=f"aws-net-{region}",
             cidr_block=self._config.get('cidr_block', '10.0.0.0/16'),
             provider='aws',
@@ -193,7 +196,7 @@ class AWSVMBuilder(VMBuilder):
         
         # Crear Disk con región obligatoria (PDF Página 2)
         disk = StorageDisk(
-            diskId=f"vol-{uuid.uuid4().hex[:12]}",
+            diskId=id_generator.new_id('aws', 'disk'),
             name=f"aws-disk-{self._config.get('volume_type', 'gp2')}",
             size_gb=self._config.get('size_gb', 50),
             disk_type=self._config.get('volume_type', 'gp2'),
@@ -207,7 +210,7 @@ class AWSVMBuilder(VMBuilder):
             logger.error(f"Error de coherencia: Network región={network.region}, Disk región={disk.region}")
             raise ValueError(f"Error: La región de Network y Disk deben coincidir. Network: {network.region}, Disk: {disk.region}")
         
-        vm_id = f"aws-{uuid.uuid4()}"
+        vm_id = id_generator.new_id('aws')
         
         # Crear VM con todos los parámetros obligatorios del PDF (Página 2)
         vm = MachineVirtual(
@@ -226,7 +229,7 @@ class AWSVMBuilder(VMBuilder):
             instance_type=self._config.get('instance_type')
         )
         
-        logger.info(f"AWS Builder: VM construida exitosamente - ID: {vm_id}, Instance: {vm.instance_type}, vCPUs: {vm.vcpus}, RAM: {vm.memoryGB}GB")
-        logger.info(f"AWS Builder: Validación de región exitosa - Región: {region}")
+        logger.debug("AWS Builder: VM construida exitosamente - ID: %s, Instance: %s, vCPUs: %s, RAM: %sGB", vm_id, vm.instance_type, vm.vcpus, vm.memoryGB)
+        logger.debug("AWS Builder: Validación de región exitosa - Región: %s", region)
         
         return vm
\ No newline at end of file
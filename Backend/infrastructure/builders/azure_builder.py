@@ -1,10 +1,10 @@
-import uuid
 from datetime import datetime
 from typing import Optional, Dict, Any
 import logging
 
 from domain.builder import VMBuilder
 from domain.entities import MachineVirtual, VMStatus, Network, StorageDisk, VMInstanceType
+from domain.ids import id_generator
 
 logger = logging.getLogger(__name__)
 
@@ -66,7 +66,7 @@ class AzureVMBuilder(VMBuilder):
             self._config['vcpus'] = specs['vcpus']
             self._config['memoryGB'] = specs['memoryGB']
         
-        logger.info(f"Azure Builder: Configuración básica - Nombre: {name}, Tipo: {vm_type}, Size: {self._config['size']}")
+        logger.debug("Azure Builder: Configuración básica - Nombre: %s, Tipo: %s, Size: %s", name, vm_type, self._config['size'])
         return self
 
     def set_instance_type(self, instance_type: str) -> 'AzureVMBuilder':
@@ -80,7 +80,7 @@ class AzureVMBuilder(VMBuilder):
         if specs:
             self._config['vcpus'] = specs['vcpus']
             self._config['memoryGB'] = specs['memoryGB']
-            logger.info(f"Azure Builder: Size configurado - {instance_type} ({specs['vcpus']} vCPUs, {specs['memoryGB']} GB RAM)")
+            logger.debug("Azure Builder: Size configurado - %s (%s vCPUs, %s GB RAM)", instance_type, specs['vcpus'], specs['memoryGB'])
         else:
             logger.warning(f"Azure Builder: Size '{instance_type}' no reconocido")
         
@@ -93,7 +93,7 @@ class AzureVMBuilder(VMBuilder):
         if ram is not None:
             self._config['memoryGB'] = ram
         
-        logger.info(f"Azure Builder: Recursos - CPU: {self._config['vcpus']}, RAM: {self._config['memoryGB']}GB")
+        logger.debug("Azure Builder: Recursos - CPU: %s, RAM: %sGB", self._config['vcpus'], self._config['memoryGB'])
         return self
 
     def set_storage(self, size_gb: int, disk_type: Optional[str] = None,
@@ -111,7 +111,7 @@ class AzureVMBuilder(VMBuilder):
         if iops is not None:
             self._config['iops'] = iops
         
-        logger.info(f"Azure Builder: Almacenamiento - {size_gb}GB, SKU: {self._config['disk_sku']}, IOPS: {iops}")
+        logger.debug("Azure Builder: Almacenamiento - %sGB, SKU: %s, IOPS: %s", size_gb, self._config['disk_sku'], iops)
         return self
 
     def set_network(self, network_id: Optional[str] = None, cidr: Optional[str] = None,
@@ -125,13 +125,13 @@ class AzureVMBuilder(VMBuilder):
         if public_ip is not None:
             self._config['publicIP'] = public_ip
         
-        logger.info(f"Azure Builder: Red - VNet: {self._config['vnet_name']}")
+        logger.debug("Azure Builder: Red - VNet: %s", self._config['vnet_name'])
         return self
 
     def set_location(self, location: str) -> 'AzureVMBuilder':
         """Configura la ubicación/región"""
         self._config['location'] = location
-        logger.info(f"Azure Builder: Ubicación - {location}")
+        logger.debug("Azure Builder: Ubicación - %s", location)
         return self
 
     def set_advanced_options(self, options: Dict[str, Any]) -> 'AzureVMBuilder':
@@ -150,7 +150,7 @@ class AzureVMBuilder(VMBuilder):
             self._config['boot_diagnostics'] = options['monitoring']
         
         self._config.update(options)
-        logger.info("Azure Builder: Opciones avanzadas configuradas")
+        logger.debug("Azure Builder: Opciones avanzadas configuradas")
         return self
 
     def build(self) -> MachineVirtual:
@@ -170,7 +170,7 @@ class AzureVMBuilder(VMBuilder):
         
         # Disk con región obligatoria
         disk = StorageDisk(
-            diskId=f"disk-{uuid.uuid4().hex[:8]}",
+            diskId=id_generator.new_id('azure', 'disk'),
             name=f"azure-disk-{self._config.get('disk_sku', 'Standard_LRS')}",
             size_gb=self._config.get('size_gb', 50),
             disk_type=self._config.get('disk_sku', 'Standard_LRS'),
@@ -183,7 +183,7 @@ class AzureVMBuilder(VMBuilder):
         if network.region != disk.region:
             raise ValueError(f"Error de coherencia de región: Network={network.region}, Disk={disk.region}")
         
-        vm_id = f"azure-{uuid.uuid4()}"
+        vm_id = id_generator.new_id('azure')
         
         vm = MachineVirtual(
             vmId=vm_id,
@@ -201,5 +201,5 @@ class AzureVMBuilder(VMBuilder):
             instance_type=self._config.get('size')
         )
         
-        logger.info(f"Azure Builder: VM construida - ID: {vm_id}, Size: {vm.instance_type}, vCPUs: {vm.vcpus}, RAM: {vm.memoryGB}GB")
+        logger.debug("Azure Builder: VM construida - ID: %s, Size: %s, vCPUs: %s, RAM: %sGB", vm_id, vm.instance_type, vm.vcpus, vm.memoryGB)
         return vm
\ No newline at end of file
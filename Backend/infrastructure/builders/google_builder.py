@@ -1,10 +1,10 @@
-import uuid
 from datetime import datetime
 from typing import Optional, Dict, Any
 import logging
 
 from domain.builder import VMBuilder
 from domain.entities import MachineVirtual, VMStatus, Network, StorageDisk, VMInstanceType
+from domain.ids import id_generator
 
 logger = logging.getLogger(__name__)
 
@@ -58,7 +58,7 @@ class GoogleVMBuilder(VMBuilder):
             self._config['vcpus'] = specs['vcpus']
             self._config['memoryGB'] = specs['memoryGB']
         
-        logger.info(f"Google Builder: Config - {name}, Type: {vm_type}, Machine: {self._config['machine_type']}")
+        logger.debug("Google Builder: Config - %s, Type: %s, Machine: %s", name, vm_type, self._config['machine_type'])
         return self
 
     def set_instance_type(self, instance_type: str) -> 'GoogleVMBuilder':
@@ -127,7 +127,7 @@ class GoogleVMBuilder(VMBuilder):
         )
         
         disk = StorageDisk(
-            diskId=f"disk-{uuid.uuid4().hex[:8]}",
+            diskId=id_generator.new_id('google', 'disk'),
             name=f"gcp-disk-{self._config.get('disk_type', 'pd-standard')}",
             size_gb=self._config.get('size_gb', 50),
             disk_type=self._config.get('disk_type', 'pd-standard'),
@@ -139,7 +139,7 @@ class GoogleVMBuilder(VMBuilder):
         if network.region != disk.region:
             raise ValueError(f"Error de coherencia: Network={network.region}, Disk={disk.region}")
         
-        vm_id = f"gcp-{uuid.uuid4()}"
+        vm_id = id_generator.new_id('google')
         
         vm = MachineVirtual(
             vmId=vm_id,
@@ -157,5 +157,5 @@ class GoogleVMBuilder(VMBuilder):
             instance_type=self._config.get('machine_type')
         )
         
-        logger.info(f"Google Builder: VM construida - {vm_id}")
+        logger.debug("Google Builder: VM construida - %s", vm_id)
         return vm
\ No newline at end of file
@@ -2,13 +2,13 @@
 OnPremise VM Builder - Concrete Builder para On-Premise
 Implementa construcción paso a paso de VMs On-Premise
 """
-import uuid
 from datetime import datetime
 from typing import Optional, Dict, Any
 import logging
 
 from domain.builder import VMBuilder
 from domain.entities import MachineVirtual, VMInstanceType, VMStatus, Network, StorageDisk
+from domain.ids import id_generator
 
 logger = logging.getLogger(__name__)
 
@@ -64,7 +64,7 @@ class OnPremiseVMBuilder(VMBuilder):
             self._config['vcpus'] = specs['vcpus']
             self._config['memoryGB'] = specs['memoryGB']
 
-        logger.info(f"OnPremise Builder: Config - {name}, Flavor: {self._config['flavor']}")
+        logger.debug("OnPremise Builder: Config - %s, Flavor: %s", name, self._config['flavor'])
         return self
 
     def set_instance_type(self, instance_type: str) -> 'OnPremiseVMBuilder':
@@ -147,7 +147,7 @@ class OnPremiseVMBuilder(VMBuilder):
         raid_level = self._config.get('raid_level', 5)
         
         disk = StorageDisk(
-            diskId=f"disk-{storage_pool}-{uuid.uuid4().hex[:4]}",
+            diskId=id_generator.new_id('onpremise', 'disk', storage_pool),
             name=f"storage-for-{storage_pool}",
             size_gb=self._config.get('disk', 50),
             disk_type=f"RAID-{raid_level}",
@@ -159,7 +159,7 @@ class OnPremiseVMBuilder(VMBuilder):
         if network.region != disk.region:
             raise ValueError(f"Error de coherencia: Network={network.region}, Disk={disk.region}")
 
-        vm_id = f"onprem-{uuid.uuid4()}"
+        vm_id = id_generator.new_id('onpremise')
 
         vm = MachineVirtual(
             vmId=vm_id,
@@ -177,5 +177,5 @@ class OnPremiseVMBuilder(VMBuilder):
             instance_type=self._config.get('flavor')
         )
 
-        logger.info(f"OnPremise Builder: VM construida - {vm_id}")
+        logger.debug("OnPremise Builder: VM construida - %s", vm_id)
         return vm
\ No newline at end of file
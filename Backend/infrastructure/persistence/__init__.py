@@ -0,0 +1,9 @@
+"""
+Infrastructure Layer - Persistencia
+Backends durables para el inventario de VMs
+"""
+from infrastructure.persistence.sqlite_store import SQLiteInventoryStore
+from infrastructure.persistence.journal import InventoryJournal
+from infrastructure.persistence.shared import SharedSQLiteInventory
+
+__all__ = ['SQLiteInventoryStore', 'InventoryJournal', 'SharedSQLiteInventory']
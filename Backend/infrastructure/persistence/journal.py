@@ -0,0 +1,236 @@
+"""
+Infrastructure Layer - Journal del inventario
+Registro append-only de eventos del inventario con snapshots compactados
+
+Archivos en el directorio del journal:
+- journal.jsonl: una línea JSON por evento (created, status_changed, deleted)
+  con un número de secuencia creciente
+- journal.jsonl.1: journal anterior, mientras se escribe el snapshot que lo cubre
+- snapshot.json: estado completo del inventario hasta la secuencia `seq`
+
+Cada `snapshot_every` eventos se rota el journal y un hilo de fondo escribe un
+snapshot nuevo (archivo temporal + os.replace, atómico) a partir de los
+to_dict() de las VMs tomados bajo el lock del inventario (el hilo no toca las
+VMs vivas); la petición que cruza el umbral solo escribe su línea y copia el
+estado. Al arrancar se carga el último snapshot y
+solo se reproduce la cola de eventos posteriores (de ambos journals); una
+última línea truncada por una caída se ignora.
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+from typing import Any, Dict, List, Optional
+
+from domain.entities import MachineVirtual
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILE = 'journal.jsonl'
+ROTATED_SUFFIX = '.1'
+SNAPSHOT_FILE = 'snapshot.json'
+
+
+class InventoryJournal:
+    """
+    Uso:
+        journal = InventoryJournal('/var/lib/vm-api')
+        for vm in journal.recover():
+            inventory.add(vm)
+        journal.attach(inventory)
+    """
+
+    def __init__(self, directory: str, snapshot_every: int = 1000, fsync: bool = False):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._since_snapshot = 0
+        self._inventory = None
+        # Tomado mientras se compacta (en segundo plano o con compact())
+        self._compaction_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._journal_path = os.path.join(directory, JOURNAL_FILE)
+        self._rotated_path = self._journal_path + ROTATED_SUFFIX
+        self._snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self._file = None
+
+    # ===== Recuperación =====
+    def _read_snapshot(self) -> Dict[str, Any]:
+        if not os.path.exists(self._snapshot_path):
+            return {'seq': 0, 'vms': []}
+        with open(self._snapshot_path, 'r', encoding='utf-8') as handle:
+            return json.load(handle)
+
+    def _read_tail(self, after_seq: int) -> List[Dict[str, Any]]:
+        """Eventos con secuencia posterior al snapshot, del journal rotado y del actual"""
+        entries: List[Dict[str, Any]] = []
+        for path in (self._rotated_path, self._journal_path):
+            self._read_file(path, after_seq, entries)
+        return entries
+
+    @staticmethod
+    def _read_file(path: str, after_seq: int, entries: List[Dict[str, Any]]) -> None:
+        """
+        Agrega a `entries` los eventos de un archivo. Una línea final incompleta
+        se descarta del archivo para que las nuevas escrituras no se mezclen con ella.
+        """
+        if not os.path.exists(path):
+            return
+        valid_size = 0
+        with open(path, 'rb') as handle:
+            for line in handle:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("línea sin terminar")
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Journal: línea incompleta descartada tras {len(entries)} eventos")
+                    break
+                valid_size += len(line)
+                if entry['seq'] > after_seq:
+                    entries.append(entry)
+        if valid_size < os.path.getsize(path):
+            with open(path, 'r+b') as handle:
+                handle.truncate(valid_size)
+
+    def recover(self) -> List[MachineVirtual]:
+        """
+        Reconstruye el inventario: último snapshot + eventos posteriores.
+        Retorna las VMs ordenadas por (createdAt, vmId).
+        """
+        snapshot = self._read_snapshot()
+        state: Dict[str, Dict[str, Any]] = {data['vmId']: data for data in snapshot['vms']}
+        tail = self._read_tail(snapshot['seq'])
+        for entry in tail:
+            kind = entry['kind']
+            if kind == 'created':
+                state[entry['vm']['vmId']] = entry['vm']
+            elif kind == 'status_changed':
+                if entry['vm_id'] in state:
+                    state[entry['vm_id']] = dict(state[entry['vm_id']], status=entry['status'])
+            elif kind == 'deleted':
+                state.pop(entry['vm_id'], None)
+
+        with self._lock:
+            self._seq = tail[-1]['seq'] if tail else snapshot['seq']
+            self._since_snapshot = len(tail)
+        logger.info(f"Journal: snapshot con {len(snapshot['vms'])} VMs + {len(tail)} eventos reproducidos")
+
+        vms = [MachineVirtual.from_dict(data) for data in state.values()]
+        vms.sort(key=lambda vm: (vm.createdAt, vm.vmId))
+        return vms
+
+    # ===== Escritura =====
+    def attach(self, inventory) -> None:
+        """Suscribe el journal a los eventos de un VMInventory"""
+        self._inventory = inventory
+        inventory.add_listener(self.on_event)
+
+    def on_event(self, event) -> None:
+        """Listener de InventoryEvent (se invoca dentro del lock del inventario)"""
+        if event.kind == 'created':
+            entry = {'kind': 'created', 'vm': event.vm.to_dict()}
+        elif event.kind == 'status_changed':
+            entry = {'kind': 'status_changed', 'vm_id': event.vm.vmId, 'status': event.vm.status.value}
+        else:
+            entry = {'kind': 'deleted', 'vm_id': event.vm.vmId}
+        self.append(entry)
+        if self._since_snapshot >= self.snapshot_every and self._compaction_lock.acquire(blocking=False):
+            # Dentro del lock del inventario: la copia coincide con la secuencia actual
+            self._start_compaction([vm.to_dict() for vm in self._inventory.find()])
+
+    def append(self, entry: Dict[str, Any]) -> int:
+        """Agrega un evento al journal y retorna su secuencia"""
+        with self._lock:
+            self._seq += 1
+            entry['seq'] = self._seq
+            if self._file is None:
+                self._file = open(self._journal_path, 'a', encoding='utf-8')
+            self._file.write(json.dumps(entry) + '\n')
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._since_snapshot += 1
+            return self._seq
+
+    def _rotate(self) -> int:
+        """
+        Pasa el journal actual a journal.jsonl.1 y retorna la secuencia que
+        cubrirá el snapshot. Si quedó un journal rotado de una compactación
+        interrumpida, el actual se agrega a él para no perder eventos.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if os.path.exists(self._journal_path):
+                if os.path.exists(self._rotated_path):
+                    with open(self._journal_path, 'rb') as source, open(self._rotated_path, 'ab') as target:
+                        shutil.copyfileobj(source, target)
+                    os.remove(self._journal_path)
+                else:
+                    os.replace(self._journal_path, self._rotated_path)
+            self._since_snapshot = 0
+            return self._seq
+
+    def _start_compaction(self, vms: List[Dict[str, Any]]) -> None:
+        """Rota el journal y escribe el snapshot en un hilo de fondo (con _compaction_lock tomado)"""
+        seq = self._rotate()
+        threading.Thread(target=self._compact_in_background, args=(vms, seq),
+                         name='InventoryJournalCompaction', daemon=True).start()
+
+    def _compact_in_background(self, vms: List[Dict[str, Any]], seq: int) -> None:
+        try:
+            self._write_snapshot(vms, seq)
+        except Exception as e:
+            # El journal rotado se conserva: la próxima compactación lo incluye
+            logger.error(f"Journal: no se pudo escribir el snapshot: {str(e)}")
+        finally:
+            self._compaction_lock.release()
+
+    def wait_for_compaction(self) -> None:
+        """Espera a que termine la compactación en curso (si la hay)"""
+        with self._compaction_lock:
+            pass
+
+    def compact(self, vms: Optional[List[MachineVirtual]] = None) -> None:
+        """
+        Escribe un snapshot del estado actual y vacía el journal (síncrono).
+        Sin `vms`, se toma el inventario adjunto.
+        """
+        if vms is None and self._inventory is None:
+            raise RuntimeError("Journal sin inventario adjunto")
+        with self._compaction_lock:
+            if vms is None:
+                # Con el lock del inventario no puede colarse un evento entre la copia y la rotación
+                with self._inventory.lock:
+                    data = [vm.to_dict() for vm in self._inventory.find()]
+                    seq = self._rotate()
+            else:
+                data = [vm.to_dict() for vm in vms]
+                seq = self._rotate()
+            self._write_snapshot(data, seq)
+
+    def _write_snapshot(self, vms: List[Dict[str, Any]], seq: int) -> None:
+        snapshot = {'seq': seq, 'vms': vms}
+        tmp_path = self._snapshot_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump(snapshot, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, self._snapshot_path)
+
+        # El snapshot ya cubre el journal rotado
+        if os.path.exists(self._rotated_path):
+            os.remove(self._rotated_path)
+        logger.info(f"Journal compactado: snapshot con {len(vms)} VMs (seq {seq})")
+
+    def close(self) -> None:
+        self.wait_for_compaction()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,251 @@
+"""
+Infrastructure Layer - Inventario compartido entre procesos
+Sincroniza el VMInventory de cada worker (servidor pre-fork) a través de una
+base SQLite en modo WAL en el mismo host
+
+Cada worker conserva su inventario en memoria (índices, capacidad, feed de
+eventos...) y la base actúa de registro común:
+
+- Escritura: cada cambio local se confirma de forma síncrona, antes de
+  responder, en una transacción que actualiza las tablas de VMs y añade una
+  fila a inventory_changes con una secuencia global creciente. Si la
+  transacción falla, el cambio local se deshace y el error llega a la petición.
+- Lectura: antes de atender una petición, sync() aplica los cambios de otros
+  workers con secuencia posterior a la última vista (una consulta por clave
+  primaria; sin cambios no toma el lock del inventario).
+
+Las tareas que deben ejecutarse en un solo worker (el reaper de VMs
+expiradas) se coordinan con leases en la tabla `leases`: un worker es titular
+mientras renueve su lease antes de que venza.
+
+Si dos workers modifican la misma VM gana el cambio con mayor secuencia
+(last-writer-wins por VM), así que todos convergen al mismo estado. El
+registro de cambios se poda periódicamente; un worker que se quede atrás más
+allá de lo podado recarga el inventario completo desde la tabla de VMs.
+"""
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from domain.entities import MachineVirtual, VMStatus
+from infrastructure.persistence.sqlite_store import DELETE, SCHEMA, UPSERT, connect, write_operations
+
+logger = logging.getLogger(__name__)
+
+CHANGES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS inventory_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    vm_id TEXT NOT NULL,
+    origin TEXT NOT NULL,
+    data TEXT
+);
+"""
+
+LEASES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+# Cada cuántas secuencias se poda el registro de cambios
+PRUNE_EVERY = 1000
+
+
+class SharedSQLiteInventory:
+    """
+    Uso (en cada worker):
+        shared = SharedSQLiteInventory('/var/lib/vm-api/inventory.db')
+        shared.attach(inventory)       # carga el estado común y publica los cambios locales
+        shared.sync()                  # al inicio de cada petición
+    """
+
+    def __init__(self, path: str, retain: int = 10000):
+        self.path = path
+        self.retain = retain
+        self._inventory = None
+        self._last_seq = 0
+        # Secuencia del último cambio aplicado a cada VM (local o remoto)
+        self._vm_seq: Dict[str, int] = {}
+        self._local = threading.local()
+        self._sync_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+        connection = connect(path)
+        try:
+            connection.executescript(SCHEMA + CHANGES_SCHEMA + LEASES_SCHEMA)
+        finally:
+            connection.close()
+
+    @property
+    def origin(self) -> str:
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def _db(self) -> sqlite3.Connection:
+        """Conexión del proceso actual (tras un fork se abre una nueva)"""
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = connect(self.path)
+            self._connection.isolation_level = None  # transacciones explícitas
+            self._pid = os.getpid()
+        return self._connection
+
+    # ===== Suscripción =====
+    def attach(self, inventory) -> None:
+        """Carga el estado común en el inventario y publica en la base sus cambios"""
+        self._inventory = inventory
+        with self._sync_lock, inventory.lock:
+            self._reload()
+            # Crítico: si la base falla, el cambio local se deshace y la petición falla
+            inventory.add_listener(self.on_event, critical=True)
+        logger.info(f"Inventario compartido ({self.path}): {len(inventory)} VMs, secuencia {self._last_seq}")
+
+    def on_event(self, event) -> None:
+        """Listener de InventoryEvent: confirma el cambio local en la base"""
+        if getattr(self._local, 'applying', False):
+            return  # cambio que viene de otro worker
+        vm_id = event.vm.vmId
+        data = None if event.kind == 'deleted' else event.vm.to_dict()
+        operation = (DELETE, vm_id) if data is None else (UPSERT, data)
+
+        with self._db_lock:
+            connection = self._db()
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                write_operations(connection, [operation])
+                seq = connection.execute(
+                    'INSERT INTO inventory_changes (kind, vm_id, origin, data) VALUES (?, ?, ?, ?)',
+                    (event.kind, vm_id, self.origin, json.dumps(data) if data is not None else None)
+                ).lastrowid
+                if seq % PRUNE_EVERY == 0:
+                    connection.execute('DELETE FROM inventory_changes WHERE seq <= ?', (seq - self.retain,))
+                connection.execute('COMMIT')
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+            self._vm_seq[vm_id] = seq
+
+    # ===== Sincronización =====
+    def _fetch(self, after: int) -> Tuple[List[Tuple[int, str, str, Optional[str]]], int]:
+        """Cambios posteriores a `after` y la secuencia mínima aún en el registro"""
+        with self._db_lock:
+            connection = self._db()
+            rows = connection.execute(
+                'SELECT seq, kind, vm_id, data FROM inventory_changes WHERE seq > ? ORDER BY seq', (after,)
+            ).fetchall()
+            oldest = 0
+            if rows and rows[0][0] != after + 1:
+                oldest = connection.execute('SELECT MIN(seq) FROM inventory_changes').fetchone()[0] or 0
+        return rows, oldest
+
+    def sync(self) -> int:
+        """
+        Aplica los cambios de otros workers posteriores a la última secuencia vista.
+        Retorna el número de cambios aplicados.
+        """
+        if self._inventory is None:
+            return 0
+        with self._sync_lock:
+            rows, oldest = self._fetch(self._last_seq)
+            if not rows:
+                return 0
+            with self._inventory.lock:
+                if oldest > self._last_seq + 1:
+                    logger.warning(f"Inventario compartido: cambios podados tras la secuencia {self._last_seq}, "
+                                   f"recargando")
+                    return self._reload()
+                applied = 0
+                self._local.applying = True
+                try:
+                    for seq, kind, vm_id, data in rows:
+                        if self._vm_seq.get(vm_id, 0) < seq:
+                            self._apply(kind, vm_id, json.loads(data) if data else None)
+                            self._vm_seq[vm_id] = seq
+                            applied += 1
+                        self._last_seq = seq
+                finally:
+                    self._local.applying = False
+        return applied
+
+    def _apply(self, kind: str, vm_id: str, data: Optional[Dict[str, Any]]) -> None:
+        inventory = self._inventory
+        if kind == 'deleted':
+            inventory.remove(vm_id)
+            return
+        current = inventory.get(vm_id)
+        if kind == 'status_changed' and current is not None:
+            inventory.set_status(vm_id, VMStatus(data['status']))
+        else:
+            inventory.add(MachineVirtual.from_dict(data))
+
+    def _reload(self) -> int:
+        """Reemplaza el inventario local por el contenido de la tabla de VMs"""
+        with self._db_lock:
+            connection = self._db()
+            connection.execute('BEGIN')  # instantánea coherente de vms + secuencia
+            try:
+                last_seq = connection.execute('SELECT COALESCE(MAX(seq), 0) FROM inventory_changes').fetchone()[0]
+                rows = connection.execute('SELECT data FROM vms ORDER BY created_at, vm_id').fetchall()
+            finally:
+                connection.execute('COMMIT')
+
+        inventory = self._inventory
+        stored = {}
+        for (data,) in rows:
+            vm_data = json.loads(data)
+            stored[vm_data['vmId']] = vm_data
+        changed = 0
+        self._local.applying = True
+        try:
+            for vm in inventory.find():
+                if vm.vmId not in stored:
+                    inventory.remove(vm.vmId)
+                    changed += 1
+            for vm_id, vm_data in stored.items():
+                current = inventory.get(vm_id)
+                if current is None or current.to_dict() != vm_data:
+                    inventory.add(MachineVirtual.from_dict(vm_data))
+                    changed += 1
+        finally:
+            self._local.applying = False
+        self._last_seq = last_seq
+        self._vm_seq = {vm_id: last_seq for vm_id in stored}
+        return changed
+
+    # ===== Leases =====
+    def acquire_lease(self, name: str, ttl: float) -> bool:
+        """
+        Toma o renueva el lease `name` durante `ttl` segundos. Retorna True si
+        este worker es el titular (el lease de otro solo se toma si venció).
+        """
+        now = time.time()
+        with self._db_lock:
+            connection = self._db()
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                connection.execute(
+                    'INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) '
+                    'ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at '
+                    'WHERE leases.owner = excluded.owner OR leases.expires_at < ?',
+                    (name, self.origin, now + ttl, now)
+                )
+                owner = connection.execute('SELECT owner FROM leases WHERE name = ?', (name,)).fetchone()[0]
+                connection.execute('COMMIT')
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+        return owner == self.origin
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
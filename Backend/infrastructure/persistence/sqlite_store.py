@@ -0,0 +1,306 @@
+"""
+Infrastructure Layer - Inventario persistente en SQLite
+Almacena VMs, redes y discos en SQLite (modo WAL) con escrituras agrupadas
+
+Las peticiones nunca escriben en disco: los cambios del inventario se encolan
+y un hilo escritor los aplica en lotes, un único COMMIT por lote (group commit).
+Un lote se cierra al alcanzar batch_size operaciones o tras flush_interval
+segundos desde la primera operación pendiente.
+"""
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import weakref
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from domain.entities import MachineVirtual
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vms (
+    vm_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    region TEXT,
+    status TEXT NOT NULL,
+    instance_type TEXT,
+    vcpus INTEGER NOT NULL,
+    memory_gb INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_vms_provider ON vms(provider);
+CREATE INDEX IF NOT EXISTS idx_vms_region ON vms(region);
+CREATE INDEX IF NOT EXISTS idx_vms_status ON vms(status);
+CREATE INDEX IF NOT EXISTS idx_vms_created_at ON vms(created_at, vm_id);
+
+CREATE TABLE IF NOT EXISTS networks (
+    network_id TEXT NOT NULL,
+    vm_id TEXT NOT NULL REFERENCES vms(vm_id) ON DELETE CASCADE,
+    provider TEXT NOT NULL,
+    region TEXT NOT NULL,
+    cidr_block TEXT,
+    PRIMARY KEY (vm_id, network_id)
+);
+CREATE INDEX IF NOT EXISTS idx_networks_network_id ON networks(network_id);
+
+CREATE TABLE IF NOT EXISTS disks (
+    disk_id TEXT NOT NULL,
+    vm_id TEXT NOT NULL REFERENCES vms(vm_id) ON DELETE CASCADE,
+    provider TEXT NOT NULL,
+    region TEXT NOT NULL,
+    size_gb INTEGER NOT NULL,
+    disk_type TEXT,
+    PRIMARY KEY (vm_id, disk_id)
+);
+"""
+
+# Operaciones de la cola del escritor
+UPSERT = 'upsert'
+DELETE = 'delete'
+_STOP = object()
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Abre una conexión en modo WAL (lectores concurrentes con un escritor)"""
+    connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    connection.execute('PRAGMA foreign_keys=ON')
+    return connection
+
+
+def vm_rows(data: Dict[str, Any]) -> Tuple[Tuple, List[Tuple], List[Tuple]]:
+    """Filas de vms, networks y disks a partir de MachineVirtual.to_dict()"""
+    vm_id = data['vmId']
+    network = data.get('network')
+    disks = data.get('disks') or []
+    region = network['region'] if network else (disks[0]['region'] if disks else None)
+    vm_row = (
+        vm_id, data['name'], data['provider'], region, data['status'], data.get('instance_type'),
+        data['vcpus'], data['memoryGB'], datetime.fromisoformat(data['createdAt']).timestamp(),
+        json.dumps(data)
+    )
+    network_rows = ([(network['networkId'], vm_id, network['provider'], network['region'],
+                      network['cidr_block'])] if network else [])
+    disk_rows = [(disk['diskId'], vm_id, disk['provider'], disk['region'], disk['size_gb'],
+                  disk['disk_type']) for disk in disks]
+    return vm_row, network_rows, disk_rows
+
+
+def write_operations(connection: sqlite3.Connection, batch: List[Any]) -> None:
+    """
+    Aplica operaciones (upsert con to_dict() o delete con vmId) en la
+    transacción en curso; quien llama decide dónde empieza y termina
+    """
+    for operation, payload in batch:
+        if operation == DELETE:
+            connection.execute('DELETE FROM vms WHERE vm_id = ?', (payload,))
+            continue
+        vm_row, network_rows, disk_rows = vm_rows(payload)
+        vm_id = vm_row[0]
+        connection.execute(
+            'INSERT OR REPLACE INTO vms (vm_id, name, provider, region, status, instance_type, '
+            'vcpus, memory_gb, created_at, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', vm_row)
+        connection.execute('DELETE FROM networks WHERE vm_id = ?', (vm_id,))
+        connection.execute('DELETE FROM disks WHERE vm_id = ?', (vm_id,))
+        connection.executemany(
+            'INSERT INTO networks (network_id, vm_id, provider, region, cidr_block) '
+            'VALUES (?, ?, ?, ?, ?)', network_rows)
+        connection.executemany(
+            'INSERT INTO disks (disk_id, vm_id, provider, region, size_gb, disk_type) '
+            'VALUES (?, ?, ?, ?, ?, ?)', disk_rows)
+
+
+# Stores abiertos: el hilo escritor no sobrevive a un fork (gunicorn --preload),
+# así que cada hijo arranca el suyo con una cola nueva. El fork espera a que
+# ningún escritor esté dentro de SQLite: un mutex de SQLite tomado en el padre
+# quedaría tomado para siempre en el hijo
+_stores: 'weakref.WeakSet[SQLiteInventoryStore]' = weakref.WeakSet()
+
+
+def _pause_writers_before_fork() -> None:
+    for store in list(_stores):
+        store._write_lock.acquire()
+
+
+def _resume_writers_after_fork() -> None:
+    for store in list(_stores):
+        store._write_lock.release()
+
+
+def _restart_writers_after_fork() -> None:
+    for store in list(_stores):
+        store._write_lock = threading.Lock()
+        store._start_writer()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=_pause_writers_before_fork,
+                        after_in_parent=_resume_writers_after_fork,
+                        after_in_child=_restart_writers_after_fork)
+
+
+class SQLiteInventoryStore:
+    """
+    Backend durable del inventario
+
+    Uso:
+        store = SQLiteInventoryStore('inventory.db')
+        for vm in store.load_all():
+            inventory.add(vm)
+        store.attach(inventory)   # persiste los cambios siguientes
+    """
+
+    def __init__(self, path: str, batch_size: int = 256, flush_interval: float = 0.05):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._closed = False
+        self._write_lock = threading.Lock()
+
+        connection = connect(path)
+        try:
+            connection.executescript(SCHEMA)
+        finally:
+            connection.close()
+
+        self._start_writer()
+        _stores.add(self)
+
+    def _start_writer(self) -> None:
+        """Cola y hilo escritor nuevos (lo encolado en el padre lo escribe el padre)"""
+        if self._closed:
+            return
+        self._queue: 'queue.Queue[Any]' = queue.Queue()
+        # La conexión se abre en este hilo: un fork no puede pillar al escritor dentro de connect()
+        connection = connect(self.path)
+        self._writer = threading.Thread(target=self._run, args=(connection,),
+                                        name='inventory-sqlite-writer', daemon=True)
+        self._writer.start()
+
+    # ===== Escritura (hilo de la petición) =====
+    def attach(self, inventory) -> None:
+        """Suscribe el store a los eventos de un VMInventory"""
+        inventory.add_listener(self.on_event)
+
+    def on_event(self, event) -> None:
+        """Listener de InventoryEvent: las bajas borran, el resto guarda la VM"""
+        if event.kind == 'deleted':
+            self.delete(event.vm.vmId)
+        else:
+            self.save(event.vm)
+
+    def save(self, vm: MachineVirtual) -> None:
+        """
+        Encola el alta o actualización de una VM con su estado en este instante.
+        Solo se toma to_dict() (memorizado); filas y JSON se generan en el hilo escritor.
+        """
+        self._put((UPSERT, vm.to_dict()))
+
+    def delete(self, vm_id: str) -> None:
+        """Encola la baja de una VM (sus redes y discos se borran en cascada)"""
+        self._put((DELETE, vm_id))
+
+    def _put(self, operation: Tuple[str, Any]) -> None:
+        if self._closed:
+            raise RuntimeError("El store del inventario está cerrado")
+        self._queue.put(operation)
+
+    # ===== Hilo escritor =====
+    def _run(self, connection: sqlite3.Connection) -> None:
+        try:
+            while True:
+                first = self._queue.get()
+                if first is _STOP:
+                    self._queue.task_done()
+                    return
+                batch = [first]
+                stop = self._fill_batch(batch)
+                try:
+                    with self._write_lock:
+                        self._write(connection, batch)
+                finally:
+                    for _ in range(len(batch) + (1 if stop else 0)):
+                        self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            with self._write_lock:
+                connection.close()
+
+    def _fill_batch(self, batch: List[Any]) -> bool:
+        """Agrega operaciones al lote; retorna True si llegó la señal de parada"""
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                return False
+            if item is _STOP:
+                return True
+            batch.append(item)
+        return False
+
+    def _write(self, connection: sqlite3.Connection, batch: List[Any]) -> None:
+        """Aplica el lote; si falla, reintenta operación por operación para no perder las válidas"""
+        try:
+            self._apply(connection, batch)
+            return
+        except Exception as e:
+            logger.warning(f"Lote del inventario rechazado ({len(batch)} operaciones): {str(e)}")
+        for operation in batch:
+            try:
+                self._apply(connection, [operation])
+            except Exception as e:
+                logger.error(f"Error persistiendo operación del inventario {operation[0]}: {str(e)}")
+
+    @classmethod
+    def _apply(cls, connection: sqlite3.Connection, batch: List[Any]) -> None:
+        with connection:  # una transacción (y un fsync) por lote
+            write_operations(connection, batch)
+
+    # ===== Control =====
+    def flush(self) -> None:
+        """Bloquea hasta que todas las operaciones encoladas estén confirmadas"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Confirma lo pendiente y detiene el hilo escritor"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join()
+
+    # ===== Lectura =====
+    def load_all(self) -> Iterator[MachineVirtual]:
+        """VMs persistidas, ordenadas por (createdAt, vmId)"""
+        connection = connect(self.path)
+        try:
+            for (data,) in connection.execute('SELECT data FROM vms ORDER BY created_at, vm_id'):
+                yield MachineVirtual.from_dict(json.loads(data))
+        finally:
+            connection.close()
+
+    def get(self, vm_id: str) -> Optional[MachineVirtual]:
+        connection = connect(self.path)
+        try:
+            row = connection.execute('SELECT data FROM vms WHERE vm_id = ?', (vm_id,)).fetchone()
+        finally:
+            connection.close()
+        return MachineVirtual.from_dict(json.loads(row[0])) if row else None
+
+    def count(self) -> int:
+        connection = connect(self.path)
+        try:
+            return connection.execute('SELECT COUNT(*) FROM vms').fetchone()[0]
+        finally:
+            connection.close()
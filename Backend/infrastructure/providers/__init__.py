@@ -3,8 +3,30 @@ Paquete de Proveedores de Infraestructura
 
 Este __init__.py exporta todas las implementaciones concretas de proveedores,
 permitiendo que otras partes de la aplicación las importen desde un único lugar.
+
+Las clases se importan de forma perezosa (PEP 562): el módulo de cada proveedor
+solo se carga la primera vez que se accede a su clase.
 """
-from .aws import AWS
-from .azure import Azure
-from .google import Google
-from .onpremise import OnPremise
\ No newline at end of file
+import importlib
+
+_exports = {
+    'AWS': 'infrastructure.providers.aws',
+    'Azure': 'infrastructure.providers.azure',
+    'Google': 'infrastructure.providers.google',
+    'OnPremise': 'infrastructure.providers.onpremise'
+}
+
+__all__ = list(_exports.keys())
+
+
+def __getattr__(name):
+    module_path = _exports.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_path), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + __all__)
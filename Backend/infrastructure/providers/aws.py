@@ -1,10 +1,10 @@
-import uuid
 from datetime import datetime
 from typing import Dict, Any
 import logging
 
 from domain.interfaces import ProveedorAbstracto
 from domain.entities import MachineVirtual, VMStatus, Network, StorageDisk
+from domain.ids import id_generator
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +18,8 @@ class AWS(ProveedorAbstracto):
         self.region = self.config.get('region', 'us-east-1')
     
     def crear_vm(self) -> MachineVirtual:
-        vm_id = f"aws-{uuid.uuid4()}"
-        logger.info(f"Creando VM en AWS - ID: {vm_id}, Tipo: {self.instance_type}, Región: {self.region}")
+        vm_id = id_generator.new_id('aws')
+        logger.debug("Creando VM en AWS - ID: %s, Tipo: %s, Región: %s", vm_id, self.instance_type, self.region)
         
         # Valores por defecto de vCPU y memoria según instance type
         vcpu_ram_map = {
@@ -48,8 +48,8 @@ class AWS(ProveedorAbstracto):
         return vm
 
     def crear_network(self) -> Network:
-        vpc_id = self.config.get('vpcId', f"vpc-{uuid.uuid4().hex[:8]}")
-        logger.info(f"Creando Red en AWS - VPC ID: {vpc_id}")
+        vpc_id = self.config.get('vpcId') or id_generator.new_id('aws', 'network')
+        logger.debug("Creando Red en AWS - VPC ID: %s", vpc_id)
         
         return Network(
             networkId=vpc_id,
@@ -62,10 +62,10 @@ class AWS(ProveedorAbstracto):
         )
 
     def crear_disk(self) -> StorageDisk:
-        disk_id = f"vol-{uuid.uuid4().hex[:12]}"
+        disk_id = id_generator.new_id('aws', 'disk')
         size_gb = self.config.get('sizeGB', 20)
         volume_type = self.config.get('volumeType', 'gp2')
-        logger.info(f"Creando Disco en AWS - ID: {disk_id}, Tamaño: {size_gb}GB, Tipo: {volume_type}")
+        logger.debug("Creando Disco en AWS - ID: %s, Tamaño: %sGB, Tipo: %s", disk_id, size_gb, volume_type)
         
         return StorageDisk(
             diskId=disk_id,
@@ -1,10 +1,10 @@
-import uuid
 from datetime import datetime
 from typing import Dict, Any
 import logging
 
 from domain.interfaces import ProveedorAbstracto
 from domain.entities import MachineVirtual, VMStatus, Network, StorageDisk
+from domain.ids import id_generator
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +19,8 @@ class Azure(ProveedorAbstracto):
         self.location = self.config.get('location', 'eastus')
     
     def crear_vm(self) -> MachineVirtual:
-        vm_id = f"azure-{uuid.uuid4()}"
-        logger.info(f"Creando VM en Azure - ID: {vm_id}, Tamaño: {self.size}, Grupo: {self.resource_group}")
+        vm_id = id_generator.new_id('azure')
+        logger.debug("Creando VM en Azure - ID: %s, Tamaño: %s, Grupo: %s", vm_id, self.size, self.resource_group)
         
         # Mapeo de vCPU y memoria según size
         vcpu_ram_map = {
@@ -48,7 +48,7 @@ class Azure(ProveedorAbstracto):
 
     def crear_network(self) -> Network:
         vnet_name = self.config.get('virtualNetwork', f"vnet-{self.resource_group}")
-        logger.info(f"Creando Red en Azure - VNet: {vnet_name}")
+        logger.debug("Creando Red en Azure - VNet: %s", vnet_name)
         
         return Network(
             networkId=vnet_name,
@@ -61,10 +61,10 @@ class Azure(ProveedorAbstracto):
         )
 
     def crear_disk(self) -> StorageDisk:
-        disk_name = f"disk-{uuid.uuid4().hex[:8]}"
+        disk_name = id_generator.new_id('azure', 'disk')
         size_gb = self.config.get('sizeGB', 30)
         disk_sku = self.config.get('diskSku', 'Standard_LRS')
-        logger.info(f"Creando Disco en Azure - Nombre: {disk_name}, Tamaño: {size_gb}GB, SKU: {disk_sku}")
+        logger.debug("Creando Disco en Azure - Nombre: %s, Tamaño: %sGB, SKU: %s", disk_name, size_gb, disk_sku)
         
         return StorageDisk(
             diskId=disk_name,
@@ -1,10 +1,10 @@
-import uuid
 from datetime import datetime
 from typing import Dict, Any
 import logging
 
 from domain.interfaces import ProveedorAbstracto
 from domain.entities import MachineVirtual, VMStatus, Network, StorageDisk
+from domain.ids import id_generator
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +18,8 @@ class Google(ProveedorAbstracto):
         self.zone = self.config.get('zone', 'us-central1-a')
     
     def crear_vm(self) -> MachineVirtual:
-        vm_id = f"gcp-{uuid.uuid4()}"
-        logger.info(f"Creando VM en Google Cloud - ID: {vm_id}, Tipo: {self.machine_type}, Zona: {self.zone}")
+        vm_id = id_generator.new_id('google')
+        logger.debug("Creando VM en Google Cloud - ID: %s, Tipo: %s, Zona: %s", vm_id, self.machine_type, self.zone)
         
         vcpu_ram_map = {
             'f1-micro': (1, 0.6),
@@ -46,7 +46,7 @@ class Google(ProveedorAbstracto):
 
     def crear_network(self) -> Network:
         net_name = self.config.get('networkName', 'default-net')
-        logger.info(f"Creando Red en GCP - Nombre: {net_name}")
+        logger.debug("Creando Red en GCP - Nombre: %s", net_name)
         
         return Network(
             networkId=net_name,
@@ -59,10 +59,10 @@ class Google(ProveedorAbstracto):
         )
 
     def crear_disk(self) -> StorageDisk:
-        disk_name = f"disk-{uuid.uuid4().hex[:8]}"
+        disk_name = id_generator.new_id('google', 'disk')
         size_gb = self.config.get('sizeGB', 10)
         disk_type = self.config.get('diskType', 'pd-standard')
-        logger.info(f"Creando Disco en GCP - Nombre: {disk_name}, Tamaño: {size_gb}GB, Tipo: {disk_type}")
+        logger.debug("Creando Disco en GCP - Nombre: %s, Tamaño: %sGB, Tipo: %s", disk_name, size_gb, disk_type)
         
         return StorageDisk(
             diskId=disk_name,
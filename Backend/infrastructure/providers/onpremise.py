@@ -1,10 +1,10 @@
-import uuid
 from datetime import datetime
 from typing import Dict, Any
 import logging
 
 from domain.interfaces import ProveedorAbstracto
 from domain.entities import MachineVirtual, VMStatus, Network, StorageDisk
+from domain.ids import id_generator
 
 logger = logging.getLogger(__name__)
 
@@ -20,8 +20,8 @@ class OnPremise(ProveedorAbstracto):
         self.datacenter = self.config.get('datacenter', 'datacenter-1')
     
     def crear_vm(self) -> MachineVirtual:
-        vm_id = f"onprem-{uuid.uuid4()}"
-        logger.info(f"Creando VM On-Premise - ID: {vm_id}, CPU: {self.cpu}, RAM: {self.ram}GB, Disco: {self.disk}GB")
+        vm_id = id_generator.new_id('onpremise')
+        logger.debug("Creando VM On-Premise - ID: %s, CPU: %s, RAM: %sGB, Disco: %sGB", vm_id, self.cpu, self.ram, self.disk)
         
         vm = MachineVirtual(
             vmId=vm_id,
@@ -40,7 +40,7 @@ class OnPremise(ProveedorAbstracto):
 
     def crear_network(self) -> Network:
         vlan_id = self.config.get('vlanId', 100)
-        logger.info(f"Configurando Red On-Premise - VLAN ID: {vlan_id}")
+        logger.debug("Configurando Red On-Premise - VLAN ID: %s", vlan_id)
         
         return Network(
             networkId=f"vlan-{vlan_id}",
@@ -56,10 +56,10 @@ class OnPremise(ProveedorAbstracto):
         pool_name = self.config.get('storagePool', 'default_pool')
         size_gb = self.config.get('disk', 100)
         raid_level = self.config.get('raidLevel', 5)
-        logger.info(f"Asignando Disco On-Premise - Pool: {pool_name}, Tamaño: {size_gb}GB, RAID: {raid_level}")
+        logger.debug("Asignando Disco On-Premise - Pool: %s, Tamaño: %sGB, RAID: %s", pool_name, size_gb, raid_level)
         
         return StorageDisk(
-            diskId=f"disk-{pool_name}-{uuid.uuid4().hex[:4]}",
+            diskId=id_generator.new_id('onpremise', 'disk', pool_name),
             name=f"storage-for-{pool_name}",
             size_gb=size_gb,
             disk_type=f"RAID-{raid_level}",
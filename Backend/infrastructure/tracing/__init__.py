@@ -0,0 +1,10 @@
+"""
+Infrastructure Layer - Trazas
+Exportadores de spans e integración con logging
+"""
+from infrastructure.tracing.exporters import (BatchSpanExporter, HTTPCollectorExporter, InMemoryExporter,
+                                              JsonlFileExporter)
+from infrastructure.tracing.log_context import TRACE_LOG_FORMAT, TraceContextFilter
+
+__all__ = ['BatchSpanExporter', 'HTTPCollectorExporter', 'InMemoryExporter', 'JsonlFileExporter',
+           'TRACE_LOG_FORMAT', 'TraceContextFilter']
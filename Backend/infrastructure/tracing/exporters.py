@@ -0,0 +1,149 @@
+"""
+Infrastructure Layer - Exportadores de trazas
+Envían los spans terminados a un archivo JSON Lines o a un colector HTTP
+
+Los spans se encolan (sin bloquear la petición) y un hilo de fondo los
+escribe en lotes. La cola es acotada: si el destino no da abasto los spans
+sobrantes se descartan y se cuentan en `dropped`.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import urllib.request
+import weakref
+from abc import abstractmethod
+from typing import Any, Dict, List, Optional
+
+from domain.tracing import Span, SpanExporter
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+# Exportadores vivos: el hilo escritor no sobrevive al fork (servidores
+# pre-fork). Un único hook los reinicia todos (os.register_at_fork no permite
+# retirar hooks, así que uno por instancia las mantendría vivas)
+_exporters: 'weakref.WeakSet[BatchSpanExporter]' = weakref.WeakSet()
+
+
+def _restart_exporters_after_fork() -> None:
+    for exporter in list(_exporters):
+        exporter._after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_exporters_after_fork)
+
+
+class BatchSpanExporter(SpanExporter):
+    """
+    Base de los exportadores: cola acotada + hilo escritor por lotes.
+    Las subclases implementan write(batch).
+    """
+
+    def __init__(self, max_queue: int = 10000, batch_size: int = 256, flush_interval: float = 1.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.max_queue = max_queue
+        self._closed = False
+        self._start()
+        _exporters.add(self)
+
+    def _after_fork(self) -> None:
+        if not self._closed:
+            self._start()
+
+    def _start(self) -> None:
+        self._queue: 'queue.Queue[Any]' = queue.Queue(maxsize=self.max_queue)
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span.to_dict())
+        except queue.Full:
+            self.dropped += 1
+
+    @abstractmethod
+    def write(self, batch: List[Dict[str, Any]]) -> None:
+        pass
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[Dict[str, Any]] = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self.write(batch)
+                except Exception as e:
+                    logger.warning(f"No se pudieron exportar {len(batch)} spans: {str(e)}")
+
+    def shutdown(self) -> None:
+        """Exporta los spans pendientes y detiene el hilo"""
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+
+class JsonlFileExporter(BatchSpanExporter):
+    """Añade cada span como una línea JSON al archivo indicado"""
+
+    def __init__(self, path: str, **kwargs):
+        self.path = path
+        super().__init__(**kwargs)
+
+    def write(self, batch: List[Dict[str, Any]]) -> None:
+        with open(self.path, 'a', encoding='utf-8') as output:
+            output.write(''.join(json.dumps(item) + '\n' for item in batch))
+
+
+class HTTPCollectorExporter(BatchSpanExporter):
+    """Envía los lotes al colector como POST {"spans": [...]} en JSON"""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0,
+                 headers: Optional[Dict[str, str]] = None, **kwargs):
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.headers = {'Content-Type': 'application/json', **(headers or {})}
+        super().__init__(**kwargs)
+
+    def write(self, batch: List[Dict[str, Any]]) -> None:
+        body = json.dumps({'spans': batch}).encode('utf-8')
+        http_request = urllib.request.Request(self.endpoint, data=body, headers=self.headers, method='POST')
+        with urllib.request.urlopen(http_request, timeout=self.timeout) as response:
+            response.read()
+
+
+class InMemoryExporter(SpanExporter):
+    """Conserva los spans en memoria (tests y diagnóstico)"""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans = []
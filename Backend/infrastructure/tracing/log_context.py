@@ -0,0 +1,24 @@
+"""
+Infrastructure Layer - IDs de traza en los logs
+Filtro de logging que agrega trace_id y span_id a cada registro
+"""
+import logging
+
+from domain.tracing import tracer
+
+# Formato de log con el ID de traza (requiere TraceContextFilter en el handler)
+TRACE_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(trace_id)s] %(message)s'
+
+
+class TraceContextFilter(logging.Filter):
+    """
+    Agrega record.trace_id y record.span_id ('-' fuera de una traza).
+    Debe instalarse en el handler que recibe el registro en el hilo de la
+    petición (p.ej. el QueueHandler), donde el span actual es accesible.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        current = tracer.current_span()
+        record.trace_id = current.trace_id if current is not None else '-'
+        record.span_id = current.span_id if current is not None else '-'
+        return True
@@ -14,6 +14,9 @@ setup(
         'requests>=2.31.0',
         'pydantic>=2.0.0',
     ],
+    extras_require={
+        'msgpack': ['msgpack>=1.0.0'],
+    },
     python_requires='>=3.8',
     author='Universidad Popular del Cesar',
     description='API Multi-Cloud VM Provisioning with Factory Method Pattern',
@@ -12,6 +12,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from domain.entities import MachineVirtual, VMStatus, ProvisioningResult
 from application.factory import VMProviderFactory, VMProvisioningService
 from infrastructure.providers import AWS, Azure, Google, OnPremise
+from domain.registry import provider_registry
 
 
 class TestDomainEntities(unittest.TestCase):
@@ -57,6 +58,325 @@ class TestDomainEntities(unittest.TestCase):
         self.assertIn('success', result_dict)
 
 
+class TestCachedSerialization(unittest.TestCase):
+    """Tests para la caché de to_dict() de las entidades"""
+
+    def setUp(self):
+        self.vm = AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar()
+
+    def test_repeated_calls_reuse_serialized_form(self):
+        """Test que sin cambios se reutiliza la misma forma serializada"""
+        from unittest.mock import patch
+
+        self.vm.to_dict()
+        with patch.object(type(self.vm), '_serialize') as serialize:
+            self.assertEqual(self.vm.to_dict()['vmId'], self.vm.vmId)
+        serialize.assert_not_called()
+
+    def test_caller_changes_do_not_touch_cache(self):
+        """Test que modificar el diccionario retornado no altera la caché"""
+        data = self.vm.to_dict()
+        data['status'] = 'modificado'
+        data.pop('vmId')
+
+        self.assertEqual(self.vm.to_dict()['status'], self.vm.status.value)
+        self.assertEqual(self.vm.to_dict()['vmId'], self.vm.vmId)
+
+    def test_serialize_is_abstract(self):
+        """Test que una entidad sin _serialize no puede instanciarse"""
+        from domain.entities import CachedSerialization
+
+        with self.assertRaises(TypeError):
+            CachedSerialization()
+
+    def test_field_change_invalidates(self):
+        """Test que un cambio de estado regenera el diccionario"""
+        self.vm.to_dict()
+        self.vm.status = VMStatus.STOPPED
+
+        self.assertEqual(self.vm.to_dict()['status'], 'stopped')
+
+    def test_nested_changes_invalidate(self):
+        """Test que los cambios en red y discos invalidan la VM"""
+        from domain.entities import StorageDisk
+
+        self.vm.to_dict()
+        self.vm.network.publicIP = False
+        self.assertFalse(self.vm.to_dict()['network']['publicIP'])
+
+        self.vm.attach_disk(StorageDisk('vol-2', 'extra', 100, 'gp3', 'aws', 'us-east-1'))
+        self.assertEqual(len(self.vm.to_dict()['disks']), 2)
+
+        self.vm.disks[1].size_gb = 200
+        self.assertEqual(self.vm.to_dict()['disks'][1]['size_gb'], 200)
+
+    def test_invalidate_after_in_place_mutation(self):
+        """Test que invalidate() refleja mutaciones en sitio de listas"""
+        self.vm.network.firewallRules = ['HTTP']
+        self.vm.to_dict()
+        self.vm.network.firewallRules.append('SSH')
+        self.vm.network.invalidate()
+
+        self.assertEqual(self.vm.to_dict()['network']['firewallRules'], ['HTTP', 'SSH'])
+
+
+class TestCompactEntities(unittest.TestCase):
+    """Tests para las variantes compactas (__slots__) de las entidades"""
+
+    def setUp(self):
+        self.vm = AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar()
+
+    def test_compact_has_no_instance_dict(self):
+        """Test que las variantes compactas no tienen __dict__ por instancia"""
+        from domain.compact import to_compact
+
+        compact = to_compact(self.vm)
+
+        self.assertFalse(hasattr(compact, '__dict__'))
+        self.assertFalse(hasattr(compact.network, '__dict__'))
+        self.assertEqual(compact.to_dict(), self.vm.to_dict())
+        self.assertTrue(compact.is_active())
+
+    def test_frozen_variant_is_immutable_and_hashable(self):
+        """Test que la variante frozen es inmutable y hashable"""
+        from dataclasses import FrozenInstanceError
+        from domain.compact import to_compact
+
+        frozen = to_compact(self.vm, frozen=True)
+
+        with self.assertRaises(FrozenInstanceError):
+            frozen.name = 'otro'
+        self.assertIsInstance(hash(frozen), int)
+
+    def test_frozen_variant_with_labels_is_hashable(self):
+        """Test que una VM con etiquetas sigue siendo hashable y conserva sus etiquetas"""
+        from domain.compact import to_compact, from_compact
+
+        self.vm.labels = {'team': 'pagos', 'env': 'prod'}
+        frozen = to_compact(self.vm, frozen=True)
+
+        self.assertEqual(hash(frozen), hash(to_compact(self.vm, frozen=True)))
+        self.assertEqual(frozen.to_dict()['labels'], self.vm.labels)
+        self.assertEqual(from_compact(frozen).labels, self.vm.labels)
+        self.assertIs(to_compact(self.vm).labels['env'], sys.intern('prod'))
+
+    def test_strings_are_interned(self):
+        """Test que proveedor y región se internan"""
+        from domain.compact import to_compact
+
+        region = ''.join(['us-', 'east-1'])
+        self.vm.network.region = region
+        compact = to_compact(self.vm)
+
+        self.assertIs(compact.network.region, sys.intern('us-east-1'))
+
+    def test_round_trip(self):
+        """Test conversión ida y vuelta a la entidad original"""
+        from domain.compact import to_compact, from_compact
+
+        self.assertEqual(from_compact(to_compact(self.vm, frozen=True)), self.vm)
+
+
+class TestIdGenerator(unittest.TestCase):
+    """Tests para el generador de IDs ordenables por tiempo"""
+
+    def setUp(self):
+        from domain.ids import IdGenerator
+        self.generator = IdGenerator()
+
+    def test_ids_are_unique_and_sorted(self):
+        """Test que los IDs son únicos y monotónicos en orden de creación"""
+        ids = [self.generator.new_id('aws') for _ in range(2000)]
+
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(ids, sorted(ids))
+
+    def test_unique_across_threads(self):
+        """Test que no hay colisiones con varios hilos"""
+        import threading
+
+        ids = []
+        def worker():
+            ids.extend(self.generator.generate() for _ in range(500))
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(ids)), 2000)
+
+    def test_prefixes(self):
+        """Test que se conservan los prefijos por proveedor y son configurables"""
+        self.assertTrue(self.generator.new_id('aws', 'disk').startswith('vol-'))
+        self.assertTrue(self.generator.new_id('google').startswith('gcp-'))
+        self.assertTrue(self.generator.new_id('onpremise', 'disk', 'pool1').startswith('disk-pool1-'))
+
+        self.generator.set_prefix('aws', 'vm', 'i')
+
+        self.assertTrue(self.generator.new_id('aws').startswith('i-'))
+
+    def test_timestamp_of(self):
+        """Test que la fecha de creación se recupera del ID"""
+        from datetime import datetime
+
+        before = datetime.now().timestamp()
+        vm_id = self.generator.new_id('azure')
+
+        self.assertAlmostEqual(self.generator.timestamp_of(vm_id).timestamp(), before, delta=1)
+        with self.assertRaises(ValueError):
+            self.generator.timestamp_of('aws-123')
+
+    def test_fork_hook_does_not_keep_generators_alive(self):
+        """Test que los generadores se reinician tras fork sin quedar retenidos"""
+        import gc
+        import weakref
+        from domain import ids
+
+        self.generator.generate()
+        ids._reset_generators_after_fork()
+        self.assertEqual(self.generator._last_ms, -1)
+
+        reference = weakref.ref(ids.IdGenerator())
+        gc.collect()
+        self.assertIsNone(reference())
+
+
+class TestTracing(unittest.TestCase):
+    """Tests para los spans de traza"""
+
+    def setUp(self):
+        from domain.tracing import Tracer, SpanExporter
+
+        class Collector(SpanExporter):
+            def __init__(self):
+                self.spans = []
+
+            def export(self, span):
+                self.spans.append(span)
+
+        self.tracer = Tracer()
+        self.collector = Collector()
+
+    def test_disabled_tracer_is_noop(self):
+        """Test que sin exportadores no se crean spans"""
+        from domain.tracing import NOOP_SPAN
+
+        with self.tracer.span('nada') as span:
+            span.set_attribute('clave', 1)
+        self.assertIs(span, NOOP_SPAN)
+        self.assertIsNone(self.tracer.current_span())
+
+    def test_nested_spans_share_trace(self):
+        """Test que los spans hijos heredan la traza y apuntan a su padre"""
+        self.tracer.add_exporter(self.collector)
+        with self.tracer.span('raiz') as root:
+            with self.tracer.span('hijo') as child:
+                self.assertIs(self.tracer.current_span(), child)
+        spans = {span.name: span for span in self.collector.spans}
+
+        self.assertEqual([span.name for span in self.collector.spans], ['hijo', 'raiz'])
+        self.assertEqual(spans['hijo'].trace_id, root.trace_id)
+        self.assertEqual(spans['hijo'].parent_id, root.span_id)
+        self.assertIsNone(spans['raiz'].parent_id)
+        self.assertGreaterEqual(spans['raiz'].duration_ms, spans['hijo'].duration_ms)
+        self.assertIsNone(self.tracer.current_span())
+
+    def test_error_status(self):
+        """Test que una excepción marca el span como error"""
+        self.tracer.add_exporter(self.collector)
+        with self.assertRaises(ValueError):
+            with self.tracer.span('falla'):
+                raise ValueError('boom')
+
+        self.assertEqual(self.collector.spans[0].status, 'error')
+        self.assertIn('boom', self.collector.spans[0].error)
+
+    def test_remote_parent(self):
+        """Test que un traceparent válido continúa la traza del cliente"""
+        from domain.tracing import parse_traceparent
+
+        parent = parse_traceparent('00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01')
+        self.assertEqual(parent, ('0af7651916cd43dd8448eb211c80319c', 'b7ad6b7169203331'))
+        self.assertIsNone(parse_traceparent('basura'))
+
+        self.tracer.add_exporter(self.collector)
+        span, token = self.tracer.start_span('peticion', parent)
+        self.tracer.end_span(span, token)
+
+        self.assertEqual(self.collector.spans[0].trace_id, parent[0])
+        self.assertEqual(self.collector.spans[0].parent_id, parent[1])
+
+
+class TestFleet(unittest.TestCase):
+    """Tests para la flota columnar"""
+
+    def setUp(self):
+        from domain.fleet import Fleet
+
+        self.vms = [
+            AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar(),
+            AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar(),
+            Azure({'type': 'Standard_B1s', 'resource_group': 'test-rg'}).provisionar()
+        ]
+        self.fleet = Fleet(self.vms)
+
+    def test_round_trip(self):
+        """Test que las entidades se reconstruyen desde las columnas"""
+        self.assertEqual(len(self.fleet), 3)
+        for position, vm in enumerate(self.vms):
+            self.assertEqual(self.fleet[position].to_dict(), vm.to_dict())
+        self.assertEqual(self.fleet.position(self.vms[2].vmId), 2)
+
+    def test_round_trip_keeps_ttl_and_labels(self):
+        """Test que expiresAt y las etiquetas sobreviven a la reconstrucción"""
+        from datetime import timedelta
+        from domain.fleet import Fleet
+
+        vm = AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar()
+        vm.expiresAt = vm.createdAt + timedelta(hours=1)
+        vm.labels = {'env': 'prod', 'team': 'core'}
+
+        rebuilt = Fleet([vm])[0]
+
+        self.assertEqual(rebuilt.expiresAt, vm.expiresAt)
+        self.assertEqual(rebuilt.labels, vm.labels)
+        self.assertIsNone(self.fleet[0].expiresAt)
+
+    def test_where_and_set_status(self):
+        """Test filtros por columnas categóricas"""
+        self.assertEqual(self.fleet.where(provider='aws'), [0, 1])
+        self.assertEqual(self.fleet.where(provider='gcp'), [])
+
+        self.fleet.set_status(1, VMStatus.STOPPED)
+
+        self.assertEqual(self.fleet.where(provider='aws', status=VMStatus.RUNNING), [0])
+        with self.assertRaises(ValueError):
+            self.fleet.where(vcpus=2)
+
+    def test_aggregates(self):
+        """Test sumas y conteos agrupados"""
+        expected = {}
+        for vm in self.vms:
+            expected[vm.provider] = expected.get(vm.provider, 0) + vm.vcpus
+
+        self.assertEqual(self.fleet.sum_by('vcpus', 'provider'), expected)
+        self.assertEqual(self.fleet.count_by('provider'), {'aws': 2, 'azure': 1})
+        self.assertEqual(self.fleet.total('vcpus'), sum(vm.vcpus for vm in self.vms))
+        self.assertEqual(self.fleet.total('memoryGB', [2]), self.vms[2].memoryGB)
+
+    def test_pure_python_path_matches(self):
+        """Test que sin numpy los resultados son los mismos"""
+        from unittest.mock import patch
+        import domain.fleet
+
+        with_numpy = (self.fleet.sum_by('memoryGB', 'provider'), self.fleet.where(provider='aws'))
+        with patch.object(domain.fleet, 'numpy', None):
+            without_numpy = (self.fleet.sum_by('memoryGB', 'provider'), self.fleet.where(provider='aws'))
+
+        self.assertEqual(with_numpy, without_numpy)
+
+
 class TestProviders(unittest.TestCase):
     """Tests para los proveedores concretos"""
     
@@ -175,6 +495,22 @@ class TestVMProviderFactory(unittest.TestCase):
         
         self.assertIsNone(provider)
     
+    def test_factory_register_by_import_path(self):
+        """Test registro perezoso de un proveedor por ruta de importación"""
+        VMProviderFactory.register_provider('aws-lazy', 'infrastructure.providers.aws.AWS')
+        self.addCleanup(provider_registry.unregister, 'aws-lazy')
+
+        provider = VMProviderFactory.create_provider('aws-lazy', {'type': 't2.micro'})
+
+        self.assertIsInstance(provider, AWS)
+
+    def test_factory_invalid_import_path(self):
+        """Test Factory retorna None si la ruta de importación no existe"""
+        VMProviderFactory.register_provider('broken', 'infrastructure.providers.missing.Missing')
+        self.addCleanup(provider_registry.unregister, 'broken')
+
+        self.assertIsNone(VMProviderFactory.create_provider('broken', {}))
+
     def test_factory_case_insensitive(self):
         """Test Factory es case-insensitive"""
         config = {'type': 't2.micro'}
@@ -199,6 +535,45 @@ class TestVMProviderFactory(unittest.TestCase):
         self.assertGreaterEqual(len(providers), 4)
 
 
+class TestProviderRegistry(unittest.TestCase):
+    """Tests para el registro unificado de proveedores"""
+
+    def test_resolve_aliases_to_same_descriptor(self):
+        """Test que los alias resuelven al descriptor canónico"""
+        self.assertIs(provider_registry.resolve('gcp'), provider_registry.resolve('google'))
+        self.assertIs(provider_registry.resolve(' On-Premise '), provider_registry.resolve('onpremise'))
+        self.assertEqual(provider_registry.canonical('GCP'), 'google')
+        self.assertIsNone(provider_registry.resolve('invalid'))
+
+    def test_descriptor_components(self):
+        """Test que el descriptor agrupa proveedor, builder, validador y catálogo"""
+        from application.schemas import AWSConfig
+        from infrastructure.builders import AWSVMBuilder
+
+        descriptor = provider_registry.resolve('aws')
+
+        self.assertIs(descriptor.provider_class(), AWS)
+        self.assertIs(descriptor.builder_class(), AWSVMBuilder)
+        self.assertIs(descriptor.validator_class(), AWSConfig)
+        self.assertIn('t3.medium', descriptor.catalog)
+
+    def test_register_is_copy_on_write(self):
+        """Test que un registro nuevo no modifica instantáneas ya leídas"""
+        snapshot = provider_registry._state
+        VMProviderFactory.register_provider('cow-test', AWS)
+        self.addCleanup(provider_registry.unregister, 'cow-test')
+
+        self.assertNotIn('cow-test', snapshot[1])
+        self.assertIsNotNone(provider_registry.resolve('cow-test'))
+
+    def test_alias_works_in_every_factory(self):
+        """Test que un mismo alias funciona en provider factory y validación"""
+        from application.schemas import get_validator_for, OnPremiseConfig
+
+        self.assertIsInstance(VMProviderFactory.create_provider('on-premise', {}), OnPremise)
+        self.assertIs(get_validator_for('on-premise'), OnPremiseConfig)
+
+
 class TestVMProvisioningService(unittest.TestCase):
     """Tests para el servicio de aprovisionamiento"""
     
@@ -345,8 +720,14 @@ def run_all_tests():
     
     # Agregar todos los tests
     suite.addTests(loader.loadTestsFromTestCase(TestDomainEntities))
+    suite.addTests(loader.loadTestsFromTestCase(TestCachedSerialization))
+    suite.addTests(loader.loadTestsFromTestCase(TestCompactEntities))
+    suite.addTests(loader.loadTestsFromTestCase(TestIdGenerator))
+    suite.addTests(loader.loadTestsFromTestCase(TestTracing))
+    suite.addTests(loader.loadTestsFromTestCase(TestFleet))
     suite.addTests(loader.loadTestsFromTestCase(TestProviders))
     suite.addTests(loader.loadTestsFromTestCase(TestVMProviderFactory))
+    suite.addTests(loader.loadTestsFromTestCase(TestProviderRegistry))
     suite.addTests(loader.loadTestsFromTestCase(TestVMProvisioningService))
     suite.addTests(loader.loadTestsFromTestCase(TestSOLIDPrinciples))
     
@@ -2,6 +2,8 @@
 Tests de Integración para Endpoints HTTP de la API
 Prueba los endpoints REST directamente
 """
+import contextlib
+import io
 import unittest
 import json
 import sys
@@ -11,6 +13,11 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from api.main import app
+from api.startup_profiler import StartupProfiler, profiling_requested
+from api.serialization import msgpack_available
+from api.logging_config import AsyncLogging
+from domain.tracing import tracer
+from infrastructure.tracing import InMemoryExporter, JsonlFileExporter, TraceContextFilter
 
 
 class TestAPIEndpoints(unittest.TestCase):
@@ -341,6 +348,355 @@ class TestAPIResponseFormat(unittest.TestCase):
         self.assertIsInstance(data['count'], int)
 
 
+class TestStartupProfiler(unittest.TestCase):
+    """Tests para el perfilado de arranque"""
+
+    def test_disabled_profiler_records_nothing(self):
+        """Test: sin activar, stage() no registra etapas"""
+        profiler = StartupProfiler()
+        with profiler.stage('service: test'):
+            pass
+        self.assertEqual(profiler.to_dict()['stages'], [])
+
+    def test_import_hook_records_new_modules(self):
+        """Test: el hook registra los módulos importados por primera vez"""
+        sys.modules.pop('colorsys', None)
+        profiler = StartupProfiler()
+        profiler.install()
+        try:
+            __import__('colorsys')
+        finally:
+            profiler.uninstall()
+
+        modules = [entry['module'] for entry in profiler.to_dict()['imports']]
+        self.assertIn('colorsys', modules)
+
+    def test_report_sorted_by_time(self):
+        """Test: las etapas se reportan de mayor a menor duración"""
+        profiler = StartupProfiler()
+        profiler.enabled = True
+        profiler.record('rapida', 0.001)
+        profiler.record('lenta', 0.5)
+
+        stages = profiler.to_dict()['stages']
+        self.assertEqual([stage['name'] for stage in stages], ['lenta', 'rapida'])
+        self.assertIn('lenta', profiler.report())
+
+    def test_profiling_requested_by_cli_flag(self):
+        """Test: la opción --profile-startup activa el perfilado"""
+        self.assertTrue(profiling_requested(['main.py', '--profile-startup']))
+
+    def test_warm_up_does_not_touch_live_inventory(self):
+        """Test: las VMs del calentamiento no llegan al inventario real"""
+        from api import main
+
+        before = len(main.vm_inventory)
+        with contextlib.redirect_stdout(io.StringIO()):
+            main._run_startup_profile()
+
+        self.assertEqual(len(main.vm_inventory), before)
+        self.assertIs(main.provisioning_service.inventory, main.vm_inventory)
+
+
+class TestRequestSummary(unittest.TestCase):
+    """Tests para el registro resumen por petición"""
+
+    def setUp(self):
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+
+    def test_one_summary_per_build(self):
+        """Test: una construcción emite un único registro con etapas y resultado"""
+        with self.assertLogs('api.requests', level='INFO') as logs:
+            response = self.client.post('/api/vm/build/standard', json={
+                'provider': 'aws', 'name': 'resumen', 'location': 'us-east-1'
+            })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(logs.records), 1)
+        summary = logs.records[0].request_summary
+        self.assertEqual(summary['provider'], 'aws')
+        self.assertEqual(summary['preset'], 'standard')
+        self.assertEqual(summary['outcome'], 'success')
+        self.assertEqual(summary['vm_id'], json.loads(response.data)['vm_id'])
+        self.assertTrue({'factory', 'build', 'serialize'} <= set(summary['stages']))
+        self.assertIn('preset=standard', logs.output[0])
+
+    def test_builder_details_not_logged_at_info(self):
+        """Test: el detalle de los setters del builder solo se registra en DEBUG"""
+        with self.assertNoLogs('infrastructure', level='INFO'):
+            self.client.post('/api/vm/build', json={
+                'provider': 'aws',
+                'build_config': {'name': 'detalle', 'vm_type': 't2.micro', 'disk_gb': 20,
+                                 'location': 'us-east-1'}
+            })
+
+    def test_server_timing_header(self):
+        """Test: la respuesta incluye Server-Timing con las etapas y el total"""
+        response = self.client.post('/api/vm/provision', json={'provider': 'aws', 'config': {'type': 't2.micro'}})
+
+        metrics = [metric.split(';')[0] for metric in response.headers['Server-Timing'].split(', ')]
+        self.assertEqual(metrics, ['validate', 'factory', 'provision', 'register', 'serialize', 'total'])
+        self.assertRegex(response.headers['Server-Timing'], r'total;dur=\d+\.\d{3}$')
+        self.assertEqual(response.headers['Timing-Allow-Origin'], '*')
+
+        response = self.client.get('/api/endpoint-inexistente')
+        self.assertIn('total;dur=', response.headers['Server-Timing'])
+
+    def test_rejected_outcome(self):
+        """Test: los errores de validación se registran como rejected"""
+        with self.assertLogs('api.requests', level='INFO') as logs:
+            self.client.post('/api/vm/build/preset', json={'provider': 'aws', 'preset': 'nope', 'name': 'x'})
+
+        self.assertEqual(logs.records[0].request_summary['outcome'], 'rejected')
+
+
+class TestAsyncLogging(unittest.TestCase):
+    """Tests para el logging en segundo plano"""
+
+    def setUp(self):
+        import io
+        import logging
+
+        self.stream = io.StringIO()
+        handler = logging.StreamHandler(self.stream)
+        handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        self.pipeline = AsyncLogging([handler], queue_size=3)
+        self.logger = logging.getLogger('tests.async_logging')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.addCleanup(setattr, self.logger, 'propagate', True)
+        self.addCleanup(self.pipeline.stop)
+        self.pipeline.install(self.logger)
+
+    def test_records_written_by_listener(self):
+        """Test: los registros se formatean y escriben al vaciar la cola"""
+        self.logger.info("VM %s creada", 'vm-1')
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            self.logger.exception("Fallo")
+        self.pipeline.stop()
+
+        output = self.stream.getvalue()
+        self.assertIn('INFO VM vm-1 creada', output)
+        self.assertIn('ValueError: boom', output)
+
+    def test_full_queue_drops_without_blocking(self):
+        """Test: con la cola llena se descartan registros y se informa"""
+        import time
+
+        self.pipeline.stop()
+        for i in range(5):
+            self.logger.info("mensaje %d", i)
+        self.assertEqual(self.pipeline.dropped, 2)
+
+        self.pipeline.start()
+        while not self.pipeline.handler.queue.empty():
+            time.sleep(0.001)
+        self.logger.info("después")
+        self.pipeline.stop()
+
+        output = self.stream.getvalue()
+        self.assertIn('mensaje 2', output)
+        self.assertNotIn('mensaje 3', output)
+        self.assertIn('2 registros descartados', output)
+
+    def test_fork_hook_does_not_keep_pipelines_alive(self):
+        """Test: el hook de fork reinicia los pipelines sin retenerlos"""
+        import gc
+        import logging
+        import weakref
+        from api import logging_config
+
+        self.assertIn(self.pipeline, logging_config._pipelines)
+        self.pipeline.stop()
+        self.pipeline._started = True  # como si el fork hubiera pillado el pipeline en marcha
+        self.pipeline._after_fork()
+        self.logger.info("tras el fork")
+        self.pipeline.stop()
+        self.assertIn('INFO tras el fork', self.stream.getvalue())
+
+        reference = weakref.ref(AsyncLogging([logging.StreamHandler(io.StringIO())]))
+        gc.collect()
+        self.assertIsNone(reference())
+
+    def test_drop_notice_with_trace_format(self):
+        """Test: el aviso de descartes se formatea con TRACE_LOG_FORMAT"""
+        import logging
+        import time
+        from infrastructure.tracing import TRACE_LOG_FORMAT
+
+        stream = io.StringIO()
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter(TRACE_LOG_FORMAT))
+        pipeline = AsyncLogging([handler], queue_size=2)
+        pipeline.handler.addFilter(TraceContextFilter())
+        self.addCleanup(pipeline.stop)
+        pipeline.install(self.logger)
+
+        pipeline.stop()
+        for i in range(3):
+            self.logger.info("mensaje %d", i)
+        pipeline.start()
+        while not pipeline.handler.queue.empty():
+            time.sleep(0.001)
+        with contextlib.redirect_stderr(io.StringIO()) as errors:
+            self.logger.info("después")
+            pipeline.stop()
+
+        self.assertIn('[-] Logging: 1 registros descartados', stream.getvalue())
+        self.assertIn('[-] después', stream.getvalue())
+        self.assertEqual(errors.getvalue(), '')
+
+
+class TestRequestTracing(unittest.TestCase):
+    """Tests para las trazas de las peticiones"""
+
+    def setUp(self):
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+        self.exporter = InMemoryExporter()
+        tracer.add_exporter(self.exporter)
+        self.addCleanup(tracer.remove_exporter, self.exporter)
+
+    def test_build_spans(self):
+        """Test: una construcción genera spans de parseo, fábrica, setters, build y serialización"""
+        response = self.client.post('/api/vm/build', json={
+            'provider': 'aws',
+            'build_config': {'name': 'trazada', 'vm_type': 't2.micro', 'disk_gb': 20, 'location': 'us-east-1'}
+        })
+
+        self.assertEqual(response.status_code, 200)
+        names = [span.name for span in self.exporter.spans]
+        for expected in ('parse_request', 'create_builder', 'AWSVMBuilder.set_storage',
+                         'AWSVMBuilder.build', 'serialize', 'POST /api/vm/build'):
+            self.assertIn(expected, names)
+        self.assertEqual({span.trace_id for span in self.exporter.spans}, {response.headers['X-Trace-Id']})
+
+    def test_provision_spans_continue_client_trace(self):
+        """Test: provisionar traza red, disco y VM dentro de la traza del cliente"""
+        trace_id = '0af7651916cd43dd8448eb211c80319c'
+        self.client.post('/api/vm/provision', json={'provider': 'aws', 'config': {'type': 't2.micro'}},
+                         headers={'traceparent': f'00-{trace_id}-b7ad6b7169203331-01'})
+
+        spans = {span.name: span for span in self.exporter.spans}
+        for expected in ('get_validated_provider', 'create_provider', 'provisionar.network',
+                         'provisionar.disk', 'provisionar.vm'):
+            self.assertIn(expected, spans)
+        self.assertEqual(spans['provisionar.vm'].parent_id, spans['provisionar'].span_id)
+        self.assertEqual(spans['POST /api/vm/provision'].trace_id, trace_id)
+        self.assertEqual(spans['POST /api/vm/provision'].parent_id, 'b7ad6b7169203331')
+
+    def test_trace_id_in_logs(self):
+        """Test: el filtro agrega el ID de traza a los registros"""
+        import logging
+
+        record = logging.LogRecord('x', logging.INFO, __file__, 0, 'mensaje', None, None)
+        with tracer.span('operacion') as span:
+            TraceContextFilter().filter(record)
+        self.assertEqual(record.trace_id, span.trace_id)
+
+    def test_jsonl_exporter(self):
+        """Test: el exportador a archivo escribe una línea JSON por span"""
+        import tempfile
+        import shutil
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        path = os.path.join(directory, 'spans.jsonl')
+        exporter = JsonlFileExporter(path, flush_interval=0.01)
+        tracer.add_exporter(exporter)
+        self.addCleanup(tracer.remove_exporter, exporter)
+
+        with tracer.span('uno'):
+            with tracer.span('dos'):
+                pass
+        exporter.shutdown()
+
+        with open(path, encoding='utf-8') as spans_file:
+            names = [json.loads(line)['name'] for line in spans_file]
+        self.assertEqual(names, ['dos', 'uno'])
+
+    def test_fork_hook_does_not_keep_exporters_alive(self):
+        """Test: el hook de fork reinicia los exportadores sin retenerlos"""
+        import gc
+        import tempfile
+        import shutil
+        import weakref
+        from infrastructure.tracing import exporters
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        exporter = JsonlFileExporter(os.path.join(directory, 'spans.jsonl'), flush_interval=0.01)
+        self.assertIn(exporter, exporters._exporters)
+        exporter.shutdown()
+
+        reference = weakref.ref(exporter)
+        del exporter
+        gc.collect()
+        self.assertIsNone(reference())
+
+
+@unittest.skipUnless(msgpack_available(), "msgpack no instalado")
+class TestMessagePackNegotiation(unittest.TestCase):
+    """Tests para la negociación de contenido JSON / MessagePack"""
+
+    @classmethod
+    def setUpClass(cls):
+        import msgpack
+        cls.msgpack = msgpack
+        app.config['TESTING'] = True
+        cls.client = app.test_client()
+
+    def test_json_is_default(self):
+        """Test: sin Accept explícito se responde JSON"""
+        response = self.client.get('/api/providers')
+
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertIn('Accept', response.headers.get('Vary', ''))
+
+    def test_msgpack_response_with_epoch_dates(self):
+        """Test: Accept: application/msgpack devuelve MessagePack con fechas epoch"""
+        response = self.client.post(
+            '/api/vm/provision',
+            json={'provider': 'aws', 'config': {'type': 't2.micro'}},
+            headers={'Accept': 'application/msgpack'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/msgpack')
+        data = self.msgpack.unpackb(response.data, raw=False)
+        self.assertTrue(data['success'])
+        self.assertIsInstance(data['vm_details']['createdAt'], int)
+
+    def test_pack_uses_entity_datetimes(self):
+        """Test: to_dict() da fechas ISO simples y MessagePack las codifica como epoch"""
+        from datetime import datetime, timedelta
+        from api.serialization import pack
+        from infrastructure.providers import AWS
+
+        vm = AWS({'type': 't2.micro'}).provisionar()
+        vm.expiresAt = datetime(2030, 1, 1) + timedelta(seconds=1)
+
+        data = self.msgpack.unpackb(pack({'vms': (vm.to_dict(),)}), raw=False)
+
+        self.assertEqual(data['vms'][0]['expiresAt'], int(vm.expiresAt.timestamp()))
+        self.assertEqual(data['vms'][0]['status'], vm.status.value)
+        self.assertIs(type(vm.to_dict()['expiresAt']), str)
+        self.assertEqual(vm.to_dict()['expiresAt'], vm.expiresAt.isoformat())
+        self.assertIs(type(vm.to_dict()['createdAt']), str)
+
+    def test_msgpack_request_body(self):
+        """Test: el cuerpo de la petición puede enviarse en MessagePack"""
+        body = self.msgpack.packb({'provider': 'google', 'config': {'type': 'n1-standard-1'}})
+        response = self.client.post('/api/vm/provision', data=body,
+                                    content_type='application/msgpack')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(json.loads(response.data)['success'])
+
+
 def run_api_tests():
     """Ejecuta todos los tests de API"""
     loader = unittest.TestLoader()
@@ -349,6 +705,11 @@ def run_api_tests():
     # Agregar tests
     suite.addTests(loader.loadTestsFromTestCase(TestAPIEndpoints))
     suite.addTests(loader.loadTestsFromTestCase(TestAPIResponseFormat))
+    suite.addTests(loader.loadTestsFromTestCase(TestStartupProfiler))
+    suite.addTests(loader.loadTestsFromTestCase(TestRequestSummary))
+    suite.addTests(loader.loadTestsFromTestCase(TestAsyncLogging))
+    suite.addTests(loader.loadTestsFromTestCase(TestRequestTracing))
+    suite.addTests(loader.loadTestsFromTestCase(TestMessagePackNegotiation))
     
     # Ejecutar tests
     runner = unittest.TextTestRunner(verbosity=2)
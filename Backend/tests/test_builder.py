@@ -9,7 +9,7 @@ import os
 # Agregar el directorio raíz al path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from domain.builder import VMBuilder, VMDirector
+from domain.builder import VMBuilder, VMDirector, VMBuildPlanCache
 from domain.entities import MachineVirtual, VMStatus
 from infrastructure.builders import AWSVMBuilder, AzureVMBuilder, GoogleVMBuilder, OnPremiseVMBuilder
 from application.factory import VMBuilderFactory, VMBuildingService
@@ -212,6 +212,63 @@ class TestVMDirector(unittest.TestCase):
             self.assertEqual(vm.provider, expected_provider)
 
 
+class TestCompiledBuildPlans(unittest.TestCase):
+    """Tests para los planes compilados del Director"""
+
+    @staticmethod
+    def _comparable(vm):
+        data = vm.to_dict()
+        for key in ('vmId', 'createdAt'):
+            data.pop(key)
+        data['network'].pop('networkId')
+        for disk in data['disks']:
+            disk.pop('diskId')
+        return data
+
+    def test_compiled_matches_step_by_step(self):
+        """Test que el plan compilado produce la misma VM que la cadena de setters"""
+        presets = ['standard', 'memory-optimized', 'disk-optimized']
+        for builder_class in (AWSVMBuilder, AzureVMBuilder, GoogleVMBuilder, OnPremiseVMBuilder):
+            for preset in presets:
+                method = f"build_{preset.replace('-', '_')}_vm"
+                classic = getattr(VMDirector(builder_class()), method)("vm-a", "region-1")
+                compiled = getattr(VMDirector(builder_class(), plan_cache=VMBuildPlanCache()), method)("vm-a", "region-1")
+
+                self.assertEqual(self._comparable(classic), self._comparable(compiled),
+                                 f"{builder_class.__name__} / {preset}")
+
+    def test_plan_compiled_once_and_fresh_ids(self):
+        """Test que el plan se compila una vez y cada VM recibe IDs nuevos"""
+        cache = VMBuildPlanCache()
+        director = VMDirector(AWSVMBuilder(), plan_cache=cache)
+
+        vm1 = director.build_standard_vm("vm-1", "us-east-1")
+        vm2 = director.build_standard_vm("vm-2", "us-west-2")
+
+        self.assertEqual(len(cache), 1)
+        self.assertNotEqual(vm1.vmId, vm2.vmId)
+        self.assertNotEqual(vm1.network.networkId, vm2.network.networkId)
+        self.assertEqual(vm2.name, "vm-2")
+        self.assertEqual(vm2.network.region, "us-west-2")
+
+    def test_plan_is_not_shared_with_vms(self):
+        """Test que modificar una VM no altera la plantilla compilada"""
+        director = VMDirector(AzureVMBuilder(), plan_cache=VMBuildPlanCache())
+
+        vm1 = director.build_standard_vm("vm-1", "eastus")
+        vm1.network.firewallRules.append("RDP")
+        vm2 = director.build_standard_vm("vm-2", "eastus")
+
+        self.assertEqual(vm2.network.firewallRules, ["HTTP", "HTTPS"])
+
+    def test_plan_rejects_other_builder(self):
+        """Test que un plan no se aplica sobre otro tipo de builder"""
+        plan = VMDirector(AWSVMBuilder()).compile_plan('standard')
+
+        with self.assertRaises(ValueError):
+            VMDirector(AzureVMBuilder()).build_from_plan(plan, "vm", "eastus")
+
+
 class TestVMBuilderFactory(unittest.TestCase):
     """Tests para el VMBuilderFactory"""
 
@@ -423,6 +480,7 @@ def run_builder_tests():
     # Agregar tests
     suite.addTests(loader.loadTestsFromTestCase(TestVMBuilders))
     suite.addTests(loader.loadTestsFromTestCase(TestVMDirector))
+    suite.addTests(loader.loadTestsFromTestCase(TestCompiledBuildPlans))
     suite.addTests(loader.loadTestsFromTestCase(TestVMBuilderFactory))
     suite.addTests(loader.loadTestsFromTestCase(TestVMBuildingService))
     suite.addTests(loader.loadTestsFromTestCase(TestBuilderPattern))
@@ -0,0 +1,122 @@
+"""
+Test Suite para el Catálogo de tipos de instancia
+Tests para los filtros, índices y paginación por cursor de /api/catalog
+"""
+import unittest
+import json
+import sys
+import os
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from application.catalog import InstanceCatalog
+from application.pagination import encode_cursor
+from domain.entities import VMInstanceType
+from api.main import app
+
+
+class TestInstanceCatalog(unittest.TestCase):
+    """Tests para InstanceCatalog"""
+
+    def setUp(self):
+        self.catalog = InstanceCatalog.from_instance_types()
+
+    def test_catalog_contains_all_types(self):
+        """Test que el catálogo incluye todos los tipos de VMInstanceType"""
+        total = (len(VMInstanceType.AWS_TYPES) + len(VMInstanceType.AZURE_TYPES) +
+                 len(VMInstanceType.GCP_TYPES) + len(VMInstanceType.ONPREMISE_TYPES))
+        self.assertEqual(len(self.catalog), total)
+
+    def test_filter_by_provider_alias(self):
+        """Test filtro por proveedor aceptando alias"""
+        page = self.catalog.query(provider='gcp')
+        self.assertEqual(len(page.items), len(VMInstanceType.GCP_TYPES))
+        self.assertTrue(all(e.provider == 'google' for e in page.items))
+
+    def test_filter_by_family(self):
+        """Test filtro por familia"""
+        page = self.catalog.query(provider='aws', family='memory-optimized')
+        self.assertEqual([e.instance_type for e in page.items],
+                         ['r5.large', 'r5.xlarge', 'r5.2xlarge'])
+
+    def test_family_does_not_depend_on_catalog_order(self):
+        """Test que la familia no depende del orden ni del número de tipos del diccionario"""
+        reordered = dict(reversed(list(VMInstanceType.AWS_TYPES.items())))
+        reordered['x1.custom'] = {'vcpus': 64, 'memoryGB': 1024}
+
+        self.assertEqual(VMInstanceType.get_family(reordered, 'r5.large'), 'memory-optimized')
+        self.assertEqual(VMInstanceType.get_family(reordered, 'c5.2xlarge'), 'disk-optimized')
+        self.assertIsNone(VMInstanceType.get_family(reordered, 'x1.custom'))
+        self.assertIsNone(VMInstanceType.get_family(VMInstanceType.AWS_TYPES, 'D2s_v3'))
+        for types_dict in (VMInstanceType.AWS_TYPES, VMInstanceType.AZURE_TYPES,
+                           VMInstanceType.GCP_TYPES, VMInstanceType.ONPREMISE_TYPES):
+            for family in VMInstanceType.FAMILIES:
+                self.assertEqual(sum(VMInstanceType.get_family(types_dict, name) == family
+                                     for name in types_dict), 3)
+
+    def test_filter_by_ranges(self):
+        """Test filtros de rango de vCPUs y memoria"""
+        page = self.catalog.query(min_vcpus=8, min_memory=32, max_memory=32)
+        self.assertTrue(page.items)
+        for entry in page.items:
+            self.assertGreaterEqual(entry.vcpus, 8)
+            self.assertEqual(entry.memoryGB, 32)
+
+    def test_cursor_pagination_covers_all(self):
+        """Test que la paginación por cursor recorre todo sin duplicados"""
+        seen = []
+        cursor = None
+        while True:
+            page = self.catalog.query(limit=5, cursor=cursor)
+            seen.extend((e.provider, e.instance_type) for e in page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        self.assertEqual(len(seen), len(self.catalog))
+        self.assertEqual(len(set(seen)), len(seen))
+
+    def test_invalid_cursor(self):
+        """Test cursor inválido"""
+        with self.assertRaises(ValueError):
+            self.catalog.query(cursor='no-es-un-cursor')
+
+    def test_cursor_position_out_of_range(self):
+        """Test cursor con posición negativa o booleana"""
+        for position in (-5, True):
+            with self.assertRaises(ValueError):
+                self.catalog.query(cursor=encode_cursor({'pos': position}))
+
+
+class TestCatalogEndpoint(unittest.TestCase):
+    """Tests de integración para GET /api/catalog"""
+
+    @classmethod
+    def setUpClass(cls):
+        app.config['TESTING'] = True
+        cls.client = app.test_client()
+
+    def test_catalog_endpoint_paginated(self):
+        """Test: GET /api/catalog con limit y cursor"""
+        response = self.client.get('/api/catalog?provider=azure&limit=4')
+        self.assertEqual(response.status_code, 200)
+
+        data = json.loads(response.data)
+        self.assertTrue(data['success'])
+        self.assertEqual(data['count'], 4)
+        self.assertIsNotNone(data['next_cursor'])
+
+        response = self.client.get(f"/api/catalog?provider=azure&limit=10&cursor={data['next_cursor']}")
+        data = json.loads(response.data)
+        self.assertEqual(data['count'], 5)
+        self.assertIsNone(data['next_cursor'])
+
+    def test_catalog_endpoint_invalid_param(self):
+        """Test: GET /api/catalog con parámetro numérico inválido"""
+        response = self.client.get('/api/catalog?min_vcpus=muchos')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(json.loads(response.data)['success'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,788 @@
+"""
+Test Suite para el Inventario de VMs
+Tests para el registro en memoria, sus índices secundarios y /api/vms
+"""
+import unittest
+import json
+import sys
+import os
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from application.inventory import InventoryEvent, VMInventory
+from application.capacity import CapacityAggregator
+from application.events import EventFeed
+from application.search import NameIndex
+from application.labels import LabelIndex, parse_labels, parse_query
+from application.factory import VMBuildingService, VMProvisioningService
+from domain.entities import VMStatus
+from infrastructure.providers import AWS, Google, OnPremise
+from infrastructure.persistence import InventoryJournal, SharedSQLiteInventory, SQLiteInventoryStore
+from api.main import app, vm_inventory
+
+
+def run_forked(child, timeout: float = 20.0):
+    """
+    Ejecuta child() en un proceso hijo (como un worker de gunicorn --preload).
+    Retorna el código de salida (0 si child() retorna True) o None si el
+    hijo no terminó a tiempo (se mata: un hijo bloqueado no cuelga la suite).
+    """
+    import faulthandler
+    import signal
+    import time
+
+    pid = os.fork()
+    if pid == 0:
+        faulthandler.dump_traceback_later(timeout, exit=True)
+        try:
+            os._exit(0 if child() else 1)
+        except BaseException:
+            os._exit(2)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        finished, status = os.waitpid(pid, os.WNOHANG)
+        if finished:
+            return os.waitstatus_to_exitcode(status)
+        time.sleep(0.01)
+    os.kill(pid, signal.SIGKILL)
+    os.waitpid(pid, 0)
+    return None
+
+
+class TestVMInventory(unittest.TestCase):
+    """Tests para VMInventory"""
+
+    def setUp(self):
+        self.inventory = VMInventory()
+        self.aws_vm = self.inventory.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar())
+        self.gcp_vm = self.inventory.add(Google({'type': 'n1-standard-1', 'zone': 'us-central1-a'}).provisionar())
+        self.onprem_vm = self.inventory.add(OnPremise({'cpu': 2, 'ram': 4, 'disk': 50}).provisionar())
+
+    def test_lookup_by_id(self):
+        """Test búsqueda O(1) por vmId"""
+        self.assertIs(self.inventory.get(self.aws_vm.vmId), self.aws_vm)
+        self.assertIn(self.gcp_vm.vmId, self.inventory)
+        self.assertIsNone(self.inventory.get('no-existe'))
+        self.assertEqual(len(self.inventory), 3)
+
+    def test_find_by_provider_alias(self):
+        """Test que los proveedores se indexan por su clave canónica"""
+        self.assertEqual(self.inventory.find(provider='gcp'), [self.gcp_vm])
+        self.assertEqual(self.inventory.find(provider='onpremise'), [self.onprem_vm])
+
+    def test_find_combines_filters(self):
+        """Test intersección de índices"""
+        self.assertEqual(self.inventory.find(provider='aws', region='us-east-1', status='running'),
+                         [self.aws_vm])
+        self.assertEqual(self.inventory.find(provider='aws', region='eu-west-1'), [])
+        with self.assertRaises(ValueError):
+            self.inventory.find(status='desconocido')
+
+    def test_set_status_updates_index_and_notifies(self):
+        """Test que set_status reindexa y emite un evento"""
+        events = []
+        self.inventory.add_listener(events.append)
+
+        self.inventory.set_status(self.aws_vm.vmId, VMStatus.STOPPED)
+
+        self.assertEqual(self.inventory.find(status=VMStatus.STOPPED), [self.aws_vm])
+        self.assertNotIn(self.aws_vm, self.inventory.find(status=VMStatus.RUNNING))
+        self.assertEqual(events[0].kind, InventoryEvent.STATUS_CHANGED)
+        self.assertEqual(events[0].previous_status, VMStatus.RUNNING)
+
+    def test_remove(self):
+        """Test eliminación de VMs"""
+        self.inventory.remove(self.aws_vm.vmId)
+
+        self.assertIsNone(self.inventory.get(self.aws_vm.vmId))
+        self.assertEqual(self.inventory.find(provider='aws'), [])
+        self.assertNotIn('aws', self.inventory.count_by('provider'))
+
+    def test_crafted_cursor_positions_are_rejected(self):
+        """Test que un cursor con created no numérico o no finito se rechaza"""
+        from application.pagination import encode_cursor
+
+        for created in (True, float('nan'), float('inf'), '1700000000', None):
+            with self.assertRaisesRegex(ValueError, 'Cursor inválido'):
+                self.inventory.page(cursor=encode_cursor({'created': created, 'id': 'aws-x'}))
+        with self.assertRaisesRegex(ValueError, 'Cursor inválido'):
+            self.inventory.page(cursor=encode_cursor({'created': 1.5, 'id': 7}))
+
+    def test_page_is_stable_across_inserts(self):
+        """Test que el cursor no repite ni salta VMs aunque haya altas entre páginas"""
+        first = self.inventory.page(limit=2)
+        self.inventory.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar())
+        second = self.inventory.page(cursor=first.next_cursor, limit=10)
+
+        ids = [vm.vmId for vm in first.items + second.items]
+        self.assertEqual(ids, [vm.vmId for vm in self.inventory.find()])
+        self.assertIsNone(second.next_cursor)
+
+    def test_page_with_selective_and_broad_filters(self):
+        """Test que ambas estrategias (candidatos ordenados y recorrido global) coinciden"""
+        for _ in range(20):
+            self.inventory.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar())
+
+        broad = self.inventory.page(provider='aws', limit=100).items
+        selective = self.inventory.page(provider='gcp', limit=100).items
+
+        self.assertEqual(broad, self.inventory.find(provider='aws'))
+        self.assertEqual(selective, [self.gcp_vm])
+
+    def test_invalid_vm_type(self):
+        """Test que vm_type debe ser una familia del catálogo"""
+        with self.assertRaises(ValueError):
+            self.inventory.page(vm_type='gigante')
+
+    def test_services_register_created_vms(self):
+        """Test que los servicios registran las VMs creadas"""
+        inventory = VMInventory()
+        provisioned = VMProvisioningService(inventory=inventory).provision_vm('aws', {'type': 't2.micro'})
+        built = VMBuildingService(inventory=inventory).build_vm_type('azure', 'standard', 'vm-1', 'eastus')
+
+        self.assertIsNotNone(inventory.get(provisioned.vm_id))
+        self.assertIsNotNone(inventory.get(built.vm_id))
+
+
+class TestSQLiteInventoryStore(unittest.TestCase):
+    """Tests para el inventario persistente en SQLite"""
+
+    def setUp(self):
+        import tempfile
+        import shutil
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = os.path.join(directory, 'inventory.db')
+        self.store = SQLiteInventoryStore(self.path, flush_interval=0.01)
+        self.addCleanup(self.store.close)
+        self.inventory = VMInventory()
+        self.store.attach(self.inventory)
+
+    def test_changes_survive_restart(self):
+        """Test que altas, cambios de estado y bajas se recuperan al reabrir"""
+        kept = self.inventory.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar())
+        removed = self.inventory.add(OnPremise({'cpu': 2, 'ram': 4, 'disk': 50}).provisionar())
+        self.inventory.set_status(kept.vmId, VMStatus.STOPPED)
+        self.inventory.remove(removed.vmId)
+        self.store.close()
+
+        reopened = SQLiteInventoryStore(self.path)
+        self.addCleanup(reopened.close)
+        vms = list(reopened.load_all())
+
+        self.assertEqual([vm.vmId for vm in vms], [kept.vmId])
+        self.assertEqual(vms[0].status, VMStatus.STOPPED)
+        self.assertEqual(vms[0].to_dict(), kept.to_dict())
+
+    def test_batched_writes(self):
+        """Test que muchas altas se confirman tras flush()"""
+        for _ in range(300):
+            self.inventory.add(Google({'type': 'n1-standard-1', 'zone': 'us-central1-a'}).provisionar())
+        self.store.flush()
+
+        self.assertEqual(self.store.count(), 300)
+
+    def test_wal_mode_and_children(self):
+        """Test modo WAL y filas de redes y discos"""
+        import sqlite3
+
+        vm = self.inventory.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar())
+        self.store.flush()
+
+        connection = sqlite3.connect(self.path)
+        self.addCleanup(connection.close)
+        self.assertEqual(connection.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+        disk_ids = [row[0] for row in connection.execute('SELECT disk_id FROM disks WHERE vm_id = ?', (vm.vmId,))]
+        self.assertEqual(disk_ids, [disk.diskId for disk in vm.disks])
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "requiere os.fork")
+    def test_writer_restarts_after_fork(self):
+        """Test que un worker creado por fork (gunicorn --preload) tiene su propio hilo escritor"""
+        def child():
+            self.inventory.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar())
+            self.store.flush()
+            return self.store._writer.is_alive() and self.store.count() == 1
+
+        self.assertEqual(run_forked(child), 0)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "requiere os.fork")
+    def test_fork_right_after_opening_store(self):
+        """Test que un fork justo tras abrir el store (o durante una escritura) no bloquea al hijo"""
+        for i in range(10):
+            store = SQLiteInventoryStore(self.path, flush_interval=0.001)
+            self.addCleanup(store.close)
+            self.store.save(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar())
+
+            def child():
+                store.save(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar())
+                store.flush()
+                return True
+
+            self.assertEqual(run_forked(child, timeout=10), 0, f"fork {i}")
+
+
+class TestInventoryJournal(unittest.TestCase):
+    """Tests para el journal append-only con snapshots"""
+
+    def setUp(self):
+        import tempfile
+        import shutil
+
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def _open(self, snapshot_every=1000):
+        journal = InventoryJournal(self.directory, snapshot_every=snapshot_every)
+        self.addCleanup(journal.close)
+        inventory = VMInventory()
+        for vm in journal.recover():
+            inventory.add(vm)
+        journal.attach(inventory)
+        return journal, inventory
+
+    def test_replay_after_restart(self):
+        """Test que el estado se reconstruye reproduciendo los eventos"""
+        journal, inventory = self._open()
+        kept = inventory.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar())
+        removed = inventory.add(Google({'type': 'n1-standard-1', 'zone': 'us-central1-a'}).provisionar())
+        inventory.set_status(kept.vmId, VMStatus.STOPPED)
+        inventory.remove(removed.vmId)
+        journal.close()
+
+        _, recovered = self._open()
+
+        self.assertEqual(len(recovered), 1)
+        self.assertEqual(recovered.get(kept.vmId).to_dict(), kept.to_dict())
+
+    def test_snapshot_compaction_bounds_the_tail(self):
+        """Test que el snapshot vacía el journal y solo se reproduce la cola"""
+        journal, inventory = self._open(snapshot_every=5)
+        vms = [inventory.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar()) for _ in range(7)]
+        journal.close()
+
+        with open(os.path.join(self.directory, 'journal.jsonl')) as handle:
+            self.assertEqual(len(handle.readlines()), 2)
+
+        _, recovered = self._open(snapshot_every=5)
+        self.assertEqual([vm.vmId for vm in recovered.find()], [vm.vmId for vm in vms])
+
+    def test_compaction_runs_off_the_writing_thread(self):
+        """Test que el evento que cruza el umbral no espera a que se escriba el snapshot"""
+        import threading
+        from unittest.mock import patch
+
+        journal, inventory = self._open(snapshot_every=3)
+        release = threading.Event()
+        original = journal._write_snapshot
+
+        def slow_snapshot(vms, seq):
+            release.wait(5)
+            original(vms, seq)
+
+        with patch.object(journal, '_write_snapshot', side_effect=slow_snapshot):
+            vms = [inventory.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar()) for _ in range(4)]
+            self.assertTrue(os.path.exists(os.path.join(self.directory, 'journal.jsonl.1')))
+            release.set()
+            journal.close()
+
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'journal.jsonl.1')))
+        _, recovered = self._open(snapshot_every=3)
+        self.assertEqual([vm.vmId for vm in recovered.find()], [vm.vmId for vm in vms])
+
+    def test_snapshot_matches_the_rotation_point(self):
+        """Test que un cambio durante la compactación no se cuela en el snapshot"""
+        import threading
+        from unittest.mock import patch
+
+        journal, inventory = self._open(snapshot_every=3)
+        release = threading.Event()
+        original = journal._write_snapshot
+
+        def slow_snapshot(vms, seq):
+            release.wait(5)
+            original(vms, seq)
+
+        with patch.object(journal, '_write_snapshot', side_effect=slow_snapshot):
+            vms = [inventory.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar()) for _ in range(3)]
+            inventory.set_status(vms[0].vmId, VMStatus.STOPPED)
+            release.set()
+            journal.wait_for_compaction()
+
+        with open(os.path.join(self.directory, 'snapshot.json')) as handle:
+            snapshot = json.load(handle)
+        self.assertEqual(snapshot['seq'], 3)
+        self.assertEqual([vm['status'] for vm in snapshot['vms']], ['running'] * 3)
+        journal.close()
+        _, recovered = self._open(snapshot_every=3)
+        self.assertEqual(recovered.get(vms[0].vmId).status, VMStatus.STOPPED)
+
+    def test_interrupted_compaction_keeps_rotated_events(self):
+        """Test que si el snapshot no llega a escribirse se reproducen ambos journals"""
+        from unittest.mock import patch
+
+        journal, inventory = self._open(snapshot_every=3)
+        with patch.object(journal, '_write_snapshot', side_effect=OSError("disco lleno")), \
+                self.assertLogs('infrastructure.persistence.journal', level='ERROR'):
+            vms = [inventory.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar()) for _ in range(4)]
+            journal.close()
+
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'snapshot.json')))
+        _, recovered = self._open(snapshot_every=3)
+        self.assertEqual([vm.vmId for vm in recovered.find()], [vm.vmId for vm in vms])
+
+    def test_truncated_last_line_is_ignored(self):
+        """Test que una línea incompleta (caída a mitad de escritura) se ignora"""
+        journal, inventory = self._open()
+        vm = inventory.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar())
+        journal.close()
+        with open(os.path.join(self.directory, 'journal.jsonl'), 'a') as handle:
+            handle.write('{"kind": "deleted", "vm_id": "')
+
+        journal, recovered = self._open()
+        other = recovered.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar())
+        journal.close()
+
+        _, recovered = self._open()
+        self.assertIn(vm.vmId, recovered)
+        self.assertIn(other.vmId, recovered)
+
+
+class TestSharedSQLiteInventory(unittest.TestCase):
+    """Tests para el inventario compartido entre workers"""
+
+    def setUp(self):
+        import tempfile
+        import shutil
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = os.path.join(directory, 'shared.db')
+        self.first, self.first_shared = self._worker()
+        self.second, self.second_shared = self._worker()
+
+    def _worker(self, retain=10000):
+        inventory = VMInventory()
+        shared = SharedSQLiteInventory(self.path, retain=retain)
+        self.addCleanup(shared.close)
+        shared.attach(inventory)
+        return inventory, shared
+
+    def test_changes_visible_after_sync(self):
+        """Test que altas, cambios de estado y bajas de un worker llegan al otro"""
+        kept = self.first.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar())
+        removed = self.first.add(OnPremise({'cpu': 2, 'ram': 4, 'disk': 50}).provisionar())
+        self.assertNotIn(kept.vmId, self.second)
+
+        self.assertEqual(self.second_shared.sync(), 2)
+        self.assertEqual(self.second.get(kept.vmId).to_dict(), kept.to_dict())
+
+        self.first.set_status(kept.vmId, VMStatus.STOPPED)
+        self.first.remove(removed.vmId)
+        self.second_shared.sync()
+
+        self.assertEqual(self.second.get(kept.vmId).status, VMStatus.STOPPED)
+        self.assertNotIn(removed.vmId, self.second)
+        self.assertEqual(self.second.find(status='stopped'), [self.second.get(kept.vmId)])
+        # Los cambios aplicados desde la base no vuelven a publicarse
+        self.assertEqual(self.first_shared.sync(), 0)
+
+    def test_lease_has_single_holder(self):
+        """Test que un lease solo tiene un titular hasta que vence"""
+        class OtherWorker(SharedSQLiteInventory):
+            origin = 'otro-host:1'
+
+        other = OtherWorker(self.path)
+        self.addCleanup(other.close)
+
+        self.assertTrue(self.first_shared.acquire_lease('expiry-reaper', ttl=60))
+        self.assertFalse(other.acquire_lease('expiry-reaper', ttl=60))
+        self.assertTrue(self.first_shared.acquire_lease('expiry-reaper', ttl=-1))
+        self.assertTrue(other.acquire_lease('expiry-reaper', ttl=60))
+        self.assertFalse(self.first_shared.acquire_lease('expiry-reaper', ttl=60))
+
+    def test_last_writer_wins(self):
+        """Test que dos workers que cambian la misma VM convergen al último cambio"""
+        vm = self.first.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar())
+        self.second_shared.sync()
+
+        self.first.set_status(vm.vmId, VMStatus.STOPPED)
+        self.second.set_status(vm.vmId, VMStatus.TERMINATED)
+        self.first_shared.sync()
+        self.second_shared.sync()
+
+        self.assertEqual(self.first.get(vm.vmId).status, VMStatus.TERMINATED)
+        self.assertEqual(self.second.get(vm.vmId).status, VMStatus.TERMINATED)
+
+    def test_failed_write_rolls_back_local_change(self):
+        """Test que si la base compartida falla el cambio local se deshace y la operación falla"""
+        import sqlite3
+
+        vm = self.first.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar())
+        feed = EventFeed()
+        feed.attach(self.first)
+        connection = sqlite3.connect(self.path)
+        connection.execute('DROP TABLE inventory_changes')
+        connection.close()
+
+        with self.assertRaises(sqlite3.Error):
+            self.first.set_status(vm.vmId, VMStatus.STOPPED)
+        with self.assertRaises(sqlite3.Error):
+            self.first.remove(vm.vmId)
+        result = VMProvisioningService(inventory=self.first).provision_vm('aws', {'type': 't2.micro'})
+
+        self.assertFalse(result.success)
+        self.assertEqual(self.first.find(), [vm])
+        self.assertEqual(self.first.find(status='running'), [vm])
+        self.assertEqual(feed.last_id, 0)
+
+    def test_new_worker_loads_state(self):
+        """Test que un worker que arranca después carga el estado común"""
+        vm = self.first.add(Google({'type': 'n1-standard-1', 'zone': 'us-central1-a'}).provisionar())
+        late, _ = self._worker()
+
+        self.assertEqual(late.get(vm.vmId).to_dict(), vm.to_dict())
+
+    def test_reload_after_pruned_changes(self):
+        """Test que un worker rezagado más allá de lo podado recarga el inventario"""
+        import infrastructure.persistence.shared as shared_module
+
+        writer, _ = self._worker(retain=1)
+        original = shared_module.PRUNE_EVERY
+        shared_module.PRUNE_EVERY = 2
+        self.addCleanup(setattr, shared_module, 'PRUNE_EVERY', original)
+        vms = [writer.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar()) for _ in range(4)]
+        writer.remove(vms[0].vmId)
+
+        self.second_shared.sync()
+
+        self.assertEqual(sorted(vm.vmId for vm in self.second.find()), sorted(vm.vmId for vm in vms[1:]))
+
+
+class TestCapacityAggregator(unittest.TestCase):
+    """Tests para los totales de capacidad incrementales"""
+
+    def setUp(self):
+        self.inventory = VMInventory()
+        self.inventory.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar())
+        self.capacity = CapacityAggregator()
+        self.capacity.attach(self.inventory)
+
+    def _recomputed(self, **filters):
+        vms = self.inventory.find(**filters)
+        return {
+            'vms': len(vms),
+            'vcpus': sum(vm.vcpus for vm in vms),
+            'memoryGB': sum(vm.memoryGB for vm in vms),
+            'diskGB': sum(disk.size_gb for vm in vms for disk in vm.disks)
+        }
+
+    def test_totals_follow_inventory_changes(self):
+        """Test que altas, cambios de estado y bajas mantienen los totales"""
+        gcp = self.inventory.add(Google({'type': 'n1-standard-1', 'zone': 'us-central1-a'}).provisionar())
+        onprem = self.inventory.add(OnPremise({'cpu': 4, 'ram': 8, 'disk': 100}).provisionar())
+        self.inventory.set_status(gcp.vmId, VMStatus.STOPPED)
+        self.inventory.remove(onprem.vmId)
+
+        self.assertEqual(self.capacity.summary()['totals'], self._recomputed())
+        self.assertEqual(self.capacity.summary(provider='gcp', status='stopped')['totals'],
+                         self._recomputed(provider='gcp', status='stopped'))
+        self.assertEqual(self.capacity.summary(provider='onpremise')['groups'], [])
+
+    def test_terminated_vms_release_capacity(self):
+        """Test que las VMs terminadas dejan de contar"""
+        vm = self.inventory.find()[0]
+        self.inventory.set_status(vm.vmId, VMStatus.TERMINATED)
+
+        self.assertEqual(self.capacity.summary()['totals']['vms'], 0)
+
+    def test_groups_by_provider_region_status(self):
+        """Test desglose por (proveedor, región, estado)"""
+        groups = self.capacity.summary()['groups']
+
+        self.assertEqual(len(groups), 1)
+        self.assertEqual((groups[0]['provider'], groups[0]['region'], groups[0]['status']),
+                         ('aws', 'us-east-1', 'running'))
+
+
+class TestEventFeed(unittest.TestCase):
+    """Tests para el buffer circular de eventos"""
+
+    def setUp(self):
+        self.inventory = VMInventory()
+        self.feed = EventFeed(capacity=3)
+        self.feed.attach(self.inventory)
+
+    def test_resume_from_last_event_id(self):
+        """Test que se reciben solo los eventos posteriores al último visto"""
+        vm = self.inventory.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar())
+        seen = self.feed.last_id
+        self.inventory.set_status(vm.vmId, VMStatus.STOPPED)
+
+        events, complete = self.feed.since(seen)
+
+        self.assertTrue(complete)
+        self.assertEqual([event.type for event in events], ['vm.status_changed'])
+        self.assertEqual(events[0].data['previous_status'], 'running')
+        self.assertEqual(events[0].data['status'], 'stopped')
+
+    def test_gap_is_reported(self):
+        """Test que un ID fuera del buffer (o de otro arranque) se marca como incompleto"""
+        for _ in range(5):
+            self.inventory.add(Google({'type': 'n1-standard-1', 'zone': 'us-central1-a'}).provisionar())
+
+        events, complete = self.feed.since(1)
+        self.assertFalse(complete)
+        self.assertEqual([event.id for event in events], [3, 4, 5])
+        self.assertFalse(self.feed.since(99)[1])
+
+    def test_ids_from_another_worker_resync(self):
+        """Test que un Last-Event-ID de otra época (otro worker) fuerza un reset"""
+        from application.events import RESYNC
+
+        self.inventory.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar())
+        own_id = self.feed.format_id(self.feed.last_id)
+
+        self.assertEqual(self.feed.parse_id(own_id), self.feed.last_id)
+        self.assertEqual(self.feed.parse_id('otraepoca-1'), RESYNC)
+        self.assertEqual(self.feed.parse_id('1'), RESYNC)
+        events, complete = self.feed.since(self.feed.parse_id('otraepoca-1'))
+        self.assertFalse(complete)
+        self.assertEqual(len(events), 1)
+        with self.assertRaises(ValueError):
+            self.feed.parse_id('sin-numero-x')
+
+    def test_wait_times_out_without_events(self):
+        """Test que wait() retorna vacío al vencer el timeout"""
+        self.assertEqual(self.feed.wait(None, timeout=0.01), ([], True))
+
+
+class TestNameIndex(unittest.TestCase):
+    """Tests para el índice de nombres"""
+
+    def setUp(self):
+        self.inventory = VMInventory()
+        self.index = NameIndex()
+        self.index.attach(self.inventory)
+        self.ids = {}
+        for name in ('web-prod-1', 'web-prod-2', 'api-prod-web', 'db-staging', 'WEB-dev'):
+            vm = AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar()
+            vm.name = name
+            self.ids[name] = self.inventory.add(vm).vmId
+
+    def test_prefix_before_substring(self):
+        """Test que las coincidencias por prefijo van primero, sin distinguir mayúsculas"""
+        names = {vm_id: name for name, vm_id in self.ids.items()}
+        self.assertEqual([names[vm_id] for vm_id in self.index.search('web')],
+                         ['WEB-dev', 'web-prod-1', 'web-prod-2', 'api-prod-web'])
+        self.assertEqual([names[vm_id] for vm_id in self.index.search('prod')],
+                         ['api-prod-web', 'web-prod-1', 'web-prod-2'])
+
+    def test_short_queries_match_prefix_only(self):
+        """Test que consultas de menos de 3 caracteres solo buscan por prefijo"""
+        self.assertEqual(self.index.search('db'), [self.ids['db-staging']])
+        self.assertEqual(self.index.search('ng'), [])
+
+    def test_index_follows_removals(self):
+        """Test que las bajas salen del índice"""
+        self.inventory.remove(self.ids['web-prod-1'])
+        self.assertNotIn(self.ids['web-prod-1'], self.index.search('web-prod'))
+        self.assertEqual(self.index.search('web', limit=2), [self.ids['WEB-dev'], self.ids['web-prod-2']])
+
+
+class TestLabelIndex(unittest.TestCase):
+    """Tests para las etiquetas y sus consultas booleanas"""
+
+    def setUp(self):
+        self.inventory = VMInventory()
+        self.index = LabelIndex()
+        self.index.attach(self.inventory)
+        self.prod_aws = self._add(AWS({'type': 't2.micro', 'region': 'us-east-1'}),
+                                  {'env': 'prod', 'team': 'payments'})
+        self.prod_gcp = self._add(Google({'type': 'n1-standard-1', 'zone': 'us-central1-a'}),
+                                  {'env': 'prod', 'team': 'payments'})
+        self.dev_aws = self._add(AWS({'type': 't2.micro', 'region': 'us-east-1'}), {'env': 'dev'})
+
+    def _add(self, provider, labels):
+        vm = provider.provisionar()
+        vm.labels = labels
+        return self.inventory.add(vm).vmId
+
+    def test_boolean_queries(self):
+        """Test AND, OR, NOT, != y existencia de etiqueta"""
+        self.assertEqual(self.index.query('env=prod AND team=payments AND NOT provider=gcp'),
+                         (1, [self.prod_aws]))
+        self.assertEqual(self.index.query('env=dev OR provider=google')[0], 2)
+        self.assertEqual(self.index.query('team')[1], [self.prod_aws, self.prod_gcp])
+        self.assertEqual(self.index.query('team!=payments')[1], [self.dev_aws])
+        self.assertEqual(self.index.query('env=prod and (provider=aws or provider=gcp)')[0], 2)
+
+    def test_index_follows_status_and_removal(self):
+        """Test que los cambios de estado y las bajas actualizan los bitmaps"""
+        self.inventory.set_status(self.prod_aws, VMStatus.STOPPED)
+        self.inventory.remove(self.dev_aws)
+
+        self.assertEqual(self.index.query('status=stopped')[1], [self.prod_aws])
+        self.assertEqual(self.index.query('NOT status=stopped')[1], [self.prod_gcp])
+        self.assertEqual(self.index.query('env=dev')[0], 0)
+
+    def test_slots_of_removed_vms_are_reused(self):
+        """Test que los slots de las bajas se reutilizan sin arrastrar bits ni alterar el orden de alta"""
+        self.inventory.remove(self.prod_aws)
+        newer = self._add(Google({'type': 'n1-standard-1', 'zone': 'us-central1-a'}), {'env': 'qa'})
+
+        self.assertEqual(len(self.index._ids), 3)
+        self.assertEqual(self.index.query('env=qa'), (1, [newer]))
+        self.assertEqual(self.index.query('team'), (1, [self.prod_gcp]))
+        self.assertEqual(self.index.query('env')[1], [self.prod_gcp, self.dev_aws, newer])
+        self.assertEqual(self.index.query('env', limit=2)[1], [self.prod_gcp, self.dev_aws])
+
+        for _ in range(50):
+            self.inventory.remove(self._add(AWS({'type': 't2.micro', 'region': 'us-east-1'}), {'ttl': 'yes'}))
+        self.assertEqual(len(self.index._ids), 4)
+        self.assertLess(self.index._all.bit_length(), 5)
+
+    def test_invalid_queries_and_labels(self):
+        """Test errores de sintaxis y etiquetas inválidas"""
+        for query in ('', 'env=', 'env=prod AND', '(env=prod', 'env=prod team=x'):
+            with self.assertRaises(ValueError):
+                parse_query(query)
+        # Demasiado anidada o larga: ValueError, no RecursionError
+        for query in ('NOT ' * 5000 + 'env', '(' * 5000 + 'env' + ')' * 5000, ' OR '.join(['env'] * 5000)):
+            with self.assertRaisesRegex(ValueError, 'Consulta inválida'):
+                self.index.query(query)
+        self.assertEqual(self.index.query('NOT ' * 32 + 'env')[0], 3)
+        self.assertEqual(self.index.query(' OR '.join(['env=dev'] * 64))[1], [self.dev_aws])
+        for labels in ({'Env': 'prod'}, {'provider': 'aws'}, {'env': 'a b'}, ['env']):
+            with self.assertRaises(ValueError):
+                parse_labels(labels)
+        self.assertEqual(parse_labels({'build': 42}), {'build': '42'})
+
+
+class TestInventoryEndpoints(unittest.TestCase):
+    """Tests de integración para /api/vms"""
+
+    @classmethod
+    def setUpClass(cls):
+        app.config['TESTING'] = True
+        cls.client = app.test_client()
+
+    def test_created_vm_is_queryable(self):
+        """Test: una VM creada se consulta por ID y aparece en el listado filtrado"""
+        response = self.client.post('/api/vm/build/standard', json={
+            'provider': 'google', 'name': 'inventario-1', 'location': 'us-central1'
+        })
+        vm_id = json.loads(response.data)['vm_id']
+
+        response = self.client.get(f'/api/vms/{vm_id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['vm']['name'], 'inventario-1')
+
+        response = self.client.get('/api/vms?provider=gcp&region=us-central1&limit=200')
+        data = json.loads(response.data)
+        self.assertIn(vm_id, [vm['vmId'] for vm in data['vms']])
+        self.assertEqual(data['count'], len(data['vms']))
+
+    def test_cursor_pagination(self):
+        """Test: recorrer /api/vms por cursor devuelve cada VM una vez en orden estable"""
+        for i in range(5):
+            self.client.post('/api/vm/build/disk-optimized', json={
+                'provider': 'azure', 'name': f'paginada-{i}', 'location': 'westeurope'
+            })
+
+        seen, cursor = [], None
+        while True:
+            url = '/api/vms?provider=azure&vm_type=disk-optimized&limit=2'
+            response = self.client.get(url + (f'&cursor={cursor}' if cursor else ''))
+            self.assertEqual(response.status_code, 200)
+            data = json.loads(response.data)
+            self.assertLessEqual(data['count'], 2)
+            seen.extend(vm['vmId'] for vm in data['vms'])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+
+        expected = [vm.vmId for vm in vm_inventory.find(provider='azure', vm_type='disk-optimized')]
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor_returns_400(self):
+        """Test: cursor malformado"""
+        response = self.client.get('/api/vms?cursor=no-es-un-cursor')
+        self.assertEqual(response.status_code, 400)
+
+    def test_capacity_endpoint(self):
+        """Test: /api/capacity refleja las VMs creadas"""
+        before = json.loads(self.client.get('/api/capacity?provider=aws').data)['totals']
+        self.client.post('/api/vm/provision', json={'provider': 'aws', 'config': {'type': 't2.micro'}})
+
+        response = self.client.get('/api/capacity?provider=aws')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['totals']['vms'], before['vms'] + 1)
+        self.assertEqual(self.client.get('/api/capacity?status=volando').status_code, 400)
+
+    def test_event_stream(self):
+        """Test: /api/events reenvía los eventos posteriores a Last-Event-ID"""
+        from api.main import event_feed
+
+        last_id = event_feed.last_id
+        response = self.client.post('/api/vm/build/standard', json={
+            'provider': 'aws', 'name': 'sse-1', 'location': 'us-east-1'
+        })
+        vm_id = json.loads(response.data)['vm_id']
+
+        response = self.client.get(f'/api/events?vm_id={vm_id}',
+                                   headers={'Last-Event-ID': event_feed.format_id(last_id)})
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        chunks = iter(response.response)
+        self.assertTrue(next(chunks).startswith(b'retry:'))
+        event = next(chunks).decode()
+        response.close()
+
+        self.assertIn('event: vm.created', event)
+        self.assertIn(vm_id, event)
+
+    def test_search_by_name(self):
+        """Test: /api/vms/search encuentra VMs por fragmentos del nombre"""
+        response = self.client.post('/api/vm/build/standard', json={
+            'provider': 'aws', 'name': 'buscador-pagos-7', 'location': 'us-east-1'
+        })
+        vm_id = json.loads(response.data)['vm_id']
+
+        data = json.loads(self.client.get('/api/vms/search?q=PAGOS-7').data)
+        self.assertIn(vm_id, [vm['vmId'] for vm in data['vms']])
+        self.assertEqual(self.client.get('/api/vms/search').status_code, 400)
+
+    def test_labels_at_build_time_and_query(self):
+        """Test: etiquetas en build_config y consulta en /api/vms/query"""
+        response = self.client.post('/api/vm/build', json={
+            'provider': 'azure',
+            'build_config': {'name': 'pagos-api', 'vm_type': 'standard', 'location': 'eastus',
+                             'advanced_options': {'labels': {'team': 'pagos-qa', 'env': 'qa'}}}
+        })
+        vm_id = json.loads(response.data)['vm_id']
+
+        data = json.loads(self.client.get('/api/vms/query?q=team=pagos-qa AND NOT provider=aws').data)
+        self.assertEqual([vm['vmId'] for vm in data['vms']], [vm_id])
+        self.assertEqual(data['vms'][0]['labels'], {'team': 'pagos-qa', 'env': 'qa'})
+        self.assertEqual(self.client.get('/api/vms/query?q=team=').status_code, 400)
+        self.assertEqual(self.client.get('/api/vms/query', query_string={'q': 'NOT ' * 2000 + 'env'}).status_code, 400)
+
+        response = self.client.post('/api/vm/build/standard', json={
+            'provider': 'aws', 'name': 'x', 'location': 'us-east-1', 'labels': {'provider': 'y'}
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_vm_returns_404(self):
+        """Test: VM inexistente"""
+        response = self.client.get('/api/vms/no-existe')
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_status_returns_400(self):
+        """Test: estado de filtro inválido"""
+        response = self.client.get('/api/vms?status=volando')
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
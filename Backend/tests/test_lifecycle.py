@@ -0,0 +1,281 @@
+"""
+Test Suite para el Ciclo de Vida de las VMs
+Tests para la máquina de estados, las acciones masivas, /api/vms/actions
+y la expiración de VMs efímeras
+"""
+import unittest
+import json
+import sys
+import os
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from application.inventory import VMInventory
+from application.lifecycle import VMLifecycleService
+from application.expiry import ExpiryReaper, ExpiryTracker, apply_ttl, parse_ttl
+from application.factory import VMBuildingService
+from domain.entities import VMStatus
+from domain.lifecycle import InvalidTransitionError, VMAction, allowed_actions, next_status, parse_action
+from infrastructure.providers import AWS, Google
+from api.main import app, vm_inventory
+
+
+def run_forked(child, timeout: float = 20.0):
+    """
+    Ejecuta child() en un proceso hijo (como un worker de gunicorn --preload).
+    Retorna el código de salida (0 si child() retorna True) o None si el
+    hijo no terminó a tiempo (se mata: un hijo bloqueado no cuelga la suite).
+    """
+    import faulthandler
+    import signal
+    import time
+
+    pid = os.fork()
+    if pid == 0:
+        faulthandler.dump_traceback_later(timeout, exit=True)
+        try:
+            os._exit(0 if child() else 1)
+        except BaseException:
+            os._exit(2)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        finished, status = os.waitpid(pid, os.WNOHANG)
+        if finished:
+            return os.waitstatus_to_exitcode(status)
+        time.sleep(0.01)
+    os.kill(pid, signal.SIGKILL)
+    os.waitpid(pid, 0)
+    return None
+
+
+class TestStateMachine(unittest.TestCase):
+    """Tests para las transiciones de VMStatus"""
+
+    def test_valid_transitions(self):
+        """Test transiciones permitidas"""
+        self.assertEqual(next_status(VMStatus.RUNNING, VMAction.STOP), VMStatus.STOPPED)
+        self.assertEqual(next_status(VMStatus.STOPPED, VMAction.START), VMStatus.RUNNING)
+        self.assertEqual(next_status(VMStatus.ERROR, VMAction.TERMINATE), VMStatus.TERMINATED)
+
+    def test_invalid_transitions(self):
+        """Test que las transiciones no permitidas se rechazan"""
+        with self.assertRaises(InvalidTransitionError):
+            next_status(VMStatus.STOPPED, VMAction.STOP)
+        with self.assertRaises(InvalidTransitionError):
+            next_status(VMStatus.CREATING, VMAction.TERMINATE)
+        self.assertEqual(allowed_actions(VMStatus.TERMINATED), [])
+
+    def test_parse_action(self):
+        """Test parseo de acciones"""
+        self.assertEqual(parse_action(' STOP '), VMAction.STOP)
+        with self.assertRaises(ValueError):
+            parse_action('reboot')
+
+
+class TestVMLifecycleService(unittest.TestCase):
+    """Tests para las acciones masivas"""
+
+    def setUp(self):
+        self.inventory = VMInventory()
+        self.service = VMLifecycleService(self.inventory, max_workers=4)
+        self.addCleanup(self.service.shutdown)
+        self.aws_vms = [self.inventory.add(AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar())
+                        for _ in range(5)]
+        self.gcp_vm = self.inventory.add(Google({'type': 'n1-standard-1', 'zone': 'us-central1-a'}).provisionar())
+
+    def test_bulk_stop_by_selector(self):
+        """Test detener todas las VMs que cumplen un selector"""
+        results = self.service.apply(VMAction.STOP, self.service.select({'provider': 'aws'}))
+
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(result.success for result in results))
+        self.assertEqual(len(self.inventory.find(status='stopped')), 5)
+        self.assertEqual(self.gcp_vm.status, VMStatus.RUNNING)
+
+    def test_per_item_results(self):
+        """Test que cada VM tiene su propio resultado, en el orden pedido"""
+        self.inventory.set_status(self.aws_vms[0].vmId, VMStatus.STOPPED)
+        ids = [self.aws_vms[0].vmId, 'no-existe', self.aws_vms[1].vmId, self.aws_vms[1].vmId]
+
+        results = self.service.apply(VMAction.START, ids)
+
+        self.assertEqual([result.vm_id for result in results], ids[:3])
+        self.assertEqual([result.success for result in results], [True, False, False])
+        self.assertEqual(results[0].status, 'running')
+        self.assertIn('no encontrada', results[1].error)
+
+    def test_terminate_is_final(self):
+        """Test que una VM terminada no admite más acciones"""
+        vm_id = self.gcp_vm.vmId
+        self.assertTrue(self.service.apply(VMAction.TERMINATE, [vm_id])[0].success)
+        self.assertFalse(self.service.apply(VMAction.START, [vm_id])[0].success)
+        self.assertEqual(self.inventory.get(vm_id).status, VMStatus.TERMINATED)
+
+    def test_unknown_selector_field(self):
+        """Test filtros de selector no soportados"""
+        with self.assertRaises(ValueError):
+            self.service.select({'color': 'azul'})
+        for value in (1, ['aws'], {'in': 'aws'}, None, True):
+            with self.assertRaisesRegex(ValueError, "'provider' debe ser texto"):
+                self.service.select({'provider': value})
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "requiere os.fork")
+    def test_pool_and_reaper_restart_after_fork(self):
+        """Test que un worker creado por fork (gunicorn --preload) tiene su pool y su reaper"""
+        reaper = ExpiryReaper(ExpiryTracker(), self.service, interval=3600)
+        reaper.start()
+        self.addCleanup(reaper.stop)
+
+        def child():
+            results = self.service.apply(VMAction.STOP, [self.gcp_vm.vmId])
+            return results[0].success and reaper._thread.is_alive()
+
+        self.assertEqual(run_forked(child), 0)
+        self.assertEqual(self.gcp_vm.status, VMStatus.RUNNING)
+
+
+class TestExpiry(unittest.TestCase):
+    """Tests para el TTL, el heap de vencimientos y el reaper"""
+
+    def setUp(self):
+        self.inventory = VMInventory()
+        self.tracker = ExpiryTracker()
+        self.tracker.attach(self.inventory)
+        self.service = VMLifecycleService(self.inventory, max_workers=4)
+        self.addCleanup(self.service.shutdown)
+
+    def _add(self, ttl_seconds):
+        vm = AWS({'type': 't2.micro', 'region': 'us-east-1'}).provisionar()
+        return self.inventory.add(apply_ttl(vm, ttl_seconds))
+
+    def test_tracker_pops_in_deadline_order(self):
+        """Test que los vencidos salen en orden y las cancelaciones se respetan"""
+        late, early, removed = self._add(300), self._add(60), self._add(120)
+        self._add(None)
+        self.inventory.remove(removed.vmId)
+
+        self.assertEqual(len(self.tracker), 2)
+        now = late.expiresAt.timestamp()
+        self.assertEqual(self.tracker.pop_expired(now), [early.vmId, late.vmId])
+        self.assertEqual(self.tracker.pop_expired(now), [])
+
+    def test_reaper_terminates_expired_vms_in_batches(self):
+        """Test que el reaper termina solo las VMs vencidas"""
+        expired = [self._add(60) for _ in range(5)]
+        alive = self._add(3600)
+        reaper = ExpiryReaper(self.tracker, self.service, batch_size=2)
+
+        terminated = reaper.run_once(now=expired[-1].expiresAt.timestamp() + 1)
+
+        self.assertEqual(terminated, 5)
+        self.assertTrue(all(vm.status == VMStatus.TERMINATED for vm in expired))
+        self.assertEqual(alive.status, VMStatus.RUNNING)
+        self.assertEqual(len(self.tracker), 1)
+
+    def test_reaper_skips_passes_without_lease(self):
+        """Test que un worker sin el lease del reaper no termina VMs"""
+        import time
+
+        expired = self._add(60)
+        self.tracker.schedule(expired.vmId, 0)
+        passes = []
+        reaper = ExpiryReaper(self.tracker, self.service, interval=0.01,
+                              leader=lambda: passes.append(1) or False)
+        reaper.start()
+        while len(passes) < 3:
+            time.sleep(0.01)
+        reaper.stop()
+
+        self.assertEqual(expired.status, VMStatus.RUNNING)
+
+    def test_minimal_preset_expires_by_default(self):
+        """Test que las VMs 'minimal' tienen TTL por defecto y 0 lo desactiva"""
+        service = VMBuildingService(inventory=self.inventory, minimal_ttl_seconds=600)
+        default = service.build_predefined_vm('aws', 'minimal', 'dev-1')
+        no_ttl = service.build_predefined_vm('aws', 'minimal', 'dev-2', ttl_seconds=0)
+
+        vm = self.inventory.get(default.vm_id)
+        self.assertEqual((vm.expiresAt - vm.createdAt).total_seconds(), 600)
+        self.assertIsNotNone(default.vm_details['expiresAt'])
+        self.assertIsNone(self.inventory.get(no_ttl.vm_id).expiresAt)
+        self.assertEqual(len(self.tracker), 1)
+
+    def test_parse_ttl(self):
+        """Test validación del TTL"""
+        self.assertEqual(parse_ttl(3600), 3600)
+        self.assertIsNone(parse_ttl(None))
+        for invalid in (-1, '60', True, 10 ** 9):
+            with self.assertRaises(ValueError):
+                parse_ttl(invalid)
+
+
+class TestLifecycleEndpoint(unittest.TestCase):
+    """Tests de integración para POST /api/vms/actions"""
+
+    @classmethod
+    def setUpClass(cls):
+        app.config['TESTING'] = True
+        cls.client = app.test_client()
+
+    def _build(self, name):
+        response = self.client.post('/api/vm/build/standard', json={
+            'provider': 'onpremise', 'name': name, 'location': 'datacenter-dev'
+        })
+        return json.loads(response.data)['vm_id']
+
+    def test_stop_and_start_by_ids(self):
+        """Test: detener y arrancar VMs por lista de IDs"""
+        ids = [self._build(f'dev-{i}') for i in range(3)]
+
+        response = self.client.post('/api/vms/actions', json={'action': 'stop', 'vm_ids': ids})
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertTrue(data['success'])
+        self.assertEqual(data['succeeded'], 3)
+        self.assertTrue(all(vm_inventory.get(vm_id).status == VMStatus.STOPPED for vm_id in ids))
+
+        data = json.loads(self.client.post('/api/vms/actions', json={
+            'action': 'stop', 'vm_ids': ids[:1]
+        }).data)
+        self.assertFalse(data['success'])
+        self.assertEqual(data['failed'], 1)
+
+    def test_build_with_ttl(self):
+        """Test: ttl_seconds fija expiresAt y un TTL inválido es un 400"""
+        response = self.client.post('/api/vm/build/standard', json={
+            'provider': 'aws', 'name': 'efimera', 'location': 'us-east-1', 'ttl_seconds': 120
+        })
+        self.assertIsNotNone(json.loads(response.data)['vm_details']['expiresAt'])
+
+        response = self.client.post('/api/vm/build/standard', json={
+            'provider': 'aws', 'name': 'efimera', 'location': 'us-east-1', 'ttl_seconds': -5
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def test_custom_build_config_ttl(self):
+        """Test: /api/vm/build aplica el TTL de build_config y exige un objeto"""
+        response = self.client.post('/api/vm/build', json={
+            'provider': 'aws', 'build_config': {'name': 'efimera', 'vm_type': 'standard', 'ttl_seconds': 120}
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(json.loads(response.data)['vm_details']['expiresAt'])
+
+        response = self.client.post('/api/vm/build', json={'provider': 'aws', 'build_config': ['no', 'objeto']})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_requests(self):
+        """Test: acción desconocida, o vm_ids y selector a la vez"""
+        response = self.client.post('/api/vms/actions', json={'action': 'reboot', 'vm_ids': []})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/vms/actions', json={
+            'action': 'stop', 'vm_ids': [], 'selector': {'provider': 'aws'}
+        })
+        self.assertEqual(response.status_code, 400)
+        for selector in ({'provider': 7}, {'status': ['running']}, {'region': {'a': 1}}, {'color': 'azul'}):
+            response = self.client.post('/api/vms/actions', json={'action': 'stop', 'selector': selector})
+            self.assertEqual(response.status_code, 400, selector)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)